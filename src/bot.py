@@ -3,10 +3,12 @@ import datetime
 import logging
 import json
 import os
+import random
 import sys
-from typing import List, Optional, Tuple, Type
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
 
-from discord import Activity, ActivityType, ApplicationCommand, ApplicationContext, Embed, Guild, Intents, Message, SlashCommand, SlashCommandGroup, TextChannel
+from discord import Activity, ActivityType, ApplicationCommand, ApplicationContext, Colour, Embed, Guild, Intents, Message, SlashCommand, SlashCommandGroup, TextChannel
 from discord import ApplicationCommandInvokeError, CheckFailure
 from discord import __version__ as discord_version
 from discord.ext.commands import Context, when_mentioned_or
@@ -19,6 +21,7 @@ from .gdrive import TourneyDataClient
 from . import pss_crew as crew
 from . import pss_daily as daily
 from . import pss_dropship as dropship
+from . import pss_entity as entity
 from .pss_exception import Error, MaintenanceError, NotFound, SelectTimeoutError
 from . import pss_item as item
 from . import pss_login as login
@@ -59,6 +62,9 @@ BOT = YadcBot(
 
 __COMMANDS = []
 
+# (key, text, embed, embeds by bot member colour) of the most recently rendered daily
+__daily_payload: Tuple[Tuple[str, datetime.date], str, Embed, Dict[Colour, Embed]] = None
+
 INITIALIZED: bool = False
 
 PWD: str = os.getcwd()
@@ -96,6 +102,10 @@ async def on_ready() -> None:
     print(f'Python version: {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}')
     print(f'py-cord version: {discord_version}')
 
+    if not cache_warmer_loop.is_running():
+        print('Starting cache warmer loop.')
+        cache_warmer_loop.start()
+
     if settings.FEATURE_AUTODAILY_ENABLED:
         print('Starting auto-daily loop.')
         autodaily_loop.start()
@@ -104,6 +114,10 @@ async def on_ready() -> None:
         print('Starting auto-trader loop.')
         autotrader_loop.start()
 
+    if BOT.tournament_data_client and not tourney_data_prefetch_loop.is_running():
+        print('Starting tourney data prefetch loop.')
+        tourney_data_prefetch_loop.start()
+
 
 @BOT.event
 async def on_command_error(ctx: Context, err: Exception) -> None:
@@ -264,6 +278,9 @@ async def autodaily_loop() -> None:
                 return
 
     db_daily_info, db_daily_modify_date = await daily.db_get_daily_info()
+    if db_daily_info is None:
+        print('ERROR: Could not retrieve the daily info from the database.')
+        return
     has_daily_changed = daily.has_daily_changed(daily_info, utc_now, db_daily_info, db_daily_modify_date)
 
     if has_daily_changed:
@@ -278,11 +295,10 @@ async def autodaily_loop() -> None:
     created_output = False
     posted_count = 0
     if autodaily_settings:
-        output, output_embeds, created_output = await dropship.get_dropship_text(daily_info=daily_info)
+        current_daily_message, current_daily_embed, embeds_by_colour = await __get_daily_payload(daily_info, utc_now)
+        created_output = current_daily_message is not None
         if created_output:
-            current_daily_message = '\n'.join(output)
-            current_daily_embed = output_embeds[0]
-            posted_count = await post_dailies(current_daily_message, current_daily_embed, autodaily_settings, utc_now)
+            posted_count = await post_dailies(current_daily_message, current_daily_embed, autodaily_settings, utc_now, embeds_by_colour=embeds_by_colour)
         print(f'[autodaily_loop] posted to {posted_count} of {len(autodaily_settings)} guilds')
 
     if has_daily_changed and (created_output or not autodaily_settings):
@@ -294,21 +310,8 @@ async def before_autodaily_loop() -> None:
     await BOT.wait_until_ready()
 
 
-async def post_dailies(current_daily_message: str, current_daily_embed: Embed, autodaily_settings: List[server_settings.AutoMessageSettings], utc_now: datetime.datetime) -> int:
-    posted_count = 0
-    for guild_autodaily_settings in autodaily_settings:
-        if guild_autodaily_settings.guild_id is not None and guild_autodaily_settings.channel_id is not None:
-            posted, can_post, latest_message = await __post_automessage(guild_autodaily_settings.channel, guild_autodaily_settings.latest_message_id, guild_autodaily_settings.change_mode, current_daily_message, current_daily_embed, utc_now, True)
-            if posted:
-                posted_count += 1
-            else:
-                guild_name = guild_autodaily_settings.guild.name if guild_autodaily_settings.guild else None
-                guild_id = guild_autodaily_settings.guild_id
-                channel_name = f'#{guild_autodaily_settings.channel.name}' if guild_autodaily_settings.channel else '<not accessible>'
-                channel_id = guild_autodaily_settings.channel_id
-                print(f'[post_dailies] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
-            await guild_autodaily_settings.update(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(not can_post and not latest_message))
-    return posted_count
+async def post_dailies(current_daily_message: str, current_daily_embed: Embed, autodaily_settings: List[server_settings.AutoMessageSettings], utc_now: datetime.datetime, embeds_by_colour: Dict[Colour, Embed] = None) -> int:
+    return await __post_automessages('post_dailies', autodaily_settings, current_daily_message, current_daily_embed, utc_now, True, embeds_by_colour=embeds_by_colour)
 
 
 __FIRST_AUTOTRADER_POST_TIME = datetime.time(0, 0, 30, 0, datetime.timezone.utc)
@@ -333,22 +336,7 @@ async def autotrader_loop() -> None:
     all_autotrader_settings = server_settings.GUILD_SETTINGS.autotrader_settings
 
     if all_autotrader_settings:
-        posted_count = 0
-        for autotrader_settings in all_autotrader_settings:
-            if autotrader_settings.guild_id is not None and autotrader_settings.channel_id is not None:
-                # post message
-                posted, can_post, latest_message = await __post_automessage(autotrader_settings.channel, autotrader_settings.latest_message_id, autotrader_settings.change_mode, autotrader_message_text, autotrader_message_embed, utc_now, False)
-                if posted:
-                    posted_count += 1
-                else:
-                    guild_name = autotrader_settings.guild.name if autotrader_settings.guild else None
-                    guild_id = autotrader_settings.guild_id
-                    channel_name = f'#{autotrader_settings.channel.name}' if autotrader_settings.channel else '<not accessible>'
-                    channel_id = autotrader_settings.channel_id
-                    print(f'[autotrader_loop] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
-                await autotrader_settings.update(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(not can_post and not latest_message))
-
-        print(f'[autotrader_loop] posted to {posted_count} of {len(all_autotrader_settings)} guilds')
+        await __post_automessages('autotrader_loop', all_autotrader_settings, autotrader_message_text, autotrader_message_embed, utc_now, False)
 
 
 @autotrader_loop.before_loop
@@ -357,7 +345,85 @@ async def before_autotrader_loop() -> None:
 
 
 
-async def __post_automessage(text_channel: TextChannel, latest_message_id: int, change_mode: bool, current_daily_message: str, current_daily_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool) -> Tuple[bool, bool, Message]:
+@tasks.loop(seconds=settings.CACHE_WARMER_INTERVAL)
+async def cache_warmer_loop() -> None:
+    # Refresh every cache that would become outdated before the next run, so that commands never have to wait for design data.
+    look_ahead = datetime.timedelta(seconds=settings.CACHE_WARMER_INTERVAL + settings.CACHE_WARMER_MAX_JITTER)
+    entity_retrievers = [
+        entity_retriever for entity_retriever in entity.get_entity_retrievers()
+        if entity_retriever.cache_update_interval > 0 and entity_retriever.get_is_cache_outdated(look_ahead=look_ahead)
+    ]
+    if entity_retrievers:
+        await asyncio.gather(*[__warm_cache(entity_retriever) for entity_retriever in entity_retrievers])
+
+
+@cache_warmer_loop.before_loop
+async def before_cache_warmer_loop() -> None:
+    await BOT.wait_until_ready()
+
+
+@tasks.loop(minutes=settings.TOURNAMENT_DATA_PREFETCH_INTERVAL)
+async def tourney_data_prefetch_loop() -> None:
+    # Retrieve the latest tourney data in the background, so that commands don't have to wait for Google Drive.
+    try:
+        await BOT.tournament_data_client.prefetch_latest_data()
+    except Exception as ex:
+        print(f'[tourney_data_prefetch_loop] Could not prefetch the tourney data:\n{ex}')
+
+
+@tourney_data_prefetch_loop.before_loop
+async def before_tourney_data_prefetch_loop() -> None:
+    await BOT.wait_until_ready()
+
+
+async def __post_automessages(log_prefix: str, all_automessage_settings: List[server_settings.AutoMessageSettings], message_text: str, message_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool, embeds_by_colour: Dict[Colour, Embed] = None) -> int:
+    """
+    Posts the message to all configured channels concurrently. At most settings.AUTOMESSAGE_MAX_CONCURRENT_POSTS messages get posted at the same time.
+    py-cord takes care of the per-route rate limits and every channel is its own route, so the channels don't slow each other down.
+    The results get written to the database in one batch after all messages have been posted.
+    The coloured copies of message_embed get stored in embeds_by_colour, so they can be reused by other guilds and runs.
+    Returns the number of guilds posted to.
+    """
+    if embeds_by_colour is None:
+        embeds_by_colour = {}
+    semaphore = asyncio.Semaphore(settings.AUTOMESSAGE_MAX_CONCURRENT_POSTS)
+    stats = {'posted': 0, 'failed': 0, 'skipped': 0}
+    changes: List[Tuple[server_settings.AutoMessageSettings, dict]] = []
+
+    async def post(automessage_settings: server_settings.AutoMessageSettings) -> None:
+        if automessage_settings.guild_id is None or automessage_settings.channel_id is None:
+            stats['skipped'] += 1
+            return
+        async with semaphore:
+            try:
+                posted, can_post, latest_message = await __post_automessage(automessage_settings.channel, automessage_settings.latest_message_id, automessage_settings.change_mode, message_text, message_embed, utc_now, replace_current_day_message, embeds_by_colour=embeds_by_colour)
+            except Exception as err:
+                print(f'[{log_prefix}] Unexpected error while posting to guild {automessage_settings.guild_id}: {err}')
+                stats['failed'] += 1
+                return
+        if posted:
+            stats['posted'] += 1
+        else:
+            stats['failed'] += 1
+            guild_name = automessage_settings.guild.name if automessage_settings.guild else None
+            guild_id = automessage_settings.guild_id
+            channel_name = f'#{automessage_settings.channel.name}' if automessage_settings.channel else '<not accessible>'
+            channel_id = automessage_settings.channel_id
+            print(f'[{log_prefix}] Failed to post to guild \'{guild_name}\' ({guild_id}), channel \'{channel_name}\' ({channel_id})')
+        changes.append((automessage_settings, automessage_settings.get_changes(can_post=can_post, latest_message=latest_message, store_now_as_created_at=(not can_post and not latest_message))))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[post(automessage_settings) for automessage_settings in all_automessage_settings])
+    elapsed = time.perf_counter() - start
+    # Write the results of all guilds at once instead of one update per guild
+    if not await server_settings.db_update_auto_messages_settings(changes):
+        print(f'[{log_prefix}] Could not write the results in a single batch, wrote them one guild at a time.')
+    guilds_per_second = stats['posted'] / elapsed if elapsed > 0 else 0.0
+    print(f'[{log_prefix}] posted to {stats["posted"]} of {len(all_automessage_settings)} guilds in {elapsed:.1f} seconds ({guilds_per_second:.1f} guilds/s), failed: {stats["failed"]}, skipped: {stats["skipped"]}')
+    return stats['posted']
+
+
+async def __post_automessage(text_channel: TextChannel, latest_message_id: int, change_mode: bool, current_daily_message: str, current_daily_embed: Embed, utc_now: datetime.datetime, replace_current_day_message: bool, embeds_by_colour: Dict[Colour, Embed] = None) -> Tuple[bool, bool, Message]:
     """
     Returns (posted, can_post, latest_message)
     """
@@ -373,8 +439,12 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
         use_embeds = await server_settings.get_use_embeds(None, bot=BOT, guild=text_channel.guild)
         if use_embeds:
             colour = utils.discord.get_bot_member_colour(BOT, text_channel.guild)
-            embed = current_daily_embed.copy()
-            embed.colour = colour
+            embed = embeds_by_colour.get(colour) if embeds_by_colour is not None else None
+            if embed is None:
+                embed = current_daily_embed.copy()
+                embed.colour = colour
+                if embeds_by_colour is not None:
+                    embeds_by_colour[colour] = embed
         else:
             embed = None
 
@@ -387,7 +457,7 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
                 latest_message_id = latest_message.id
                 if change_mode == server_settings.AutoMessageChangeMode.DELETE_AND_POST_NEW:
                     try:
-                        deleted = await utils.discord.try_delete_message(latest_message)
+                        deleted = await __call_discord_with_retry(lambda: utils.discord.try_delete_message(latest_message))
                         if deleted:
                             latest_message = None
                             utils.dbg_prnt(f'[post_automessage] deleted message [{latest_message_id}] from channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
@@ -404,9 +474,9 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
                 elif change_mode == server_settings.AutoMessageChangeMode.EDIT:
                     try:
                         if use_embeds:
-                            await latest_message.edit(embed=embed)
+                            await __call_discord_with_retry(lambda: latest_message.edit(embed=embed))
                         else:
-                            await latest_message.edit(content=current_daily_message)
+                            await __call_discord_with_retry(lambda: latest_message.edit(content=current_daily_message))
                         posted = True
                         utils.dbg_prnt(f'[post_automessage] edited message [{latest_message_id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
                     except errors.NotFound:
@@ -423,9 +493,9 @@ async def __post_automessage(text_channel: TextChannel, latest_message_id: int,
             if not posted and can_post and post_new:
                 try:
                     if use_embeds:
-                        latest_message = await text_channel.send(embed=embed)
+                        latest_message = await __call_discord_with_retry(lambda: text_channel.send(embed=embed), retry_on_server_error=False)
                     else:
-                        latest_message = await text_channel.send(current_daily_message)
+                        latest_message = await __call_discord_with_retry(lambda: text_channel.send(current_daily_message), retry_on_server_error=False)
                     posted = True
                     utils.dbg_prnt(f'[post_automessage] posted message [{latest_message.id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
                 except errors.Forbidden:
@@ -455,7 +525,7 @@ async def __auto_fetch_latest_message(text_channel: TextChannel, latest_message_
 
     if text_channel and latest_message_id is not None:
         try:
-            result = await text_channel.fetch_message(latest_message_id)
+            result = await __call_discord_with_retry(lambda: text_channel.fetch_message(latest_message_id))
             utils.dbg_prnt(f'[auto_fetch_latest_message] found latest message by id [{latest_message_id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
         except errors.NotFound:
             print(f'[auto_fetch_latest_message] could not find latest message by id [{latest_message_id}] in channel [{text_channel.id}] on guild [{text_channel.guild.id}]')
@@ -466,6 +536,37 @@ async def __auto_fetch_latest_message(text_channel: TextChannel, latest_message_
     return can_post, result
 
 
+async def __get_daily_payload(daily_info: Dict[str, str], utc_now: datetime.datetime) -> Tuple[Optional[str], Optional[Embed], Dict[Colour, Embed]]:
+    """
+    Renders the daily once per change of the daily info and day. Returns (text, embed, embeds by colour), text and embed are None, if the daily couldn't be rendered.
+    """
+    global __daily_payload
+    key = (json.dumps(daily_info, sort_keys=True, default=str), utc_now.date())
+    if __daily_payload is None or __daily_payload[0] != key:
+        output, output_embeds, created_output = await dropship.get_dropship_text(daily_info=daily_info, utc_now=utc_now)
+        if not created_output:
+            return None, None, {}
+        __daily_payload = (key, '\n'.join(output), output_embeds[0], {})
+    _, text, embed, embeds_by_colour = __daily_payload
+    return text, embed, embeds_by_colour
+
+
+async def __call_discord_with_retry(func: Callable[[], Awaitable[Any]], retry_on_server_error: bool = True) -> Any:
+    return await utils.discord.call_with_retry(func, max_attempts=settings.AUTOMESSAGE_MAX_POST_ATTEMPTS, base_delay=settings.AUTOMESSAGE_RETRY_BASE_DELAY, retry_on_server_error=retry_on_server_error)
+
+
+async def __warm_cache(entity_retriever: entity.EntityRetriever) -> None:
+    # Spread the requests, so that the caches don't get refreshed all at once.
+    await asyncio.sleep(random.uniform(0, settings.CACHE_WARMER_MAX_JITTER))
+    try:
+        await entity_retriever.update_cache()
+    except Exception as ex:
+        print(f'[cache_warmer_loop] Could not update the cache \'{entity_retriever.cache_name}\':\n{ex}')
+
+
+
+
+
 # ############################################################################ #
 # ----------                Command Helper Functions                ---------- #
 # ############################################################################ #
@@ -500,6 +601,8 @@ async def __initialize() -> None:
     await login.init()
     await daily.init()
 
+    loaded_snapshots_count = await entity.load_entity_retrievers_snapshots()
+    print(f'Loaded {loaded_snapshots_count} design cache snapshots.')
     await crew.init()
     await item.init()
     await room.init()
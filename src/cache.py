@@ -1,139 +1,225 @@
+import asyncio
 import datetime
-import random
-from threading import Lock
-import time
-from typing import Dict, Optional
+import gzip
+import os
+import pickle
+from typing import Any, Dict, Optional
 
 from . import pss_core as core
+from . import settings
 from . import utils
 from .typehints import EntitiesData
 
 
+# ---------- Constants ----------
+
+SNAPSHOT_FORMAT_VERSION: int = 1
+
+
+
+
+
 # ---------- Classes ----------
 
 class PssCache:
-    def __init__(self, update_path: str, name: str, key_name: str = None, update_interval: int = 15) -> None:
+    """
+    Caches the raw data returned by an API endpoint.
+
+    The cached data gets replaced as a whole (copy-on-write), so readers never have to wait for a writer and never block the event loop.
+    Concurrent refresh requests get coalesced into a single request to the API.
+    The parsed data gets built once per change of the raw data and is handed out as a read-only view.
+    Outdated data gets returned while it's being refreshed in the background. Only callers requesting data before the first retrieval have to wait.
+    If a design_version_property_name is specified, the data only gets downloaded again, if that version in the latest settings has changed.
+    Changed data gets written to a snapshot file, which can be loaded on start-up to serve data before the first retrieval.
+    """
+    def __init__(self, update_path: str, name: str, key_name: str = None, update_interval: int = 15, design_version_property_name: str = None) -> None:
         self.__update_path: str = update_path
         self.__name: str = name
         self.__obj_key_name: str = key_name
         self.__UPDATE_INTERVAL: datetime.timedelta = datetime.timedelta(minutes=update_interval)
         self.__UPDATE_INTERVAL_ORIG: int = update_interval
+        self.__design_version_property_name: str = design_version_property_name
 
         self.__data: str = None
+        self.__design_version: str = None
+        self.__data_dict3: EntitiesData = None
         self.__modify_date: datetime.datetime = None
-        self.__WRITE_LOCK: Lock = Lock()
-        self.__READ_LOCK: Lock = Lock()
-        self.__write_requested: bool = False
-        self.__reader_count: int = 0
+        self.__update_task: asyncio.Task = None
 
 
     @property
     def name(self) -> Optional[str]:
         return self.__name
 
-
-    async def update_data(self, old_data: str = None) -> bool:
-        data = await core.get_data_from_path(self.__update_path)
-        data_changed = data != old_data
-        if data_changed:
-            self.__request_write()
-            can_write = False
-            while not can_write:
-                can_write = self.__get_reader_count() == 0
-                if not can_write:
-                    time.sleep(random.random())
-            self.__write_data(data)
-            self.__finish_write()
-            return True
-        return False
-
-
-    async def get_raw_data(self) -> str:
-        if self.__get_is_data_outdated():
-            await self.update_data()
-
-        can_read = False
-        while not can_read:
-            can_read = not self.__get_write_requested()
-            if not can_read:
-                time.sleep(random.random())
-
-        self.__add_reader()
-        result = self.__read_data()
-        self.__remove_reader()
-        return result
-
-
-    async def get_raw_data_dict(self) -> Dict:
-        raw_data = await self.get_raw_data()
-        result = utils.convert.raw_xml_to_dict(raw_data)
-        return result
+    @property
+    def update_interval(self) -> int:
+        """
+        The update interval in minutes.
+        """
+        return self.__UPDATE_INTERVAL_ORIG
 
 
-    async def get_data_dict3(self) -> EntitiesData:
-        data = await self.get_raw_data()
-        return utils.convert.xmltree_to_dict3(data)
+    async def update_data(self) -> bool:
+        """
+        Retrieves the data from the API. If there's already an update in progress, waits for that update to finish instead.
+        Returns True, if the data has changed.
+        """
+        return await asyncio.shield(self.__get_update_task())
 
 
-    def __get_is_data_outdated(self) -> bool:
+    def get_is_data_outdated(self, look_ahead: datetime.timedelta = None) -> bool:
+        """
+        Returns True, if the data is outdated or will be outdated within the time span specified by look_ahead.
+        """
         if self.__UPDATE_INTERVAL_ORIG == 0:
             return True
 
         utc_now = utils.get_utc_now()
-        self.__WRITE_LOCK.acquire()
+        if look_ahead:
+            utc_now += look_ahead
         modify_date = self.__modify_date
-        self.__WRITE_LOCK.release()
         result = modify_date is None or utc_now - modify_date > self.__UPDATE_INTERVAL
         return result
 
 
-    def __get_reader_count(self) -> int:
-        self.__READ_LOCK.acquire()
-        result = self.__reader_count
-        self.__READ_LOCK.release()
-        return result
+    async def load_snapshot(self) -> bool:
+        """
+        Loads the data from the snapshot file, if there's no data, yet. The data will be refreshed on the next access, if it's outdated.
+        Returns True, if the data has been loaded.
+        """
+        snapshot_file_path = self.__get_snapshot_file_path()
+        if self.__data is not None or not snapshot_file_path:
+            return False
+
+        snapshot = await asyncio.get_running_loop().run_in_executor(None, _read_snapshot, snapshot_file_path)
+        if not snapshot or snapshot.get('update_path') != self.__update_path or self.__data is not None:
+            return False
+        self.__data, self.__data_dict3, self.__design_version, self.__modify_date = snapshot['data'], snapshot['data_dict3'], snapshot['design_version'], snapshot['modify_date']
+        return True
+
+
+    async def get_raw_data(self) -> str:
+        await self.__ensure_data()
+        return self.__data
 
 
-    def __get_write_requested(self) -> bool:
-        self.__WRITE_LOCK.acquire()
-        result = self.__write_requested
-        self.__WRITE_LOCK.release()
+    async def get_raw_data_dict(self) -> Dict:
+        raw_data = await self.get_raw_data()
+        result = utils.convert.raw_xml_to_dict(raw_data)
         return result
 
 
-    def __request_write(self) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__write_requested = True
-        self.__WRITE_LOCK.release()
+    async def get_data_dict3(self) -> EntitiesData:
+        """
+        Returns a read-only view of the parsed data. Create a copy of an entity info via dict(...) to modify it.
+        """
+        await self.__ensure_data()
+        return self.__data_dict3
+
+
+    async def __ensure_data(self) -> None:
+        """
+        Waits for an update, if there's no data, yet, or if the data must not be cached. Else starts an update in the background, if the data is outdated.
+        """
+        if self.__data is None or self.__UPDATE_INTERVAL_ORIG == 0:
+            await self.update_data()
+        elif self.get_is_data_outdated() and (self.__update_task is None or self.__update_task.done()):
+            self.__get_update_task().add_done_callback(self.__log_update_failure)
+
 
+    async def __get_design_version(self) -> Optional[str]:
+        if not self.__design_version_property_name:
+            return None
+        latest_settings = await core.get_latest_settings()
+        return latest_settings.get(self.__design_version_property_name) or None
 
-    def __finish_write(self) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__write_requested = False
-        self.__WRITE_LOCK.release()
 
+    def __get_snapshot_file_path(self) -> Optional[str]:
+        if not self.__name or not settings.DESIGN_CACHE_SNAPSHOTS_SUB_PATH:
+            return None
+        return os.path.join(os.getcwd(), settings.DESIGN_CACHE_SNAPSHOTS_SUB_PATH, f'{self.__name}.pickle.gz')
 
-    def __write_data(self, data: str) -> None:
-        self.__WRITE_LOCK.acquire()
-        self.__data = data
-        self.__modify_date = utils.get_utc_now()
-        self.__WRITE_LOCK.release()
 
+    def __get_update_task(self) -> asyncio.Task:
+        if self.__update_task is None or self.__update_task.done():
+            self.__update_task = asyncio.create_task(self.__update_data())
+        return self.__update_task
 
-    def __add_reader(self) -> None:
-        self.__READ_LOCK.acquire()
-        self.__reader_count = self.__reader_count + 1
-        self.__READ_LOCK.release()
 
+    def __log_update_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print(f'[PssCache] Could not update the cache \'{self.__name}\' in the background: {task.exception()}')
 
-    def __remove_reader(self) -> None:
-        self.__READ_LOCK.acquire()
-        self.__reader_count = self.__reader_count - 1
-        self.__READ_LOCK.release()
 
+    async def __update_data(self) -> bool:
+        design_version = await self.__get_design_version()
+        if self.__data is not None and design_version is not None and design_version == self.__design_version:
+            self.__modify_date = utils.get_utc_now()
+            return False
 
-    def __read_data(self) -> str:
-        self.__WRITE_LOCK.acquire()
-        result = self.__data
-        self.__WRITE_LOCK.release()
-        return result
\ No newline at end of file
+        data_dict3 = None
+        if self.__data is None or design_version is not None:
+            # The data is expected to have changed, so parse it while it's being downloaded.
+            data, raw_data_dict = await core.get_data_and_dict_from_path(self.__update_path)
+            if data != self.__data:
+                data_dict3 = utils.readonly.make_read_only(utils.convert.raw_dict_to_entities_data(raw_data_dict, 3))
+        else:
+            data = await core.get_data_from_path(self.__update_path)
+
+        data_changed = data != self.__data
+        if data_changed:
+            if data_dict3 is None:
+                data_dict3 = utils.readonly.make_read_only(utils.convert.xmltree_to_dict3(data))
+            # Swap the references in one go, so that readers either get the old or the new data.
+            self.__data, self.__data_dict3, self.__design_version, self.__modify_date = data, data_dict3, design_version, utils.get_utc_now()
+            await self.__save_snapshot()
+        else:
+            self.__design_version, self.__modify_date = design_version, utils.get_utc_now()
+        return data_changed
+
+
+    async def __save_snapshot(self) -> None:
+        snapshot_file_path = self.__get_snapshot_file_path()
+        if not snapshot_file_path:
+            return
+        snapshot = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'update_path': self.__update_path,
+            'data': self.__data,
+            'data_dict3': self.__data_dict3,
+            'design_version': self.__design_version,
+            'modify_date': self.__modify_date,
+        }
+        # The data is read-only, so it's safe to pickle it on another thread.
+        await asyncio.get_running_loop().run_in_executor(None, _write_snapshot, snapshot_file_path, snapshot)
+
+
+
+
+
+# ---------- Helper functions ----------
+
+def _read_snapshot(file_path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with gzip.open(file_path, 'rb') as fp:
+            result = pickle.load(fp)
+    except Exception as ex:
+        print(f'[PssCache] Could not read the snapshot file \'{file_path}\': {ex}')
+        return None
+    if not isinstance(result, dict) or result.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return result
+
+
+def _write_snapshot(file_path: str, snapshot: Dict[str, Any]) -> None:
+    # Write to a temporary file first, so that a crash doesn't leave a broken snapshot behind.
+    temp_file_path = f'{file_path}.tmp'
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with gzip.open(temp_file_path, 'wb', compresslevel=1) as fp:
+            pickle.dump(snapshot, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, file_path)
+    except Exception as ex:
+        print(f'[PssCache] Could not write the snapshot file \'{file_path}\': {ex}')
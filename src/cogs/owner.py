@@ -18,13 +18,12 @@ from .. import pagination as _pagination
 from .. import pss_crew as _crew
 from .. import pss_daily as _daily
 from .. import pss_dropship as _dropship
+from .. import pss_entity as _entity
 from ..pss_exception import Error as _Error
 from .. import pss_item as _item
 from .. import pss_login as _login
 from .. import pss_lookups as _lookups
-from .. import pss_research as _research
 from .. import pss_room as _room
-from .. import pss_training as _training
 from .. import server_settings as _server_settings
 from .. import settings as _settings
 from .. import utils as _utils
@@ -114,11 +113,8 @@ class OwnerCog(_CogBase, name='Owner commands'):
     @_is_owner()
     async def db_export(self, ctx: _Context):
         utc_now = _utils.get_utc_now()
-        export = await _db.export_to_json()
-
         file_name = f'pss-statistics-db-export_{utc_now.strftime("%Y%m%d-%H%M%S")}.json'
-        with open(file_name, 'w') as fp:
-            fp.write(export)
+        await _db.export_to_file(file_name)
         await ctx.reply('Database export:', file=_File(file_name))
 
 
@@ -136,6 +132,7 @@ class OwnerCog(_CogBase, name='Owner commands'):
         await _db.import_from_json(file_contents)
         updated_sequences = await _db.try_execute(OwnerCog.QUERY_UPDATE_SEQUENCES)
         await _db.init_caches()
+        await _daily.update_db_sales_info_cache()
         await _server_settings.GUILD_SETTINGS.init(self.bot)
         if updated_sequences:
             await ctx.reply('Database imported successfully!')
@@ -180,6 +177,42 @@ class OwnerCog(_CogBase, name='Owner commands'):
             raise _Error(f'The query \'{query}\' didn\'t return any results.')
 
 
+    @db.command(name='stats', brief='Print connection pool and query stats', hidden=True)
+    @_is_owner()
+    async def db_stats(self, ctx: _Context):
+        """
+        Prints the utilisation of the connection pool, the time spent waiting for connections and the latencies of the named queries.
+        """
+        self._log_command_use(ctx)
+        round_trip = await _db.try_check_health()
+        pool_stats = _db.get_pool_stats()
+        bucket_names = [f'<={bound * 1000:g}ms' for bound in _db.LATENCY_HISTOGRAM_BUCKETS] + [f'>{_db.LATENCY_HISTOGRAM_BUCKETS[-1] * 1000:g}ms']
+
+        def format_histogram(histogram: _List[int]) -> str:
+            return ', '.join(f'{bucket_name}: {count}' for bucket_name, count in zip(bucket_names, histogram) if count) or '-'
+
+        output = ['**Connection pool**', '```']
+        output.append(f'Health check: {f"{round_trip * 1000:.1f} ms" if round_trip is not None else "FAILED"}')
+        output.append(f'Connections: {pool_stats["in_use"]} in use, {pool_stats["idle"]} idle, {pool_stats["size"]} open (min {pool_stats["min_size"]}, max {pool_stats["max_size"]}), {pool_stats["waiting"]} waiting')
+        average_wait = pool_stats['wait_total_seconds'] / pool_stats['acquire_count'] if pool_stats['acquire_count'] else 0.0
+        output.append(f'Acquired: {pool_stats["acquire_count"]} times, avg wait {average_wait * 1000:.2f} ms, max wait {pool_stats["wait_max_seconds"] * 1000:.2f} ms, {pool_stats["acquire_timeout_count"]} timeouts')
+        output.append(f'Wait histogram: {format_histogram(pool_stats["wait_histogram"])}')
+        output.append('```')
+
+        settings_cache_stats = _db.get_settings_cache_stats()
+        output.extend(['**Settings cache**', '```'])
+        output.append(f'{settings_cache_stats["size"]} entries (TTL {settings_cache_stats["ttl"]:g} s), {settings_cache_stats["hits"]} hits, {settings_cache_stats["misses"]} misses')
+        output.append('```')
+
+        query_histograms = _db.get_query_latency_histograms()
+        output.extend(['**Queries**', '```'])
+        for query_name, (call_count, total_seconds, max_seconds) in sorted(_db.get_query_timings().items()):
+            output.append(f'{query_name}: {call_count} calls, avg {total_seconds / call_count * 1000:.2f} ms, max {max_seconds * 1000:.2f} ms')
+            output.append(f'  {format_histogram(query_histograms.get(query_name, []))}')
+        output.append('```')
+        await _utils.discord.reply_with_output(ctx, output)
+
+
     @_command_group(name='debug', brief='Get debug info', hidden=True, invoke_without_command=True)
     @_is_owner()
     async def debug(self, ctx: _Context, *, args: str = None):
@@ -266,6 +299,28 @@ class OwnerCog(_CogBase, name='Owner commands'):
             _os.remove(file_name)
 
 
+    @debug.command(name='tourneydata', brief='Print tourney data cache and mirror stats')
+    @_is_owner()
+    async def debug_tourneydata(self, ctx: _Context):
+        """
+        Prints the memory usage, the pinned entries and the hits and evictions of the tourney data cache and the state of the tourney data mirror.
+        """
+        self._log_command_use(ctx)
+        if not self.bot.tournament_data_client:
+            raise _Error('The tourney data feature is disabled.')
+        cache_stats = self.bot.tournament_data_client.cache.get_stats()
+        pinned = ', '.join(f'{year:04d}-{month:02d}' + (f'-{day:02d}' if day is not None else '') for year, month, day in cache_stats['pinned']) or '-'
+        output = ['```']
+        output.append(f'{cache_stats["count"]} entries, {cache_stats["size"] / 1048576:.1f} of {cache_stats["max_size"] / 1048576:.1f} MiB')
+        output.append(f'Pinned: {pinned}')
+        output.append(f'{cache_stats["hits"]} hits, {cache_stats["misses"]} misses, {cache_stats["disk_hits"]} disk hits')
+        output.append(f'{cache_stats["evictions"]} evictions, {cache_stats["evicted_size"] / 1048576:.1f} MiB evicted')
+        mirror = self.bot.tournament_data_client.mirror
+        output.append(f'Mirror: {mirror.file_count} files, synced at {_utils.format.datetime(mirror.synced_at) if mirror.synced_at else "-"}')
+        output.append('```')
+        await _utils.discord.reply_with_output(ctx, output)
+
+
     @_command_group(name='device', brief='list available devices', hidden=True)
     @_is_owner()
     async def device(self, ctx: _Context):
@@ -459,18 +514,21 @@ class OwnerCog(_CogBase, name='Owner commands'):
         entities_infos = []
         characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in characters_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Character'
             entity_info['entity_id'] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in items_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Item'
             entity_info['entity_id'] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in rooms_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Room'
             entity_info['entity_id'] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
@@ -632,18 +690,21 @@ class OwnerCog(_CogBase, name='Owner commands'):
         entities_infos = []
         characters_designs_infos = await _crew.characters_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in characters_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Character'
             entity_info['entity_id'] = entity_info[_crew.CHARACTER_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         items_designs_infos = await _item.items_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in items_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Item'
             entity_info['entity_id'] = entity_info[_item.ITEM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME]
             entities_infos.append(entity_info)
         rooms_designs_infos = await _room.rooms_designs_retriever.get_entities_infos_by_name(entity_name)
         for entity_info in rooms_designs_infos:
+            entity_info = dict(entity_info)
             entity_info['entity_type'] = 'Room'
             entity_info['entity_id'] = entity_info[_room.ROOM_DESIGN_KEY_NAME]
             entity_info['entity_name'] = entity_info[_room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME]
@@ -768,12 +829,7 @@ class OwnerCog(_CogBase, name='Owner commands'):
         This command is to be used to update all caches manually.
         """
         self._log_command_use(ctx)
-        await _crew.characters_designs_retriever.update_cache()
-        await _crew.collections_designs_retriever.update_cache()
-        await _item.items_designs_retriever.update_cache()
-        await _research.researches_designs_retriever.update_cache()
-        await _room.rooms_designs_retriever.update_cache()
-        await _training.trainings_designs_retriever.update_cache()
+        await _entity.update_entity_retrievers_caches()
         await _daily.update_db_sales_info_cache()
         await ctx.send('Updated all caches successfully!')
 
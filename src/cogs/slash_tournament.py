@@ -180,8 +180,8 @@ class TournamentSlashCog(_CogBase, name='Tournament Slash'):
 
         criteria_lines = _top.get_criteria_lines(min_star_value, max_star_value, min_trophies, max_trophies, max_highest_trophies)
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
@@ -272,8 +272,8 @@ class TournamentSlashCog(_CogBase, name='Tournament Slash'):
         else:
             count = max_count
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
@@ -359,9 +359,9 @@ class TournamentSlashCog(_CogBase, name='Tournament Slash'):
         await _utils.discord.edit_original_response(ctx, response, content='Fleet found. Compiling fleet info...', embeds=[], view=None)
 
         fleet_id = fleet_info[_fleet.FLEET_KEY_NAME]
-        day_before_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-        yesterday_users_data = {user_id: user_info for user_id, user_info in yesterday_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
-        day_before_users_data = {user_id: user_info for user_id, user_info in day_before_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
+        day_before_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+        yesterday_users_data = dict(yesterday_tourney_data.get_users_data_by_fleet_id(fleet_id))
+        day_before_users_data = day_before_tourney_data.get_users_data_by_fleet_id(fleet_id)
 
         for yesterday_user_info in yesterday_users_data.values():
             day_before_user_info = day_before_users_data.get(yesterday_user_info[_user.USER_KEY_NAME], {})
@@ -390,7 +390,7 @@ class TournamentSlashCog(_CogBase, name='Tournament Slash'):
         yesterday_tourney_data = await self._get_yesterday_tourney_data(ctx)
         user_info, response = await _user.find_tournament_user(ctx, name, yesterday_tourney_data)
 
-        day_before_yesterday_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
+        day_before_yesterday_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
         day_before_user_info = day_before_yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME])
         if day_before_user_info:
             user_info['YesterdayAllianceScore'] = day_before_user_info['AllianceScore']
@@ -447,14 +447,14 @@ class TournamentSlashCog(_CogBase, name='Tournament Slash'):
             await _utils.discord.respond_with_output(ctx, output)
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, _utils.get_utc_now())
-        return self.bot.tournament_data_client.get_data(year, month, day=day)
+        return await self.bot.tournament_data_client.get_data(year, month, day=day)
 
 
     async def _get_yesterday_tourney_data(self, ctx: _ApplicationContext) -> _TourneyData:
         if not ctx.interaction.response.is_done():
             await ctx.interaction.response.defer()
 
-        return self.bot.tournament_data_client.get_latest_daily_data()
+        return await self.bot.tournament_data_client.get_latest_daily_data()
 
 
 
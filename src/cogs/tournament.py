@@ -74,7 +74,7 @@ class TournamentCog(_CogBase, name='Tournament'):
             return
         else:
             day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
-            tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+            tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
             if tourney_data:
                 output = await _top.get_division_stars(ctx, division=division, fleet_data=tourney_data.fleets, retrieved_date=tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.reply_with_output(ctx, output)
@@ -103,12 +103,12 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _MissingParameterError('The parameter `fleet_name` is mandatory.')
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
-        tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+        tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
 
         if tourney_data is None:
             fleet_infos = []
         else:
-            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data.fleets)
+            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data)
 
         if fleet_infos:
             if len(fleet_infos) == 1:
@@ -141,7 +141,7 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _MissingParameterError('If the parameter `year` is specified, the parameter `month` must be specified, too.')
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
-        tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+        tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
 
         output = await _top.get_top_captains(ctx, 100, as_embed=(await _server_settings.get_use_embeds(ctx)), tourney_data=tourney_data)
         await _utils.discord.reply_with_output(ctx, output)
@@ -170,12 +170,12 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _MissingParameterError('The parameter `fleet_name` is mandatory.')
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
-        tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+        tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
 
         if tourney_data is None:
             fleet_infos = []
         else:
-            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data.fleets)
+            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data)
 
         if fleet_infos:
             if len(fleet_infos) == 1:
@@ -221,7 +221,7 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _MissingParameterError('If the parameter `year` is specified, the parameter `month` must be specified, too.')
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
-        tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+        tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
 
         if tourney_data and tourney_data.fleets and tourney_data.users:
             file_name = f'tournament_results_{year}-{_utils.datetime.get_month_short_name(tourney_data.retrieved_at).lower()}.csv'
@@ -260,7 +260,7 @@ class TournamentCog(_CogBase, name='Tournament'):
 
         day, month, year = self.bot.tournament_data_client.retrieve_past_day_month_year(month, year, utc_now)
         try:
-            tourney_data = self.bot.tournament_data_client.get_data(year, month, day=day)
+            tourney_data = await self.bot.tournament_data_client.get_data(year, month, day=day)
         except ValueError as err:
             error = str(err)
             tourney_data = None
@@ -268,7 +268,7 @@ class TournamentCog(_CogBase, name='Tournament'):
         if tourney_data is None:
             user_infos = []
         else:
-            user_infos = await _user.get_user_infos_from_tournament_data_by_name(player_name, tourney_data.users)
+            user_infos = await _user.get_user_infos_from_tournament_data_by_name(player_name, tourney_data)
 
         if user_infos:
             if len(user_infos) == 1:
@@ -324,8 +324,8 @@ class TournamentCog(_CogBase, name='Tournament'):
 
             criteria_lines, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies = _top.get_targets_parameters(star_value, trophies, max_highest_trophies)
 
-            yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-            last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+            yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+            last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users
             current_fleet_data = await _top.get_alliances_with_division()
 
             if yesterday_tourney_data:
@@ -429,8 +429,8 @@ class TournamentCog(_CogBase, name='Tournament'):
 
         criteria_lines, min_star_value, max_star_value, min_trophies_value, max_trophies_value, max_highest_trophies = _top.get_targets_parameters(star_value, trophies, max_highest_trophies)
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
-        last_month_user_data = self.bot.tournament_data_client.get_latest_monthly_data().users
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
+        last_month_user_data = (await self.bot.tournament_data_client.get_latest_monthly_data()).users
         current_fleet_data = await _top.get_alliances_with_division()
 
         if yesterday_tourney_data:
@@ -526,11 +526,11 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         if yesterday_tourney_data is None:
             yesterday_fleet_infos = []
         else:
-            yesterday_fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data.fleets)
+            yesterday_fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data)
 
         if yesterday_fleet_infos:
             if len(yesterday_fleet_infos) == 1:
@@ -542,9 +542,9 @@ class TournamentCog(_CogBase, name='Tournament'):
 
             if fleet_info:
                 fleet_id = fleet_info[_fleet.FLEET_KEY_NAME]
-                day_before_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
-                yesterday_users_data = {user_id: user_info for user_id, user_info in yesterday_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
-                day_before_users_data = {user_id: user_info for user_id, user_info in day_before_tourney_data.users.items() if user_info[_fleet.FLEET_KEY_NAME] == fleet_id}
+                day_before_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
+                yesterday_users_data = dict(yesterday_tourney_data.get_users_data_by_fleet_id(fleet_id))
+                day_before_users_data = day_before_tourney_data.get_users_data_by_fleet_id(fleet_id)
                 for yesterday_user_info in yesterday_users_data.values():
                     day_before_user_info = day_before_users_data.get(yesterday_user_info[_user.USER_KEY_NAME], {})
                     day_before_star_count = day_before_user_info.get('AllianceScore', 0)
@@ -579,11 +579,11 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         if yesterday_tourney_data is None:
             user_infos = []
         else:
-            user_infos = await _user.get_user_infos_from_tournament_data_by_name(player_name, yesterday_tourney_data.users)
+            user_infos = await _user.get_user_infos_from_tournament_data_by_name(player_name, yesterday_tourney_data)
 
         if user_infos:
             if len(user_infos) == 1:
@@ -594,7 +594,7 @@ class TournamentCog(_CogBase, name='Tournament'):
                 _, user_info = await paginator.wait_for_option_selection()
 
             if user_info:
-                day_before_yesterday_tourney_data = self.bot.tournament_data_client.get_second_latest_daily_data()
+                day_before_yesterday_tourney_data = await self.bot.tournament_data_client.get_second_latest_daily_data()
                 day_before_user_info = day_before_yesterday_tourney_data.users.get(user_info[_user.USER_KEY_NAME])
                 if day_before_user_info:
                     user_info['YesterdayAllianceScore'] = day_before_user_info['AllianceScore']
@@ -627,7 +627,7 @@ class TournamentCog(_CogBase, name='Tournament'):
             await ctx.invoke(subcommand, fleet_name=division)
             return
         else:
-            yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+            yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
             if yesterday_tourney_data:
                 output = await _top.get_division_stars(ctx, division=division, fleet_data=yesterday_tourney_data.fleets, retrieved_date=yesterday_tourney_data.retrieved_at, as_embed=(await _server_settings.get_use_embeds(ctx)))
         await _utils.discord.reply_with_output(ctx, output)
@@ -651,11 +651,11 @@ class TournamentCog(_CogBase, name='Tournament'):
             raise _Error('It\'s day 1 of the current tournament, there is no data from yesterday.')
         output = []
 
-        yesterday_tourney_data = self.bot.tournament_data_client.get_latest_daily_data()
+        yesterday_tourney_data = await self.bot.tournament_data_client.get_latest_daily_data()
         if yesterday_tourney_data is None:
             fleet_infos = []
         else:
-            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data.fleets)
+            fleet_infos = await _fleet.get_fleet_infos_from_tourney_data_by_name(fleet_name, yesterday_tourney_data)
 
         if fleet_infos:
             if len(fleet_infos) == 1:
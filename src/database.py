@@ -1,7 +1,11 @@
+import asyncio as _asyncio
+from bisect import bisect_left as _bisect_left
+from contextlib import asynccontextmanager as _asynccontextmanager
 from datetime import datetime
 import json as _json
 from threading import Lock as _Lock
-from typing import Any, Callable, Dict, List, Tuple, Union
+import time as _time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TextIO, Tuple, Union
 
 import asyncpg
 
@@ -14,6 +18,8 @@ from . import utils
 # ---------- Typehint definitions ----------
 
 ColumnDefinition = Tuple[str, str, bool, bool] # column_name, column_type, is_primary, not_null
+QueryTiming = Tuple[int, float, float] # call_count, total_seconds, max_seconds
+Setting = Tuple[object, datetime] # value, modify_date
 
 
 
@@ -24,6 +30,123 @@ ColumnDefinition = Tuple[str, str, bool, bool] # column_name, column_type, is_pr
 CONNECTION_POOL: asyncpg.pool.Pool = None
 __CONNECTION_POOL_LOCK: _Lock = _Lock()
 
+__EXPORT_CURSOR_PREFETCH: int = 1000
+__EXPORT_TABLE_NAMES: List[str] = ['devices', 'sales', 'serversettings']
+
+# Upper bounds in seconds of the latency histogram buckets. Latencies above the last bound get counted in an additional bucket.
+LATENCY_HISTOGRAM_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+__SETTING_COLUMN_NAMES: Tuple[str, ...] = ('settingboolean', 'settingfloat', 'settingint', 'settingtext', 'settingtimestamptz')
+
+# The SQL of these queries never changes, so asyncpg prepares each of them once per pooled connection (statement cache) and only binds the parameters afterwards.
+NAMED_QUERIES: Dict[str, str] = {
+    'devices.delete': 'DELETE FROM devices WHERE key = $1;',
+    'devices.get': 'SELECT key FROM devices WHERE key = $1;',
+    'devices.get_all': 'SELECT key FROM devices;',
+    'devices.insert': 'INSERT INTO devices VALUES ($1, $2, $3);',
+    'devices.update': 'UPDATE devices SET (key, loginuntil) = ($1, $2) WHERE key = $1;',
+    'sales.get_all': 'SELECT * FROM sales ORDER BY limitedcatalogexpirydate DESC;',
+    'sales.get_by_expiry_date': 'SELECT * FROM sales WHERE limitedcatalogexpirydate = $1 ORDER BY limitedcatalogexpirydate DESC;',
+    'serversettings.delete_by_guild': 'DELETE FROM serversettings WHERE guildid = $1;',
+    'serversettings.get_all': 'SELECT * FROM serversettings;',
+    'serversettings.get_by_guild': 'SELECT * FROM serversettings WHERE guildid = $1;',
+    'settings.get': 'SELECT * FROM settings WHERE settingname = $1;',
+    'settings.get_all': 'SELECT * FROM settings;',
+    'settings.get_many': 'SELECT * FROM settings WHERE settingname = ANY($1::text[]);',
+}
+NAMED_QUERIES.update({f'settings.insert.{column_name}': f'INSERT INTO settings ({column_name}, modifydate, settingname) VALUES ($1, $2, $3);' for column_name in __SETTING_COLUMN_NAMES})
+NAMED_QUERIES.update({f'settings.update.{column_name}': f'UPDATE settings SET {column_name} = $1, modifydate = $2 WHERE settingname = $3;' for column_name in __SETTING_COLUMN_NAMES})
+
+
+
+
+
+# ---------- Classes ----------
+
+class SettingsCache():
+    """
+    Caches the values of the settings table.
+
+    Entries expire after ttl seconds. Settings written via set_setting(s) get written through, so reads after a write never need to query the database.
+    Settings that don't exist in the database get cached as (None, None), so that looking them up again doesn't query the database, either.
+    """
+    def __init__(self, ttl: float) -> None:
+        self.__ttl: float = ttl
+        self.__entries: Dict[str, Tuple[Setting, float]] = {}
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def ttl(self) -> float:
+        return self.__ttl
+
+
+    def get(self, setting_name: str) -> Optional[Setting]:
+        """
+        Returns the cached setting or None, if it's not cached or has expired.
+        """
+        entry = self.__entries.get(setting_name)
+        if entry is None or _time.monotonic() - entry[1] > self.__ttl:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        return entry[0]
+
+
+    def get_many(self, setting_names: List[str]) -> Tuple[Dict[str, Setting], List[str]]:
+        """
+        Returns the cached settings and the names of the settings not cached or expired.
+        """
+        result = {}
+        missing_setting_names = []
+        for setting_name in setting_names:
+            setting = self.get(setting_name)
+            if setting is None:
+                missing_setting_names.append(setting_name)
+            else:
+                result[setting_name] = setting
+        return result, missing_setting_names
+
+
+    def invalidate(self, setting_name: str = None) -> None:
+        """
+        Removes the specified setting or, if no setting name is specified, all settings from the cache.
+        """
+        if setting_name is None:
+            self.__entries.clear()
+        else:
+            self.__entries.pop(setting_name, None)
+
+
+    def load(self, settings: Dict[str, Setting]) -> None:
+        """
+        Replaces the contents of the cache.
+        """
+        cached_at = _time.monotonic()
+        self.__entries = {setting_name: (setting, cached_at) for setting_name, setting in settings.items()}
+
+
+    def set(self, setting_name: str, value: object, modify_date: datetime) -> None:
+        self.__entries[setting_name] = ((value, modify_date), _time.monotonic())
+
+
+    def set_many(self, settings: Dict[str, Setting]) -> None:
+        cached_at = _time.monotonic()
+        self.__entries.update({setting_name: (setting, cached_at) for setting_name, setting in settings.items()})
+
 
 
 
@@ -41,49 +164,60 @@ USING_LOOKUP = {
 
 # ---------- Import/Export ----------
 
-async def export_to_json() -> str:
-    devices = await _export_table('devices')
-    sales = await _export_table('sales')
-    serversettings = await _export_table('serversettings')
-
-    result = {
-        'devices': devices,
-        'sales': sales,
-        'serversettings': serversettings,
-    }
-    return _json.dumps(result, indent=4, cls=utils.json.YadcEncoder)
+async def export_to_file(file_path: str, table_names: List[str] = None) -> None:
+    """
+    Streams the contents of the specified tables into a JSON file in the format expected by import_from_json. The rows get read through server-side cursors, so the tables never need to fit into memory.
+    """
+    table_names = table_names or __EXPORT_TABLE_NAMES
+    await connect()
+    with open(file_path, 'w') as fp:
+        fp.write('{')
+        async with _acquire_connection() as connection:
+            # All tables get exported from the same snapshot.
+            async with connection.transaction(isolation='repeatable_read', readonly=True):
+                for i, table_name in enumerate(table_names):
+                    await _export_table(connection, table_name, fp, is_first=(i == 0))
+        fp.write('\n}\n')
 
 
-async def import_from_json(json: str) -> None:
+async def import_from_json(json: Union[str, bytes]) -> None:
+    """
+    Replaces the contents of the tables in the JSON with the rows provided. All tables get replaced in a single transaction.
+    """
     tables = _json.loads(json, cls=utils.json.YadcDecoder)
-    for table_name, table_contents in tables.items():
-        await _import_table(table_name, table_contents['column_names'], table_contents['values'])
-
-
-async def _export_table(table_name: str) -> dict:
-    column_names = await get_column_names(table_name)
-    rows = await fetchall(f'SELECT * FROM {table_name}')
-    values = [list(dict(row).values()) for row in rows]
-    return {
-        'column_names': column_names,
-        'values': values
-    }
-
-
-async def _import_table(table_name: str, column_names: List[str], rows: List[List[Any]]) -> None:
+    await connect()
+    async with _acquire_connection() as connection:
+        async with connection.transaction():
+            for table_name, table_contents in tables.items():
+                await _import_table(connection, table_name, table_contents['column_names'], table_contents['values'])
+
+
+async def _export_table(connection: asyncpg.Connection, table_name: str, fp: TextIO, is_first: bool) -> None:
+    print(f'[_export_table] Exporting table: {table_name}')
+    statement = await connection.prepare(f'SELECT * FROM {table_name}')
+    column_names = [attribute.name for attribute in statement.get_attributes()]
+    if not is_first:
+        fp.write(',')
+    fp.write(f'\n    {_json.dumps(table_name)}: {{\n        "column_names": {_json.dumps(column_names)},\n        "values": [')
+    row_count = 0
+    async for record in statement.cursor(prefetch=__EXPORT_CURSOR_PREFETCH):
+        if row_count:
+            fp.write(',')
+        fp.write(f'\n            {_json.dumps(list(record.values()), cls=utils.json.YadcEncoder)}')
+        row_count += 1
+    fp.write('\n        ]\n    }')
+    print(f'[_export_table] Exported {row_count} rows from table: {table_name}')
+
+
+async def _import_table(connection: asyncpg.Connection, table_name: str, column_names: List[str], rows: List[List[Any]]) -> None:
     """
-    This function will clear the specified table and insert the values provided.
+    This function will clear the specified table and bulk insert the values provided via COPY.
     """
-    column_names_string = ','.join(column_names)
-    values_string = ', '.join([f'${i}' for i in range(1, len(column_names) + 1)])
-    query = f'INSERT INTO {table_name} ({column_names_string}) VALUES ({values_string})'
-
     print(f'[_import_table] Clearing table: {table_name}')
-    await execute(f'DELETE FROM {table_name}')
+    await connection.execute(f'DELETE FROM {table_name}')
 
-    print(f'[_import_table] Importing data to table: {table_name}')
-    for values in rows:
-        await execute(query, values)
+    print(f'[_import_table] Importing {len(rows)} rows to table: {table_name}')
+    await connection.copy_records_to_table(table_name, records=(tuple(values) for values in rows), columns=column_names)
 
 
 
@@ -552,6 +686,61 @@ async def create_schema() -> bool:
 
 
 
+# ---------- Named queries ----------
+
+async def fetch_named(query_name: str, args: list = None) -> List[asyncpg.Record]:
+    """
+    Runs the registered query with the specified name with bound parameters and records its timing.
+    """
+    async with _time_query(query_name):
+        return await fetchall(NAMED_QUERIES[query_name], args)
+
+
+def get_query_latency_histograms() -> Dict[str, List[int]]:
+    """
+    Returns the latency histogram per query name. The counts correspond to LATENCY_HISTOGRAM_BUCKETS plus one bucket for slower queries.
+    """
+    return {query_name: list(histogram) for query_name, histogram in __query_histograms.items()}
+
+
+def get_query_timings() -> Dict[str, QueryTiming]:
+    """
+    Returns (call_count, total_seconds, max_seconds) per query name.
+    """
+    return dict(__query_timings)
+
+
+async def try_execute_named(query_name: str, args: list = None, raise_db_error: bool = False) -> bool:
+    """
+    Runs the registered query with the specified name with bound parameters and records its timing.
+    """
+    async with _time_query(query_name):
+        return await try_execute(NAMED_QUERIES[query_name], args, raise_db_error=raise_db_error)
+
+
+async def try_execute_many_named(queries: List[Tuple[str, List[list]]], timing_name: str, raise_db_error: bool = False) -> bool:
+    """
+    Runs each registered query once per list of args in a single transaction. The timing gets recorded under timing_name.
+    """
+    async with _time_query(timing_name):
+        return await try_execute_many([(NAMED_QUERIES[query_name], args_list) for query_name, args_list in queries], raise_db_error=raise_db_error)
+
+
+@_asynccontextmanager
+async def _time_query(query_name: str) -> AsyncIterator[None]:
+    start = _time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = _time.perf_counter() - start
+        call_count, total_seconds, max_seconds = __query_timings.get(query_name, (0, 0.0, 0.0))
+        __query_timings[query_name] = (call_count + 1, total_seconds + elapsed, max(max_seconds, elapsed))
+        _add_to_histogram(__query_histograms.setdefault(query_name, [0] * (len(LATENCY_HISTOGRAM_BUCKETS) + 1)), elapsed)
+
+
+
+
+
 # ---------- Helper ----------
 
 async def connect() -> bool:
@@ -562,7 +751,13 @@ async def connect() -> bool:
         __log_db('[connect] Connection pool is not connected')
         try:
             __log_db('[connect] Creating connection pool')
-            CONNECTION_POOL = await asyncpg.create_pool(dsn=settings.DATABASE_URL, min_size=1, max_size=5)
+            CONNECTION_POOL = await asyncpg.create_pool(
+                dsn=settings.DATABASE_URL,
+                min_size=settings.DATABASE_POOL_MIN_SIZE,
+                max_size=settings.DATABASE_POOL_MAX_SIZE,
+                max_queries=settings.DATABASE_POOL_MAX_QUERIES,
+                max_inactive_connection_lifetime=settings.DATABASE_POOL_MAX_INACTIVE_CONNECTION_LIFETIME,
+            )
             return True
         except Exception as error:
             error_name = error.__class__.__name__
@@ -584,7 +779,7 @@ async def disconnect() -> None:
 async def execute(query: str, args: list = None) -> bool:
     __log_db_function_enter('execute', query=f'\'{query}\'', args=args)
 
-    async with CONNECTION_POOL.acquire() as connection:
+    async with _acquire_connection() as connection:
         async with connection.transaction():
             if args:
                 await connection.execute(query, *args)
@@ -592,6 +787,18 @@ async def execute(query: str, args: list = None) -> bool:
                 await connection.execute(query)
 
 
+async def execute_many(queries: List[Tuple[str, List[list]]]) -> None:
+    """
+    Executes each query once per list of args via executemany. All queries run in a single transaction.
+    """
+    __log_db_function_enter('execute_many', queries=[(f'\'{query}\'', len(args_list)) for query, args_list in queries])
+
+    async with _acquire_connection() as connection:
+        async with connection.transaction():
+            for query, args_list in queries:
+                await connection.executemany(query, args_list)
+
+
 async def fetchall(query: str, args: list = None) -> List[asyncpg.Record]:
     __log_db_function_enter('fetchall', query=f'\'{query}\'', args=args)
 
@@ -600,7 +807,7 @@ async def fetchall(query: str, args: list = None) -> List[asyncpg.Record]:
     result: List[asyncpg.Record] = None
     if await connect():
         try:
-            async with CONNECTION_POOL.acquire() as connection:
+            async with _acquire_connection() as connection:
                 async with connection.transaction():
                     if args:
                         result = await connection.fetch(query, *args)
@@ -645,6 +852,28 @@ async def get_schema_version() -> str:
     return result or ''
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Returns the utilisation of the connection pool and the time spent waiting for a connection.
+    """
+    acquire_count, acquire_timeout_count, wait_total_seconds, wait_max_seconds = __acquire_stats
+    result = {
+        'connected': is_connected(CONNECTION_POOL),
+        'min_size': settings.DATABASE_POOL_MIN_SIZE,
+        'max_size': settings.DATABASE_POOL_MAX_SIZE,
+        'size': CONNECTION_POOL.get_size() if CONNECTION_POOL else 0,
+        'idle': CONNECTION_POOL.get_idle_size() if CONNECTION_POOL else 0,
+        'in_use': __connections_in_use,
+        'waiting': __connections_waiting,
+        'acquire_count': acquire_count,
+        'acquire_timeout_count': acquire_timeout_count,
+        'wait_total_seconds': wait_total_seconds,
+        'wait_max_seconds': wait_max_seconds,
+        'wait_histogram': list(__acquire_wait_histogram),
+    }
+    return result
+
+
 def is_connected(pool: asyncpg.pool.Pool) -> bool:
     __log_db_function_enter('is_connected', pool=pool)
 
@@ -653,6 +882,24 @@ def is_connected(pool: asyncpg.pool.Pool) -> bool:
     return False
 
 
+async def try_check_health() -> Optional[float]:
+    """
+    Runs a trivial query on a pooled connection. Returns the round trip time in seconds or None, if the check failed.
+    """
+    __log_db_function_enter('try_check_health')
+
+    if not await connect():
+        return None
+    start = _time.perf_counter()
+    try:
+        async with _acquire_connection() as connection:
+            await connection.fetchval('SELECT 1;')
+    except Exception as error:
+        print(f'[try_check_health] {error.__class__.__name__} occurred while checking the database connection: {error}')
+        return None
+    return _time.perf_counter() - start
+
+
 async def try_set_schema_version(version: str) -> bool:
     __log_db_function_enter('try_set_schema_version', version=f'\'{version}\'')
 
@@ -664,7 +911,7 @@ async def try_set_schema_version(version: str) -> bool:
         query = f'UPDATE settings SET modifydate = $1, settingtext = $2 WHERE settingname = $3'
     success = await try_execute(query, [utc_now, version, 'schema_version'])
     if success:
-        __settings_cache['schema_version'] = (version, utc_now)
+        __settings_cache.set('schema_version', version, utc_now)
     return success
 
 
@@ -708,79 +955,89 @@ async def try_execute(query: str, args: list = None, raise_db_error: bool = Fals
     return success
 
 
-async def get_setting(setting_name: str) -> Tuple[object, datetime]:
-    __log_db_function_enter('get_setting', setting_name=f'\'{setting_name}\'')
+async def try_execute_many(queries: List[Tuple[str, List[list]]], raise_db_error: bool = False) -> bool:
+    __log_db_function_enter('try_execute_many', queries=[(f'\'{query}\'', len(args_list)) for query, args_list in queries], raise_db_error=raise_db_error)
 
-    if __settings_cache is None or setting_name not in __settings_cache.keys():
-        modify_date: datetime = None
-        query = f'SELECT * FROM settings WHERE settingname = $1'
-        args = [setting_name]
+    if not queries:
+        return True
+    success = False
+    if await connect():
         try:
-            records = await fetchall(query, args)
+            await execute_many(queries)
+            success = True
+        except (asyncpg.exceptions.PostgresError, asyncpg.PostgresError) as pg_error:
+            if raise_db_error:
+                raise pg_error
+            else:
+                print_db_query_error('try_execute_many', '; '.join(query for query, _ in queries), None, pg_error)
+                success = False
         except Exception as error:
-            print_db_query_error('get_setting', query, args, error)
-            records = []
-        if records:
-            result = records[0]
-            modify_date = result[1]
-            value = None
-            for field in result[2:]:
-                if field:
-                    value = field
-                    break
-            setting = (value, modify_date)
-            __settings_cache[setting_name] = setting
-            return setting
-        else:
-            return (None, None)
+            print_db_query_error('try_execute_many', '; '.join(query for query, _ in queries), None, error)
+            success = False
     else:
-        return __settings_cache[setting_name]
+        print('[try_execute_many] could not connect to db')
+    return success
 
 
-async def get_settings(setting_names: List[str] = None) -> Dict[str, Tuple[object, datetime]]:
-    __log_db_function_enter('get_settings', setting_names=setting_names)
-    setting_names = setting_names or []
-    result = {setting_name: (None, None) for setting_name in setting_names}
+async def get_setting(setting_name: str) -> Setting:
+    __log_db_function_enter('get_setting', setting_name=f'\'{setting_name}\'')
 
-    if __settings_cache is None:
-        db_setting_names = setting_names
+    setting = __settings_cache.get(setting_name)
+    if setting is not None:
+        return setting
+
+    args = [setting_name]
+    try:
+        records = await fetch_named('settings.get', args)
+    except Exception as error:
+        print_db_query_error('get_setting', NAMED_QUERIES['settings.get'], args, error)
+        return (None, None)
+    if records is None:
+        # The query didn't run, so the setting may exist. Don't cache a miss.
+        return (None, None)
+    if records:
+        _, setting = _get_setting_from_record(records[0])
     else:
-        db_setting_names = [setting_name for setting_name in setting_names if setting_name not in __settings_cache.keys()]
-        result.update({setting_name: setting_value for setting_name, setting_value in __settings_cache.items() if setting_name in setting_names})
-
-    if not result:
-        query = f'SELECT * FROM settings'
-        if db_setting_names:
-            where_strings = [f'settingname = ${i}' for i in range(1, len(db_setting_names) + 1, 1)]
-            where_string = ' OR '.join(where_strings)
-            query += f' WHERE {where_string}'
-            records = await fetchall(query, args=db_setting_names)
-        else:
-            records = await fetchall(query)
-
-        for record in records:
-            setting_name = record[0]
-            modify_date = record[1]
-            value = None
-            for field in record[2:]:
-                if field:
-                    value = field
-                    break
-            result[setting_name] = (value, modify_date)
+        setting = (None, None)
+    __settings_cache.set(setting_name, *setting)
+    return setting
+
+
+async def get_settings(setting_names: List[str] = None) -> Dict[str, Setting]:
+    """
+    Returns the specified settings, served from the cache where possible. Returns all settings from the database, if no setting names are specified.
+    If the database can't be queried, the settings not served from the cache are missing from the result.
+    """
+    __log_db_function_enter('get_settings', setting_names=setting_names)
+
+    if not setting_names:
+        records = await fetch_named('settings.get_all')
+        if records is None:
+            return {}
+        result = dict(_get_setting_from_record(record) for record in records)
+        __settings_cache.set_many(result)
+        return result
+
+    result, db_setting_names = __settings_cache.get_many(setting_names)
+    if db_setting_names:
+        records = await fetch_named('settings.get_many', [db_setting_names])
+        if records is None:
+            return result
+        db_settings = {setting_name: (None, None) for setting_name in db_setting_names}
+        db_settings.update(_get_setting_from_record(record) for record in records)
+        __settings_cache.set_many(db_settings)
+        result.update(db_settings)
     return result
 
 
 async def get_sales_infos(expiry_date: datetime = None) -> SalesCache:
     __log_db_function_enter('get_sales_infos')
 
-    args = []
-    query = 'SELECT * FROM sales'
-    if expiry_date is not None:
-        query += f' WHERE limitedcatalogexpirydate = $1'
-        args.append(expiry_date)
-    query += ' ORDER BY limitedcatalogexpirydate DESC'
     try:
-        records = await fetchall(query, args)
+        if expiry_date is not None:
+            records = await fetch_named('sales.get_by_expiry_date', [expiry_date])
+        else:
+            records = await fetch_named('sales.get_all')
     except asyncpg.UndefinedTableError:
         records = None
     if records:
@@ -793,73 +1050,48 @@ async def get_sales_infos(expiry_date: datetime = None) -> SalesCache:
 async def set_setting(setting_name: str, value: Any, utc_now: datetime = None) -> bool:
     __log_db_function_enter('set_setting', setting_name=f'\'{setting_name}\'', value=value, utc_now=utc_now)
 
-    column_name = None
-    if isinstance(value, bool):
-        column_name = 'settingboolean'
-    elif isinstance(value, int):
-        column_name = 'settingint'
-    elif isinstance(value, float):
-        column_name = 'settingfloat'
-    elif isinstance(value, datetime):
-        column_name = 'settingtimestamptz'
-    else:
-        column_name = 'settingtext'
+    column_name = _get_setting_column_name(value)
 
     success = True
     setting, modify_date = await get_setting(setting_name)
     if utc_now is None:
         utc_now = utils.get_utc_now()
-    query = ''
+    query_name = ''
     if setting is None and modify_date is None:
-        query = f'INSERT INTO settings ({column_name}, modifydate, settingname) VALUES ($1, $2, $3)'
+        query_name = f'settings.insert.{column_name}'
     elif setting != value:
-        query = f'UPDATE settings SET {column_name} = $1, modifydate = $2 WHERE settingname = $3'
-    success = not query or await try_execute(query, [value, utc_now, setting_name])
+        query_name = f'settings.update.{column_name}'
+    success = not query_name or await try_execute_named(query_name, [value, utc_now, setting_name])
     if success:
-        __settings_cache[setting_name] = (value, utc_now)
+        __settings_cache.set(setting_name, value, utc_now)
     return success
 
 
 async def set_settings(settings: Dict[str, Tuple[object, datetime]]) -> bool:
     __log_db_function_enter('set_settings', settings=settings)
 
-    utc_now = utils.get_utc_now()
     if settings:
-        query_lines = []
-        args = []
-        success = True
+        queries: Dict[str, List[list]] = {}
         current_settings = await get_settings(settings.keys())
+        if any(setting_name not in current_settings for setting_name in settings.keys()):
+            # Without the current values, it's unknown whether to insert or to update.
+            print('[set_settings] could not retrieve the current settings')
+            return False
         for setting_name, (value, modified_at) in settings.items():
-            query = ''
-            column_name = None
-            if isinstance(value, bool):
-                column_name = 'settingboolean'
-                value = utils.database.convert_boolean(value)
-            elif isinstance(value, int):
-                column_name = 'settingint'
-            elif isinstance(value, float):
-                column_name = 'settingfloat'
-            elif isinstance(value, datetime):
-                column_name = 'settingtimestamptz'
-                value = utils.database.convert_timestamp(value)
-            else:
-                column_name = 'settingtext'
-                value = utils.database.convert_text(value)
+            column_name = _get_setting_column_name(value)
             current_value, db_modify_date = current_settings[setting_name]
-            modify_date = db_modify_date or utc_now
 
-            setting_name = utils.database.convert_text(setting_name)
+            query_name = ''
             if current_value is None and db_modify_date is None:
-                query = f'INSERT INTO settings ({column_name}, modifydate, settingname) VALUES ({value}, \'{modified_at}\', {setting_name});'
+                query_name = f'settings.insert.{column_name}'
             elif current_value != value:
-                query = f'UPDATE settings SET {column_name} = {value}, modifydate = \'{modified_at}\' WHERE settingname = {setting_name};'
+                query_name = f'settings.update.{column_name}'
 
-            if query:
-                query_lines.append(query)
-                args.extend([value, modified_at, setting_name])
-        success = not query_lines or await try_execute('\n'.join(query_lines))
+            if query_name:
+                queries.setdefault(query_name, []).append([value, modified_at, setting_name])
+        success = not queries or await try_execute_many_named(list(queries.items()), 'settings.set_many')
         if success:
-            __settings_cache.update(settings)
+            __settings_cache.set_many(settings)
         return success
     else:
         return True
@@ -890,6 +1122,40 @@ async def update_sales_info(sales_info: Dict[str, Any]) -> bool:
     return success
 
 
+@_asynccontextmanager
+async def _acquire_connection() -> AsyncIterator[asyncpg.Connection]:
+    """
+    Acquires a connection from the pool within the configured timeout and records the wait time.
+    """
+    global __acquire_stats, __connections_in_use, __connections_waiting
+    __connections_waiting += 1
+    start = _time.perf_counter()
+    try:
+        connection = await CONNECTION_POOL.acquire(timeout=settings.DATABASE_POOL_ACQUIRE_TIMEOUT)
+    except _asyncio.TimeoutError:
+        acquire_count, acquire_timeout_count, wait_total_seconds, wait_max_seconds = __acquire_stats
+        __acquire_stats = (acquire_count, acquire_timeout_count + 1, wait_total_seconds, wait_max_seconds)
+        print(f'[_acquire_connection] Could not acquire a database connection within {settings.DATABASE_POOL_ACQUIRE_TIMEOUT} seconds. Pool size: {CONNECTION_POOL.get_size()}, connections in use: {__connections_in_use}')
+        raise
+    finally:
+        __connections_waiting -= 1
+    waited = _time.perf_counter() - start
+    acquire_count, acquire_timeout_count, wait_total_seconds, wait_max_seconds = __acquire_stats
+    __acquire_stats = (acquire_count + 1, acquire_timeout_count, wait_total_seconds + waited, max(wait_max_seconds, waited))
+    _add_to_histogram(__acquire_wait_histogram, waited)
+
+    __connections_in_use += 1
+    try:
+        yield connection
+    finally:
+        __connections_in_use -= 1
+        await CONNECTION_POOL.release(connection)
+
+
+def _add_to_histogram(histogram: List[int], value: float) -> None:
+    histogram[_bisect_left(LATENCY_HISTOGRAM_BUCKETS, value)] += 1
+
+
 def print_db_query_error(function_name: str, query: str, args: List[Any], error: asyncpg.exceptions.PostgresError) -> None:
     if args:
         args = f'\n{args}'
@@ -898,6 +1164,40 @@ def print_db_query_error(function_name: str, query: str, args: List[Any], error:
     print(f'[{function_name}] {error.__class__.__name__} while performing the query: {query}{args}\nMSG: {error}')
 
 
+def get_settings_cache_stats() -> Dict[str, Any]:
+    return {
+        'size': __settings_cache.size,
+        'ttl': __settings_cache.ttl,
+        'hits': __settings_cache.hits,
+        'misses': __settings_cache.misses,
+    }
+
+
+def _get_setting_column_name(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'settingboolean'
+    elif isinstance(value, int):
+        return 'settingint'
+    elif isinstance(value, float):
+        return 'settingfloat'
+    elif isinstance(value, datetime):
+        return 'settingtimestamptz'
+    else:
+        return 'settingtext'
+
+
+def _get_setting_from_record(record: asyncpg.Record) -> Tuple[str, Setting]:
+    """
+    Returns the name and the typed value of a settings row. The value is stored in the one column matching its type, the others are NULL.
+    """
+    value = None
+    for field in record[2:]:
+        if field is not None:
+            value = field
+            break
+    return record[0], (value, record[1])
+
+
 def __log_db_function_enter(function_name: str, **kwargs) -> None:
     if settings.PRINT_DEBUG_DB:
         params = ', '.join([f'{k}={v}' for k, v in kwargs.items()])
@@ -914,16 +1214,24 @@ def __log_db(message: str) -> None:
 
 # ---------- Initialization ----------
 
-__settings_cache: Dict[str, Tuple[object, datetime]] = None
+__acquire_stats: Tuple[int, int, float, float] = (0, 0, 0.0, 0.0) # acquire_count, acquire_timeout_count, wait_total_seconds, wait_max_seconds
+__acquire_wait_histogram: List[int] = [0] * (len(LATENCY_HISTOGRAM_BUCKETS) + 1)
+__connections_in_use: int = 0
+__connections_waiting: int = 0
+__query_histograms: Dict[str, List[int]] = {}
+__query_timings: Dict[str, QueryTiming] = {}
+__settings_cache: SettingsCache = SettingsCache(settings.SETTINGS_CACHE_TTL)
 
 
 async def init_caches() -> None:
+    """
+    Loads all settings into the cache in one query.
+    """
     try:
-        settings = await get_settings()
+        all_settings = await get_settings()
     except (asyncpg.exceptions.UndefinedTableError): # settings table doesn't exist
-        settings = {}
-    global __settings_cache
-    __settings_cache = settings
+        all_settings = {}
+    __settings_cache.load(all_settings)
 
 
 async def init() -> None:
@@ -1,18 +1,26 @@
+from array import array
+import asyncio
+import bisect
 import calendar
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
 from datetime import datetime, timedelta, timezone
+import gzip
+import heapq
 import json
 import os
-import random
+import pickle
+import sys
+import tempfile
 from threading import Lock
-import time
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 import urllib.parse
+import weakref
 import yaml
 
 from discord.ext.commands import Context
 import pydrive.auth
 import pydrive.drive
-import pydrive.files
 
 from . import pss_lookups as lookups
 from . import settings
@@ -21,49 +29,201 @@ from .typehints import EntitiesData, EntityInfo
 
 
 
+# ---------- Constants ----------
+
+TOURNEY_DATA_FILE_FORMAT_VERSION: int = 2
+TOURNEY_DATA_FILE_NAME_PREFIX: str = 'pss-top-100_'
+TOURNEY_DATA_MANIFEST_FORMAT_VERSION: int = 1
+
+
+
+
+
+# ---------- Typehints ----------
+
+TourneyDataKey = Tuple[int, int, Optional[int]]
+
+
+
+
+
 # ---------- Classes ----------
 
 
+class NameIndex():
+    """
+    Case-insensitive substring search over a list of names. Search terms of 3 or more characters only get compared to the names sharing their rarest trigram.
+    Only the names get pickled, the index gets rebuilt when unpickling.
+    """
+    def __init__(self, names: Sequence[Optional[str]]) -> None:
+        self.__names: Sequence[Optional[str]] = names
+        self.__build()
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'names': self.__names}
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__names = state['names']
+        self.__build()
+
+
+    @property
+    def estimated_size(self) -> int:
+        """
+        Estimated number of bytes occupied by the index, not including the names.
+        """
+        result = sys.getsizeof(self.__names_lower) + sum(sys.getsizeof(name) for name in self.__names_lower)
+        result += sys.getsizeof(self.__row_indices_by_trigram) + sum(sys.getsizeof(trigram) + sys.getsizeof(row_indices) for trigram, row_indices in self.__row_indices_by_trigram.items())
+        return result
+
+
+    def find(self, name: str) -> List[int]:
+        """
+        Returns the indices of the names containing the specified name in ascending order.
+        """
+        name_lower = name.lower()
+        names_lower = self.__names_lower
+        if len(name_lower) < 3:
+            return [i for i, current_name in enumerate(names_lower) if current_name and name_lower in current_name]
+        candidates = min((self.__row_indices_by_trigram.get(trigram, ()) for trigram in NameIndex.__get_trigrams(name_lower)), key=len)
+        return [i for i in candidates if name_lower in names_lower[i]]
+
+
+    def __build(self) -> None:
+        self.__names_lower: List[str] = [name.lower() if name else '' for name in self.__names]
+        row_indices_by_trigram: Dict[str, List[int]] = {}
+        for i, name_lower in enumerate(self.__names_lower):
+            for trigram in NameIndex.__get_trigrams(name_lower):
+                row_indices_by_trigram.setdefault(trigram, []).append(i)
+        self.__row_indices_by_trigram: Dict[str, array] = {trigram: array('i', row_indices) for trigram, row_indices in row_indices_by_trigram.items()}
+
+
+    @staticmethod
+    def __get_trigrams(name_lower: str) -> Set[str]:
+        return {name_lower[i:i + 3] for i in range(len(name_lower) - 2)}
+
+
+
+
+
+class TourneyUsersView(Mapping):
+    """
+    Read-only mapping of user ids to user infos. The user infos get created on access, so modifying them doesn't affect the underlying data.
+    """
+    def __init__(self, row_indices: Dict[str, int], create_user_info: Callable[[int], EntityInfo]) -> None:
+        self.__row_indices: Dict[str, int] = row_indices
+        self.__create_user_info: Callable[[int], EntityInfo] = create_user_info
+
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self.__row_indices
+
+
+    def __getitem__(self, user_id: str) -> EntityInfo:
+        return self.__create_user_info(self.__row_indices[user_id])
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__row_indices)
+
+
+    def __len__(self) -> int:
+        return len(self.__row_indices)
+
+
+
+
+
 class TourneyData(object):
+    """
+    The user data is stored in typed columns, with one row per user. Fleets are referenced by their id and the user infos get created on access.
+    The fleet infos are read-only. User and fleet names are indexed for searching.
+    """
+    # Key, index in the raw user entry, kind of value
+    __USER_COLUMNS_V3: List[Tuple[str, int, str]] = [
+        ('Id', 0, 'raw'),
+        ('AllianceId', 1, 'raw'),
+        ('Trophy', 2, 'raw'),
+        ('AllianceScore', 3, 'raw'),
+        ('AllianceMembership', 4, 'raw'),
+        ('AllianceJoinDate', 5, 'raw'),
+        ('LastLoginDate', 6, 'raw'),
+        ('Name', 7, 'raw'),
+    ]
+    __USER_COLUMNS_V4: List[Tuple[str, int, str]] = [
+        ('Id', 0, 'str'),
+        ('AllianceId', 2, 'str'),
+        ('Trophy', 3, 'str'),
+        ('AllianceScore', 4, 'str'),
+        ('AllianceMembership', 5, 'membership'),
+        ('Name', 1, 'raw'),
+        ('CrewDonated', 9, 'str'),
+        ('CrewReceived', 10, 'str'),
+        ('PVPAttackWins', 11, 'str'),
+        ('PVPAttackLosses', 12, 'str'),
+        ('PVPAttackDraws', 13, 'str'),
+        ('PVPDefenceWins', 14, 'str'),
+        ('PVPDefenceLosses', 15, 'str'),
+        ('PVPDefenceDraws', 16, 'str'),
+    ]
+    __USER_COLUMNS_V5: List[Tuple[str, int, str]] = __USER_COLUMNS_V4[:5] + [
+        ('AllianceJoinDate', 6, 'optional_timestamp'),
+        ('LastLoginDate', 7, 'timestamp'),
+        ('Name', 1, 'raw'),
+        ('LastHeartBeatDate', 8, 'timestamp'),
+    ] + __USER_COLUMNS_V4[6:]
+    __USER_COLUMNS_V6: List[Tuple[str, int, str]] = __USER_COLUMNS_V5 + [('ChampionshipScore', 17, 'str')]
+    __USER_COLUMNS_V8: List[Tuple[str, int, str]] = __USER_COLUMNS_V6 + [('HighestTrophy', 18, 'str')]
+    __USER_COLUMNS_V9: List[Tuple[str, int, str]] = __USER_COLUMNS_V8 + [('TournamentBonusScore', 19, 'str')]
+
+
     def __init__(self, data: dict) -> None:
         self.__fleets: EntitiesData = None
-        self.__users: EntitiesData = None
         self.__meta: Dict[str, object] = data['meta']
 
+        users_data = data['users']
         if not self.__meta.get('schema_version', None):
             self.__meta['schema_version'] = 3
         if self.__meta['schema_version'] >= 9:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v7(data['fleets'], data['users']) # No change to prior schema version
-            self.__users = TourneyData.__create_user_dict_from_data_v9(data['users'], self.__fleets)
+            user_columns = TourneyData.__USER_COLUMNS_V9
         elif self.__meta['schema_version'] >= 8:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v7(data['fleets'], data['users']) # No change to prior schema version
-            self.__users = TourneyData.__create_user_dict_from_data_v8(data['users'], self.__fleets)
+            user_columns = TourneyData.__USER_COLUMNS_V8
         elif self.__meta['schema_version'] >= 7:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v7(data['fleets'], data['users'])
-            self.__users = TourneyData.__create_user_dict_from_data_v6(data['users'], self.__fleets) # No change to prior schema version
+            user_columns = TourneyData.__USER_COLUMNS_V6 # No change to prior schema version
         elif self.__meta['schema_version'] >= 6:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v6(data['fleets'], data['users'])
-            self.__users = TourneyData.__create_user_dict_from_data_v6(data['users'], self.__fleets)
+            user_columns = TourneyData.__USER_COLUMNS_V6
         elif self.__meta['schema_version'] >= 5:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v4(data['fleets'], data['users']) # No change to prior schema version
-            self.__users = TourneyData.__create_user_dict_from_data_v5(data['users'], self.__fleets)
+            user_columns = TourneyData.__USER_COLUMNS_V5
         elif self.__meta['schema_version'] >= 4:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v4(data['fleets'], data['users'])
-            self.__users = TourneyData.__create_user_dict_from_data_v4(data['users'], self.__fleets)
+            user_columns = TourneyData.__USER_COLUMNS_V4
         elif self.__meta['schema_version'] >= 3:
             self.__fleets = TourneyData.__create_fleet_data_from_data_v3(data['fleets'], data['users'], data['data'])
-            self.__users = TourneyData.__create_user_data_from_data_v3(data['users'], data['data'], self.__fleets)
+            users_data = TourneyData.__create_users_data_from_data_v3(data['users'], data['data'])
+            user_columns = TourneyData.__USER_COLUMNS_V3
         self.__data_date: datetime = utils.parse.formatted_datetime(data['meta']['timestamp'], include_tz=False, include_tz_brackets=False)
+        self.__fleets = utils.readonly.make_read_only(self.__fleets)
+        self.__fleet_name_index: NameIndex = NameIndex([fleet_info.get('AllianceName') for fleet_info in self.__fleets.values()])
+        self.__fleet_ids_by_row: List[str] = list(self.__fleets.keys())
 
-        self.__top_100_users: EntitiesData = {}
-        top_users_infos = sorted(list(self.__users.values()), key=lambda user_info: -int(user_info.get('Trophy', 0)))[:100]
-        top_users_ids = [user_info['Id'] for user_info in top_users_infos]
-        for key, value in self.__users.items():
-            if key in top_users_ids:
-                self.__top_100_users[key] = value
-                top_users_ids.remove(key)
-                if not top_users_ids:
-                    break
+        self.__user_columns: Dict[str, Tuple[Sequence, Callable[[object], object]]] = TourneyData.__create_user_columns(users_data, user_columns)
+        user_id_column, convert_user_id = self.__user_columns['Id']
+        # Like a dict of user infos: a user id appearing twice keeps its first position, but points to its last row.
+        self.__user_row_indices: Dict[str, int] = {convert_user_id(user_id): i for i, user_id in enumerate(user_id_column)}
+
+        trophy_column, _ = self.__user_columns['Trophy']
+        top_100_row_indices = set(heapq.nlargest(100, self.__user_row_indices.values(), key=lambda row_index: int(trophy_column[row_index] or 0)))
+        self.__top_100_user_row_indices: Dict[str, int] = {user_id: row_index for user_id, row_index in self.__user_row_indices.items() if row_index in top_100_row_indices}
+        name_column, _ = self.__user_columns['Name']
+        self.__user_name_index: NameIndex = NameIndex(name_column)
+        self.__estimated_size: int = self.__estimate_size()
 
 
     @property
@@ -80,6 +240,13 @@ class TourneyData(object):
         """
         return self.__data_date.day
 
+    @property
+    def estimated_size(self) -> int:
+        """
+        Estimated number of bytes occupied by the user and fleet data.
+        """
+        return self.__estimated_size
+
     @property
     def fleet_ids(self) -> List[str]:
         return list(self.__fleets.keys())
@@ -125,20 +292,20 @@ class TourneyData(object):
     @property
     def top_100_users(self) -> EntitiesData:
         """
-        Copy of top 100 users
+        Read-only view of the top 100 users. The user infos get created on access.
         """
-        return dict({key: dict(value) for key, value in self.__top_100_users.items()})
+        return TourneyUsersView(self.__top_100_user_row_indices, self.__create_user_info)
 
     @property
     def user_ids(self) -> List[str]:
-        return list(self.__users.keys())
+        return list(self.__user_row_indices.keys())
 
     @property
     def users(self) -> EntitiesData:
         """
-        Copy of user data
+        Read-only view of the user data. The user infos get created on access.
         """
-        return dict({key: dict(value) for key, value in self.__users.items()})
+        return TourneyUsersView(self.__user_row_indices, self.__create_user_info)
 
     @property
     def year(self) -> int:
@@ -152,19 +319,21 @@ class TourneyData(object):
         """
         Look up fleet by id
         """
-        return dict(self.__fleets.get(fleet_id, None))
+        fleet_info = self.__fleets.get(fleet_id, None)
+        if fleet_info is None:
+            return None
+        return dict(fleet_info)
 
 
     def get_fleet_data_by_name(self, fleet_name: str) -> EntitiesData:
         """
         Looks up fleets having the specified fleet_name in their name.
-        Case-insensitive.
+        Case-insensitive. The fleet infos are read-only, create a copy via dict(...) to modify them.
         """
         result = {}
-        for current_fleet_id, current_fleet_data in self.__fleets.items():
-            current_fleet_name = current_fleet_data.get('Name', None)
-            if current_fleet_name and fleet_name.lower() in current_fleet_name.lower():
-                result[current_fleet_id] = dict(current_fleet_data)
+        for row_index in self.__fleet_name_index.find(fleet_name):
+            fleet_id = self.__fleet_ids_by_row[row_index]
+            result[fleet_id] = self.__fleets[fleet_id]
         return result
 
 
@@ -172,28 +341,62 @@ class TourneyData(object):
         """
         Look up user by id
         """
-        return dict(self.__users.get(user_id, None))
+        row_index = self.__user_row_indices.get(user_id, None)
+        if row_index is None:
+            return None
+        return self.__create_user_info(row_index)
 
 
     def get_user_data_by_name(self, user_name: str) -> EntitiesData:
         """
         Looks up users having the specified user_name in their name.
-        Case-insensitive.
+        Case-insensitive. Returns a read-only view, the user infos get created on access.
         """
-        result = {}
-        for current_user_id, current_user_data in self.__users.items():
-            current_user_name = current_user_data.get('Name', None)
-            if current_user_name and user_name.lower() in current_user_name.lower():
-                result[current_user_id] = dict(current_user_data)
+        user_id_column, convert_user_id = self.__user_columns['Id']
+        row_indices = {}
+        for row_index in self.__user_name_index.find(user_name):
+            user_id = convert_user_id(user_id_column[row_index])
+            # Skip rows of user ids appearing twice, that have been superseded by a later row.
+            if self.__user_row_indices.get(user_id) == row_index:
+                row_indices[user_id] = row_index
+        return TourneyUsersView(row_indices, self.__create_user_info)
+
+
+    def get_users_data_by_fleet_id(self, fleet_id: str) -> EntitiesData:
+        """
+        Read-only view of the users being a member of the specified fleet.
+        """
+        fleet_id_column, convert_fleet_id = self.__user_columns['AllianceId']
+        row_indices = {user_id: row_index for user_id, row_index in self.__user_row_indices.items() if convert_fleet_id(fleet_id_column[row_index]) == fleet_id}
+        return TourneyUsersView(row_indices, self.__create_user_info)
+
+
+    def __estimate_size(self) -> int:
+        result = sys.getsizeof(self.__user_row_indices) + sum(sys.getsizeof(user_id) for user_id in self.__user_row_indices)
+        for column, _ in self.__user_columns.values():
+            result += sys.getsizeof(column)
+            if isinstance(column, list):
+                result += sum(sys.getsizeof(value) for value in column)
+        for fleet_info in self.__fleets.values():
+            result += sys.getsizeof(fleet_info) + sum(sys.getsizeof(value) for value in fleet_info.values())
+        result += self.__user_name_index.estimated_size + self.__fleet_name_index.estimated_size
+        return result
+
+
+    def __create_user_info(self, row_index: int) -> EntityInfo:
+        result = {key: convert(column[row_index]) for key, (column, convert) in self.__user_columns.items()}
+        fleet_id = result['AllianceId']
+        fleet_info = self.__fleets.get(fleet_id, None) if fleet_id and fleet_id != '0' else None
+        result['Alliance'] = dict(fleet_info) if fleet_info else {}
         return result
 
 
     @staticmethod
     def __create_fleet_data_from_data_v3(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]], data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        member_counts = Counter(user_info[1] for user_info in data)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = entry[0]
-            users = [user_info for user_info in data if user_info[1] == alliance_id]
             if len(entry) == 4:
                 division_design_id = entry[3]
             else:
@@ -210,7 +413,7 @@ class TourneyData(object):
                 'AllianceName': entry[1],
                 'Score': entry[2],
                 'DivisionDesignId': division_design_id,
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': member_counts[alliance_id],
             }
         ranked_fleets_infos = sorted(sorted(result.values(), key=lambda fleet_info: int(fleet_info['Score']), reverse=True), key=lambda fleet_info: fleet_info['DivisionDesignId'])
         for i, ranked_fleet_info in enumerate(ranked_fleets_infos, 1):
@@ -221,16 +424,16 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v4(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        member_counts = Counter(user_info[2] for user_info in users_data)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': member_counts[entry[0]],
             }
         ranked_fleets_infos = sorted(result.values(), key=lambda fleet_info: (fleet_info['DivisionDesignId'], -int(fleet_info['Score']), -int(fleet_info['Trophy'])))
         for i, ranked_fleet_info in enumerate(ranked_fleets_infos, 1):
@@ -241,16 +444,16 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v6(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        member_counts = Counter(user_info[2] for user_info in users_data)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users),
+                'NumberOfMembers': member_counts[entry[0]],
                 'ChampionshipScore': str(entry[5]),
             }
         ranked_fleets_infos = sorted(result.values(), key=lambda fleet_info: (fleet_info['DivisionDesignId'], -int(fleet_info['Score']), -int(fleet_info['Trophy'])))
@@ -262,16 +465,16 @@ class TourneyData(object):
     @staticmethod
     def __create_fleet_data_from_data_v7(fleets_data: List[List[Union[int, str]]], users_data: List[List[Union[int, str]]]) -> EntitiesData:
         result = {}
+        member_counts = Counter(user_info[2] for user_info in users_data)
         for i, entry in enumerate(fleets_data, 1):
             alliance_id = str(entry[0])
-            users = [user_info for user_info in users_data if user_info[2] == entry[0]]
             result[alliance_id] = {
                 'AllianceId': alliance_id,
                 'AllianceName': entry[1],
                 'Score': str(entry[2]),
                 'DivisionDesignId': str(entry[3]),
                 'Trophy': str(entry[4]),
-                'NumberOfMembers': len(users) if users else str(entry[6]),
+                'NumberOfMembers': member_counts[entry[0]] or str(entry[6]),
                 'ChampionshipScore': str(entry[5]),
                 'NumberOfApprovedMembers': str(entry[7])
             }
@@ -284,220 +487,235 @@ class TourneyData(object):
 
 
     @staticmethod
-    def __create_user_data_from_data_v3(users: List[List[Union[int, str]]], data: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
+    def __create_user_columns(users_data: List[List[Union[int, str]]], user_columns: List[Tuple[str, int, str]]) -> Dict[str, Tuple[Sequence, Callable[[object], object]]]:
         result = {}
-        users_dict = dict(users)
-        for entry in data:
-            fleet_id = entry[1]
-            result[entry[0]] = {
-                'Id': entry[0],
-                'AllianceId': fleet_id,
-                'Trophy': entry[2],
-                'AllianceScore': entry[3],
-                'AllianceMembership': entry[4],
-                'AllianceJoinDate': entry[5],
-                'LastLoginDate': entry[6],
-                'Name': users_dict[entry[0]],
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[entry[0]]['Alliance'][key] = value
-
+        for key, index, kind in user_columns:
+            values = [user[index] for user in users_data]
+            column = values
+            if kind != 'raw':
+                try:
+                    column = array('q', values)
+                except (OverflowError, TypeError):
+                    pass
+            result[key] = (column, TourneyData.__get_user_value_converter(kind))
         return result
 
 
     @staticmethod
-    def __create_user_dict_from_data_v4(users: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
-        result = {}
-        for user in users:
-            fleet_id = str(user[2])
-            user_id = str(user[0])
-            result[user_id] = {
-                'Id': user_id,
-                'AllianceId': fleet_id,
-                'Trophy': str(user[3]),
-                'AllianceScore': str(user[4]),
-                'AllianceMembership': lookups.ALLIANCE_MEMBERSHIP_LOOKUP[user[5]],
-                'Name': user[1],
-                'CrewDonated': str(user[9]),
-                'CrewReceived': str(user[10]),
-                'PVPAttackWins': str(user[11]),
-                'PVPAttackLosses': str(user[12]),
-                'PVPAttackDraws': str(user[13]),
-                'PVPDefenceWins': str(user[14]),
-                'PVPDefenceLosses': str(user[15]),
-                'PVPDefenceDraws': str(user[16]),
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[user_id]['Alliance'][key] = value
-
-        return result
+    def __create_users_data_from_data_v3(users: List[List[Union[int, str]]], data: List[List[Union[int, str]]]) -> List[List[Union[int, str]]]:
+        users_dict = dict(users)
+        return [list(entry[:7]) + [users_dict[entry[0]]] for entry in data]
 
 
     @staticmethod
-    def __create_user_dict_from_data_v5(users: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
-        result = {}
-        for user in users:
-            fleet_id = str(user[2])
-            user_id = str(user[0])
-            result[user_id] = {
-                'Id': user_id,
-                'AllianceId': fleet_id,
-                'Trophy': str(user[3]),
-                'AllianceScore': str(user[4]),
-                'AllianceMembership': lookups.ALLIANCE_MEMBERSHIP_LOOKUP[user[5]],
-                'AllianceJoinDate': TourneyData.__convert_timestamp_v4(user[6]) if user[6] else None,
-                'LastLoginDate': TourneyData.__convert_timestamp_v4(user[7]),
-                'Name': user[1],
-                'LastHeartBeatDate': TourneyData.__convert_timestamp_v4(user[8]),
-                'CrewDonated': str(user[9]),
-                'CrewReceived': str(user[10]),
-                'PVPAttackWins': str(user[11]),
-                'PVPAttackLosses': str(user[12]),
-                'PVPAttackDraws': str(user[13]),
-                'PVPDefenceWins': str(user[14]),
-                'PVPDefenceLosses': str(user[15]),
-                'PVPDefenceDraws': str(user[16]),
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[user_id]['Alliance'][key] = value
+    def __get_user_value_converter(kind: str) -> Callable[[object], object]:
+        # The converters are module level functions, so that TourneyData objects can be pickled.
+        if kind == 'str':
+            return str
+        if kind == 'membership':
+            return _convert_alliance_membership
+        if kind == 'timestamp':
+            return _convert_timestamp_v4
+        if kind == 'optional_timestamp':
+            return _convert_optional_timestamp_v4
+        return _get_raw_value
 
-        return result
 
 
-    @staticmethod
-    def __create_user_dict_from_data_v6(users: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
-        result = {}
-        for user in users:
-            fleet_id = str(user[2])
-            user_id = str(user[0])
-            result[user_id] = {
-                'Id': user_id,
-                'AllianceId': fleet_id,
-                'Trophy': str(user[3]),
-                'AllianceScore': str(user[4]),
-                'AllianceMembership': lookups.ALLIANCE_MEMBERSHIP_LOOKUP[user[5]],
-                'AllianceJoinDate': TourneyData.__convert_timestamp_v4(user[6]) if user[6] else None,
-                'LastLoginDate': TourneyData.__convert_timestamp_v4(user[7]),
-                'Name': user[1],
-                'LastHeartBeatDate': TourneyData.__convert_timestamp_v4(user[8]),
-                'CrewDonated': str(user[9]),
-                'CrewReceived': str(user[10]),
-                'PVPAttackWins': str(user[11]),
-                'PVPAttackLosses': str(user[12]),
-                'PVPAttackDraws': str(user[13]),
-                'PVPDefenceWins': str(user[14]),
-                'PVPDefenceLosses': str(user[15]),
-                'PVPDefenceDraws': str(user[16]),
-                'ChampionshipScore': str(user[17]),
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[user_id]['Alliance'][key] = value
 
-        return result
 
+class TourneyDataCache():
+    """
+    Least recently used cache for TourneyData objects with a memory budget. Pinned entries never get evicted, but count towards the budget.
 
-    @staticmethod
-    def __create_user_dict_from_data_v8(users: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
-        result = {}
-        for user in users:
-            fleet_id = str(user[2])
-            user_id = str(user[0])
-            result[user_id] = {
-                'Id': user_id,
-                'AllianceId': fleet_id,
-                'Trophy': str(user[3]),
-                'AllianceScore': str(user[4]),
-                'AllianceMembership': lookups.ALLIANCE_MEMBERSHIP_LOOKUP[user[5]],
-                'AllianceJoinDate': TourneyData.__convert_timestamp_v4(user[6]) if user[6] else None,
-                'LastLoginDate': TourneyData.__convert_timestamp_v4(user[7]),
-                'Name': user[1],
-                'LastHeartBeatDate': TourneyData.__convert_timestamp_v4(user[8]),
-                'CrewDonated': str(user[9]),
-                'CrewReceived': str(user[10]),
-                'PVPAttackWins': str(user[11]),
-                'PVPAttackLosses': str(user[12]),
-                'PVPAttackDraws': str(user[13]),
-                'PVPDefenceWins': str(user[14]),
-                'PVPDefenceLosses': str(user[15]),
-                'PVPDefenceDraws': str(user[16]),
-                'ChampionshipScore': str(user[17]),
-                'HighestTrophy': str(user[18]),
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[user_id]['Alliance'][key] = value
+    The same TourneyData object may be stored under multiple keys (e.g. the monthly and the daily data stored in the same file). It only counts towards the budget once.
+    If a disk cache path is specified, evicted entries of past months get written to a compressed file there, so they don't have to be downloaded again.
+    All methods must be called from the event loop. The disk I/O runs on the default executor.
+    """
+    def __init__(self, max_size: int, disk_cache_path: Optional[str] = None) -> None:
+        self.__max_size: int = max_size
+        self.__disk_cache_path: Optional[str] = disk_cache_path
 
-        return result
+        self.__entries: OrderedDict[TourneyDataKey, TourneyData] = OrderedDict()
+        self.__pinned_keys: Set[TourneyDataKey] = set()
+        self.__reference_counts: Dict[int, int] = {}
+        self.__size: int = 0
 
+        self.__disk_hits: int = 0
+        self.__evicted_size: int = 0
+        self.__evictions: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
 
-    @staticmethod
-    def __create_user_dict_from_data_v9(users: List[List[Union[int, str]]], fleet_data: EntitiesData) -> EntitiesData:
-        result = {}
-        for user in users:
-            fleet_id = str(user[2])
-            user_id = str(user[0])
-            result[user_id] = {
-                'Id': user_id,
-                'AllianceId': fleet_id,
-                'Trophy': str(user[3]),
-                'AllianceScore': str(user[4]),
-                'AllianceMembership': lookups.ALLIANCE_MEMBERSHIP_LOOKUP[user[5]],
-                'AllianceJoinDate': TourneyData.__convert_timestamp_v4(user[6]) if user[6] else None,
-                'LastLoginDate': TourneyData.__convert_timestamp_v4(user[7]),
-                'Name': user[1],
-                'LastHeartBeatDate': TourneyData.__convert_timestamp_v4(user[8]),
-                'CrewDonated': str(user[9]),
-                'CrewReceived': str(user[10]),
-                'PVPAttackWins': str(user[11]),
-                'PVPAttackLosses': str(user[12]),
-                'PVPAttackDraws': str(user[13]),
-                'PVPDefenceWins': str(user[14]),
-                'PVPDefenceLosses': str(user[15]),
-                'PVPDefenceDraws': str(user[16]),
-                'ChampionshipScore': str(user[17]),
-                'HighestTrophy': str(user[18]),
-                'TournamentBonusScore': str(user[19]),
-                'Alliance': {}
-            }
-            if fleet_id and fleet_id != '0':
-                fleet_info = fleet_data.get(fleet_id, {})
-                for key, value in fleet_info.items():
-                    result[user_id]['Alliance'][key] = value
 
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """
+        Estimated number of bytes occupied by the cached data.
+        """
+        return self.__size
+
+
+    def add(self, key: TourneyDataKey, tourney_data: TourneyData) -> None:
+        """
+        Adds or replaces an entry and evicts the least recently used entries, until the cache fits into the budget again. The added entry doesn't get evicted right away.
+        """
+        self.__add_reference(tourney_data)
+        if key in self.__entries:
+            self.__remove_reference(self.__entries[key])
+        self.__entries[key] = tourney_data
+        self.__entries.move_to_end(key)
+        self.__evict(key)
+
+
+    def get(self, key: TourneyDataKey) -> Optional[TourneyData]:
+        result = self.__entries.get(key)
+        if result is None:
+            self.__misses += 1
+        else:
+            self.__entries.move_to_end(key)
+            self.__hits += 1
         return result
 
 
-    @staticmethod
-    def __convert_timestamp_v4(timestamp: int) -> str:
-        minutes, seconds = divmod(timestamp, 60)
-        hours, minutes = divmod(minutes, 60)
-        days, hours = divmod(hours, 24)
-        td = timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
-        dt = utils.constants.PSS_START_DATETIME + td
-        result = utils.format.pss_datetime(dt)
+    def get_latest_year_and_month(self) -> Optional[Tuple[int, int]]:
+        if not self.__entries:
+            return None
+        return max((year, month) for year, month, _ in self.__entries.keys())
+
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'count': len(self.__entries),
+            'disk_hits': self.__disk_hits,
+            'evicted_size': self.__evicted_size,
+            'evictions': self.__evictions,
+            'hits': self.__hits,
+            'max_size': self.__max_size,
+            'misses': self.__misses,
+            'pinned': sorted(self.__pinned_keys, key=lambda key: (key[0], key[1], key[2] or 0)),
+            'size': self.__size,
+        }
+
+
+    async def load_from_disk(self, key: TourneyDataKey) -> Optional[TourneyData]:
+        """
+        Reads an entry evicted earlier from the disk cache and adds it to the cache again.
+        """
+        file_path = self.__get_file_path(key)
+        if not file_path:
+            return None
+        result = await asyncio.get_running_loop().run_in_executor(None, _read_tourney_data_file, file_path)
+        if result is not None:
+            self.__disk_hits += 1
+            self.add(key, result)
         return result
 
 
+    def pin(self, keys: Iterable[TourneyDataKey]) -> None:
+        """
+        Replaces the pinned keys. Entries that were pinned before may get evicted from now on.
+        """
+        self.__pinned_keys = set(keys)
+        self.__evict()
 
 
+    def __add_reference(self, tourney_data: TourneyData) -> None:
+        reference_count = self.__reference_counts.get(id(tourney_data), 0)
+        if reference_count == 0:
+            self.__size += tourney_data.estimated_size
+        self.__reference_counts[id(tourney_data)] = reference_count + 1
 
-class TourneyDataClient():
-    def __init__(self, project_id: str, private_key_id: str, private_key: str, client_email: str, client_id: str, scopes: List[str], folder_id: str, service_account_file_path: str, settings_file_path: str, earliest_date: datetime) -> None:
-        print('Create TourneyDataClient')
+
+    def __evict(self, keep_key: TourneyDataKey = None) -> None:
+        if self.__size <= self.__max_size:
+            return
+        for key in list(self.__entries.keys()):
+            if self.__size <= self.__max_size:
+                break
+            if key == keep_key or key in self.__pinned_keys:
+                continue
+            tourney_data = self.__entries.pop(key)
+            self.__evictions += 1
+            # An object still stored under another key neither frees memory nor needs to be written to disk.
+            if self.__remove_reference(tourney_data):
+                self.__evicted_size += tourney_data.estimated_size
+                self.__save_to_disk(key, tourney_data)
+
+
+    def __get_file_path(self, key: TourneyDataKey) -> Optional[str]:
+        if not self.__disk_cache_path:
+            return None
+        year, month, day = key
+        file_name = f'{year:04d}{month:02d}{day:02d}' if day is not None else f'{year:04d}{month:02d}'
+        return os.path.join(self.__disk_cache_path, f'{file_name}.pickle.gz')
+
+
+    def __remove_reference(self, tourney_data: TourneyData) -> bool:
+        """
+        Returns True, if there are no more entries referencing the object.
+        """
+        reference_count = self.__reference_counts.pop(id(tourney_data)) - 1
+        if reference_count:
+            self.__reference_counts[id(tourney_data)] = reference_count
+            return False
+        self.__size -= tourney_data.estimated_size
+        return True
+
+
+    def __save_to_disk(self, key: TourneyDataKey, tourney_data: TourneyData) -> None:
+        file_path = self.__get_file_path(key)
+        if not file_path:
+            return
+        year, month, day = key
+        utc_now = utils.get_utc_now()
+        # The data of the running month may still change, daily data and the data of past months won't.
+        if day is None and (year, month) >= (utc_now.year, utc_now.month):
+            return
+        asyncio.get_running_loop().run_in_executor(None, _write_tourney_data_file, file_path, tourney_data)
+
+
+
+
+
+class TourneyDataSource():
+    """
+    Base class for the places the tourney data files can be retrieved from. The methods are blocking.
+    """
+    def download_file(self, file_id: str) -> Optional[str]:
+        """
+        Returns the contents of the file with the specified id.
+        """
+        raise NotImplementedError()
+
+
+    def list_files(self) -> Dict[str, str]:
+        """
+        Returns the ids of all tourney data files by file name.
+        """
+        raise NotImplementedError()
+
+
+
+
+
+class GoogleDriveTourneyDataSource(TourneyDataSource):
+    """
+    Retrieves the tourney data files from a Google Drive folder.
+    The access token gets refreshed shortly before it expires, instead of probing the connection before every request.
+    """
+    __ACCESS_TOKEN_REFRESH_MARGIN: timedelta = timedelta(minutes=5)
+
+
+    def __init__(self, project_id: str, private_key_id: str, private_key: str, client_email: str, client_id: str, scopes: List[str], folder_id: str, service_account_file_path: str, settings_file_path: str) -> None:
         self._client_email: str = client_email
         self._client_id: str = client_id
         self._folder_id: str = folder_id
@@ -507,19 +725,256 @@ class TourneyDataClient():
         self._scopes: List[str] = list(scopes)
         self._service_account_file_path: str = service_account_file_path
         self._settings_file_path: str = settings_file_path
+
+        # pydrive's http client isn't thread-safe, so only one executor thread may talk to Drive at a time.
+        self.__DRIVE_LOCK: Lock = Lock()
+        self.__access_token_expires_at: Optional[datetime] = None
+        self.__drive: pydrive.drive.GoogleDrive = None
+        self.__gauth: pydrive.auth.GoogleAuth = None
+        self.__initialize()
+
+
+    def download_file(self, file_id: str) -> Optional[str]:
+        return self.__execute(lambda: self.__drive.CreateFile({'id': file_id}).GetContentString())
+
+
+    def list_files(self) -> Dict[str, str]:
+        query = f'\'{self._folder_id}\' in parents and title contains \'{TOURNEY_DATA_FILE_NAME_PREFIX}\''
+        file_list = self.__execute(lambda: self.__drive.ListFile({'q': query}).GetList())
+        return {file_def['title']: file_def['id'] for file_def in file_list}
+
+
+    def __ensure_access_token(self) -> None:
+        utc_now = utils.get_utc_now()
+        if self.__access_token_expires_at is None or utc_now >= self.__access_token_expires_at:
+            access_token_info = self.__gauth.credentials.get_access_token()
+            self.__access_token_expires_at = utc_now + timedelta(seconds=access_token_info.expires_in or 0) - GoogleDriveTourneyDataSource.__ACCESS_TOKEN_REFRESH_MARGIN
+
+
+    def __execute(self, func: Callable[[], Any]) -> Any:
+        with self.__DRIVE_LOCK:
+            try:
+                self.__ensure_access_token()
+                return func()
+            except pydrive.auth.InvalidConfigError:
+                # The credentials got lost, start over once.
+                self.__initialize()
+                self.__ensure_access_token()
+                return func()
+
+
+    def __initialize(self) -> None:
+        TourneyDataClient.create_service_account_credential_json(self._project_id, self._private_key_id, self._private_key, self._client_email, self._client_id, self._service_account_file_path)
+        TourneyDataClient.create_service_account_settings_yaml(self._settings_file_path, self._service_account_file_path, self._scopes)
+        self.__gauth = pydrive.auth.GoogleAuth(settings_file=self._settings_file_path)
+        credentials = pydrive.auth.ServiceAccountCredentials.from_json_keyfile_name(self._service_account_file_path, self._scopes)
+        self.__gauth.credentials = credentials
+        self.__drive = pydrive.drive.GoogleDrive(self.__gauth)
+        self.__access_token_expires_at = None
+
+
+
+
+
+class LocalFolderTourneyDataSource(TourneyDataSource):
+    """
+    Retrieves the tourney data files from a local folder, e.g. for development or for testing. The file ids are the file paths.
+    """
+    def __init__(self, folder_path: str) -> None:
+        self.__folder_path: str = folder_path
+
+
+    def download_file(self, file_id: str) -> Optional[str]:
+        if not os.path.isfile(file_id):
+            return None
+        with open(file_id, 'r', encoding='utf-8') as fp:
+            return fp.read()
+
+
+    def list_files(self) -> Dict[str, str]:
+        if not os.path.isdir(self.__folder_path):
+            return {}
+        return {
+            file_name: os.path.join(self.__folder_path, file_name)
+            for file_name in os.listdir(self.__folder_path)
+            if file_name.startswith(TOURNEY_DATA_FILE_NAME_PREFIX) and file_name.endswith('.json')
+        }
+
+
+
+
+
+class TourneyDataMirror():
+    """
+    Local copy of the files of a TourneyDataSource. The manifest lists all files available at the source, so the latest file of a month or day can be looked up without asking the source.
+    Files get downloaded on first access and are kept in the mirror folder. The methods are blocking and may be called from multiple threads.
+    """
+    __MANIFEST_FILE_NAME: str = 'manifest.json'
+
+
+    def __init__(self, source: TourneyDataSource, mirror_path: Optional[str] = None) -> None:
+        self.__source: TourneyDataSource = source
+        self.__mirror_path: Optional[str] = mirror_path
+
+        self.__SYNC_LOCK: Lock = Lock()
+        self.__FILE_LOCKS_LOCK: Lock = Lock()
+        self.__file_locks: Dict[str, Lock] = {}
+        self.__file_ids: Dict[str, str] = {}
+        self.__file_names: List[str] = []
+        self.__synced_at: Optional[datetime] = None
+
+        self.__load_manifest()
+
+
+    @property
+    def file_count(self) -> int:
+        return len(self.__file_names)
+
+    @property
+    def synced_at(self) -> Optional[datetime]:
+        return self.__synced_at
+
+
+    def get_latest_file_name(self, file_name_part: str) -> Optional[str]:
+        """
+        Returns the name of the latest file starting with the prefix of tourney data files followed by file_name_part.
+        """
+        prefix = f'{TOURNEY_DATA_FILE_NAME_PREFIX}{file_name_part}'
+        file_names = self.__file_names
+        index = bisect.bisect_right(file_names, f'{prefix}\U0010ffff') - 1
+        if index >= 0 and file_names[index].startswith(prefix):
+            return file_names[index]
+        return None
+
+
+    def read_file(self, file_name: str) -> Optional[str]:
+        """
+        Returns the contents of the file from the mirror folder. Downloads the file from the source, if it hasn't been mirrored, yet.
+        Concurrent reads of the same file only download it once.
+        """
+        file_path = self.__get_file_path(file_name)
+        result = TourneyDataMirror.__read_mirrored_file(file_path)
+        if result is not None:
+            return result
+
+        file_id = self.__file_ids.get(file_name)
+        if file_id is None:
+            return None
+        with self.__get_file_lock(file_name):
+            # Another thread may have downloaded the file while waiting for the lock.
+            result = TourneyDataMirror.__read_mirrored_file(file_path)
+            if result is None:
+                result = self.__source.download_file(file_id)
+                if result and file_path:
+                    _write_text_file(file_path, result)
+        return result
+
+
+    def sync(self, max_age: timedelta = None) -> bool:
+        """
+        Retrieves the list of files from the source and saves the manifest. If max_age is specified, only syncs, if the last sync is older than that.
+        Returns True, if the list of files has been retrieved.
+        """
+        with self.__SYNC_LOCK:
+            if max_age is not None and self.__synced_at is not None and utils.get_utc_now() - self.__synced_at < max_age:
+                return False
+            file_ids = self.__source.list_files()
+            # Replace the references, so that concurrent lookups either see the old or the new list of files.
+            self.__file_ids, self.__file_names, self.__synced_at = file_ids, sorted(file_ids.keys()), utils.get_utc_now()
+            self.__save_manifest()
+            return True
+
+
+    def __get_file_lock(self, file_name: str) -> Lock:
+        with self.__FILE_LOCKS_LOCK:
+            return self.__file_locks.setdefault(file_name, Lock())
+
+
+    def __get_file_path(self, file_name: str) -> Optional[str]:
+        if not self.__mirror_path:
+            return None
+        return os.path.join(self.__mirror_path, os.path.basename(file_name))
+
+
+    def __load_manifest(self) -> None:
+        manifest_file_path = self.__get_file_path(TourneyDataMirror.__MANIFEST_FILE_NAME)
+        if not manifest_file_path or not os.path.isfile(manifest_file_path):
+            return
+        try:
+            with open(manifest_file_path, 'r', encoding='utf-8') as fp:
+                manifest = json.load(fp)
+        except Exception as ex:
+            print(f'[TourneyDataMirror] Could not read the manifest \'{manifest_file_path}\': {ex}')
+            return
+        if manifest.get('format_version') != TOURNEY_DATA_MANIFEST_FORMAT_VERSION:
+            return
+        file_ids = manifest.get('files') or {}
+        # The sync date doesn't get restored, so that the first lookup syncs again.
+        self.__file_ids, self.__file_names = file_ids, sorted(file_ids.keys())
+
+
+    def __save_manifest(self) -> None:
+        manifest_file_path = self.__get_file_path(TourneyDataMirror.__MANIFEST_FILE_NAME)
+        if not manifest_file_path:
+            return
+        manifest = {
+            'format_version': TOURNEY_DATA_MANIFEST_FORMAT_VERSION,
+            'synced_at': utils.format.datetime(self.__synced_at),
+            'files': self.__file_ids,
+        }
+        _write_text_file(manifest_file_path, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+    @staticmethod
+    def __read_mirrored_file(file_path: Optional[str]) -> Optional[str]:
+        if not file_path or not os.path.isfile(file_path):
+            return None
+        with open(file_path, 'r', encoding='utf-8') as fp:
+            return fp.read()
+
+
+
+
+
+class TourneyDataClient():
+    """
+    Retrieves tournament data from a TourneyDataSource via a local mirror.
+
+    All file I/O, JSON decoding and parsing runs on the default executor, so the event loop never gets blocked.
+    Concurrent requests for the same month or day get coalesced into a single download. Requests for different months or days resolving to the same file share a single TourneyData object.
+    """
+    __MIN_SYNC_INTERVAL: timedelta = timedelta(minutes=1)
+
+
+    def __init__(self, project_id: str, private_key_id: str, private_key: str, client_email: str, client_id: str, scopes: List[str], folder_id: str, service_account_file_path: str, settings_file_path: str, earliest_date: datetime, source: TourneyDataSource = None) -> None:
+        """
+        If no source is specified, the files get retrieved from the specified Google Drive folder.
+        """
+        print('Create TourneyDataClient')
         self.__earliest_date: datetime = earliest_date
 
-        self.__READ_LOCK: Lock = Lock()
-        self.__WRITE_LOCK: Lock = Lock()
-        self.__write_requested: bool = False
-        self.__reader_count: int = 0
+        if source is None:
+            source = GoogleDriveTourneyDataSource(project_id, private_key_id, private_key, client_email, client_id, scopes, folder_id, service_account_file_path, settings_file_path)
+        mirror_path = os.path.join(os.getcwd(), settings.TOURNAMENT_DATA_MIRROR_SUB_PATH) if settings.TOURNAMENT_DATA_MIRROR_SUB_PATH else None
+        self.__mirror: TourneyDataMirror = TourneyDataMirror(source, mirror_path)
+        self.__retrieve_tasks: Dict[Tuple[int, int, Optional[int]], asyncio.Task] = {}
+        self.__read_tasks: Dict[str, asyncio.Task] = {}
+        self.__tourney_data_by_file_name: 'weakref.WeakValueDictionary[str, TourneyData]' = weakref.WeakValueDictionary()
 
-        self.__cache: Dict[int, Dict[int, Dict[int, TourneyData]]] = {}
+        disk_cache_path = os.path.join(os.getcwd(), settings.TOURNAMENT_DATA_CACHE_SUB_PATH) if settings.TOURNAMENT_DATA_CACHE_SUB_PATH else None
+        self.__cache: TourneyDataCache = TourneyDataCache(settings.TOURNAMENT_DATA_CACHE_MAX_SIZE_MB * 1024 * 1024, disk_cache_path)
 
         self.__initialized = False
-        self.__initialize()
 
 
+    @property
+    def cache(self) -> TourneyDataCache:
+        return self.__cache
+
+    @property
+    def mirror(self) -> 'TourneyDataMirror':
+        return self.__mirror
+
     @property
     def from_month(self) -> int:
         return self.__earliest_date.month
@@ -530,20 +985,20 @@ class TourneyDataClient():
 
     @property
     def to_month(self) -> int:
-        return max(self.__cache.get(self.to_year, {}).keys())
+        return self.__cache.get_latest_year_and_month()[1]
 
     @property
     def to_year(self) -> int:
-        return max(self.__cache.keys())
+        return self.__cache.get_latest_year_and_month()[0]
 
 
-    def get_data(self, year: int, month: int, day: Optional[int] = None, initializing: bool = False) -> TourneyData:
+    async def get_data(self, year: int, month: int, day: Optional[int] = None, initializing: bool = False) -> TourneyData:
         if year < self.from_year:
             raise ValueError(f'There\'s no data from {year}. Earliest data available is from {calendar.month_name[self.from_month]} {self.from_year}.')
         if year == self.from_year:
             if month < self.from_month:
                 raise ValueError(f'There\'s no data from {calendar.month_name[month]} {year}. Earliest data available is from {calendar.month_name[self.from_month]} {self.from_year}.')
-        if not initializing:
+        if not initializing and self.__cache:
             if year > self.to_year or (year == self.to_year and month > self.to_month):
                 utc_now = utils.get_utc_now()
                 if utc_now.year == year and utc_now.month == month:
@@ -552,22 +1007,49 @@ class TourneyDataClient():
                     elif day >= utc_now.day:
                         raise ValueError(f'There\'s no data from {calendar.month_name[month]} {day}, {year}. Most recent data available is from {calendar.month_name[self.to_month]} {self.to_day}, {self.to_year}.')
 
-        result = self.__read_data(year, month, day)
+        result = self.__cache.get((year, month, day))
 
         if result is None:
-            result = self.__retrieve_data(year, month, day, initializing=initializing)
-            self.__cache_data(result)
+            result = await asyncio.shield(self.__get_retrieve_task(year, month, day))
+
+        return result
+
 
+    async def get_latest_daily_data(self, initializing: bool = False) -> TourneyData:
+        year, month, day = TourneyDataClient.__get_daily_key(utils.get_utc_now(), 1)
+        result = await self.get_data(year, month, day, initializing=initializing)
         return result
 
 
-    def get_latest_daily_data(self, initializing: bool = False) -> TourneyData:
-        yesterday = utils.get_utc_now() - utils.datetime.ONE_DAY
-        result = self.get_data(yesterday.year, yesterday.month, yesterday.day, initializing=initializing)
+    async def get_latest_monthly_data(self, initializing: bool = False) -> TourneyData:
+        _, result = await self.__get_latest_monthly_data_and_key(initializing=initializing)
         return result
 
 
-    def get_latest_monthly_data(self, initializing: bool = False) -> TourneyData:
+    async def get_second_latest_daily_data(self, initializing: bool = False) -> TourneyData:
+        year, month, day = TourneyDataClient.__get_daily_key(utils.get_utc_now(), 2)
+        result = await self.get_data(year, month, day, initializing=initializing)
+        return result
+
+
+    async def prefetch_latest_data(self) -> None:
+        """
+        Syncs the file list of the mirror with the source. Then retrieves the latest monthly and daily data, if they're not cached, yet, and pins them in the cache.
+        A daily file that hasn't been published, yet, will be retrieved on the next call.
+        """
+        initializing = not self.__initialized
+        await asyncio.get_running_loop().run_in_executor(None, self.__mirror.sync)
+        utc_now = utils.get_utc_now()
+        (monthly_key, _), _, _ = await asyncio.gather(
+            self.__get_latest_monthly_data_and_key(initializing=initializing),
+            self.get_latest_daily_data(initializing=initializing),
+            self.get_second_latest_daily_data(initializing=initializing),
+        )
+        self.__cache.pin([monthly_key, TourneyDataClient.__get_daily_key(utc_now, 1), TourneyDataClient.__get_daily_key(utc_now, 2)])
+        self.__initialized = True
+
+
+    async def __get_latest_monthly_data_and_key(self, initializing: bool = False) -> Tuple[TourneyDataKey, TourneyData]:
         utc_now = utils.get_utc_now()
         year, month = TourneyDataClient.__get_last_tourney_year_and_month(utc_now)
         if settings.MOST_RECENT_TOURNAMENT_DATA:
@@ -577,137 +1059,73 @@ class TourneyDataClient():
                 year += 1
         result = None
         while year > self.from_year or month >= self.from_month:
-            result = self.get_data(year, month, initializing=initializing)
+            result = await self.get_data(year, month, initializing=initializing)
             if result:
                 break
             month -= 1
             if month == 0:
                 year -= 1
                 month = 12
-        return result
+        return (year, month, None), result
 
 
-    def get_second_latest_daily_data(self, initializing: bool = False) -> TourneyData:
-        yesterday = utils.get_utc_now() - utils.datetime.ONE_DAY - utils.datetime.ONE_DAY
-        result = self.get_data(yesterday.year, yesterday.month, yesterday.day, initializing=initializing)
-        return result
-
-
-    def __add_reader(self) -> None:
-        with self.__READ_LOCK:
-            self.__reader_count = self.__reader_count + 1
+    def __get_retrieve_task(self, year: int, month: int, day: Optional[int]) -> asyncio.Task:
+        key = (year, month, day)
+        task = self.__retrieve_tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self.__retrieve_and_cache_data(year, month, day))
+            self.__retrieve_tasks[key] = task
+            task.add_done_callback(lambda _: self.__retrieve_tasks.pop(key, None) if self.__retrieve_tasks.get(key) is task else None)
+        return task
 
 
-    def __assert_initialized(self) -> None:
-        if self.__drive is None:
-            raise Exception('The __drive object has not been initialized, yet!')
+    def __get_read_task(self, file_name: str) -> asyncio.Task:
+        task = self.__read_tasks.get(file_name)
+        if task is None or task.done():
+            task = asyncio.create_task(self.__read_data(file_name))
+            self.__read_tasks[file_name] = task
+            task.add_done_callback(lambda _: self.__read_tasks.pop(file_name, None) if self.__read_tasks.get(file_name) is task else None)
+        return task
 
 
-    def __cache_data(self, tourney_data: TourneyData) -> bool:
-        if tourney_data:
-            self.__request_write()
-            can_write = False
-            while not can_write:
-                can_write = self.__get_reader_count() == 0
-                if not can_write:
-                    time.sleep(random.random())
-                with self.__WRITE_LOCK:
-                    self.__cache.setdefault(tourney_data.year, {}).setdefault(tourney_data.month, {})[tourney_data.day] = tourney_data
-                    self.__write_requested = False
-                return True
-            return False
-        return False
-
-
-    def __ensure_initialized(self) -> None:
-        try:
-            self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'highaöegjoyödfmj giod\''}).GetList()
-        except pydrive.auth.InvalidConfigError:
-            self.__initialize()
+    async def __read_data(self, file_name: str) -> Optional[TourneyData]:
+        result = self.__tourney_data_by_file_name.get(file_name)
+        if result is None:
+            result = await asyncio.get_running_loop().run_in_executor(None, self.__read_and_parse_file, file_name)
+            if result:
+                self.__tourney_data_by_file_name[file_name] = result
+        return result
 
 
-    def __get_first_file(self, file_name: str) -> pydrive.files.GoogleDriveFile:
-        file_list = self.__drive.ListFile({'q': f"'{self._folder_id}' in parents and title = '{file_name}'"}).GetList()
-        for file_def in file_list:
-            return file_def
-        return None
+    async def __retrieve_and_cache_data(self, year: int, month: int, day: Optional[int]) -> TourneyData:
+        result = await self.__cache.load_from_disk((year, month, day))
+        if result is None:
+            file_name = await asyncio.get_running_loop().run_in_executor(None, self.__get_file_name, year, month, day)
+            # On the 1st of a month, the latest monthly and daily data may be stored in the same file, so reads get coalesced by file name.
+            result = await self.__get_read_task(file_name) if file_name else None
+            # The cache only gets modified on the event loop, so readers never see a partial update.
+            if result:
+                self.__cache.add((year, month, day), result)
+        return result
 
 
-    def __get_latest_file(self, year: int, month: int, day: Optional[int] = None, initializing: bool = False) -> pydrive.files.GoogleDriveFile:
-        if not initializing:
-            self.__ensure_initialized()
+    def __get_file_name(self, year: int, month: int, day: Optional[int] = None) -> Optional[str]:
         file_name_part: str = f'{year:04d}{month:02d}'
         if day is not None:
             file_name_part += f'{day:02d}'
-        file_list = self.__drive.ListFile({'q': f'\'{self._folder_id}\' in parents and title contains \'pss-top-100_{file_name_part}\''}).GetList()
-        if file_list:
-            file_list = sorted(file_list, key=lambda f: f['title'], reverse=True)
-            return file_list[0]
-        return None
-
-
-    def __get_reader_count(self) -> int:
-        with self.__READ_LOCK:
-            result = self.__reader_count
-        return result
-
+        if self.__mirror.synced_at is None:
+            self.__mirror.sync(max_age=TourneyDataClient.__MIN_SYNC_INTERVAL)
+        file_name = self.__mirror.get_latest_file_name(file_name_part)
+        if file_name is None and self.__mirror.sync(max_age=TourneyDataClient.__MIN_SYNC_INTERVAL):
+            # The file may have been published after the last sync.
+            file_name = self.__mirror.get_latest_file_name(file_name_part)
+        return file_name
 
-    def __get_write_requested(self) -> bool:
-        with self.__WRITE_LOCK:
-            result = self.__write_requested
-        return result
-
-
-    def __initialize(self) -> None:
-        TourneyDataClient.create_service_account_credential_json(self._project_id, self._private_key_id, self._private_key, self._client_email, self._client_id, self._service_account_file_path)
-        TourneyDataClient.create_service_account_settings_yaml(self._settings_file_path, self._service_account_file_path, self._scopes)
-        self.__gauth: pydrive.auth.GoogleAuth = pydrive.auth.GoogleAuth(settings_file=self._settings_file_path)
-        credentials = pydrive.auth.ServiceAccountCredentials.from_json_keyfile_name(self._service_account_file_path, self._scopes)
-        self.__gauth.credentials = credentials
-        self.__drive: pydrive.drive.GoogleDrive = pydrive.drive.GoogleDrive(self.__gauth)
-        self.get_latest_monthly_data(initializing=True)
-        self.get_latest_daily_data(initializing=True)
-        self.get_second_latest_daily_data(initializing=True)
-        self.__initialized = True
 
-
-    def __read_data(self, year: int, month: int, day: Optional[int] = None) -> TourneyData:
-        can_read = False
-        while not can_read:
-            can_read = not self.__get_write_requested()
-            if not can_read:
-                time.sleep(random.random())
-
-        self.__add_reader()
-        result = self.__cache.get(year, {}).get(month, {})
-        if result:
-            if day is None:
-                result = result.get(max(result.keys()), None)
-            else:
-                result = result.get(day, None)
-        else:
-            result = None
-        self.__remove_reader()
-        return result
-
-
-    def __remove_reader(self) -> None:
-        with self.__READ_LOCK:
-            self.__reader_count = self.__reader_count - 1
-
-
-    def __request_write(self) -> None:
-        with self.__WRITE_LOCK:
-            self.__write_requested = True
-
-
-    def __retrieve_data(self, year: int, month: int, day: Optional[int] = False, initializing: bool = False) -> TourneyData:
-        if not initializing:
-            self.__ensure_initialized()
-        g_file = self.__get_latest_file(year, month, day, initializing=initializing)
+    def __read_and_parse_file(self, file_name: str) -> Optional[TourneyData]:
+        raw_data = self.__mirror.read_file(file_name)
         result = None
-        if g_file:
-            raw_data = g_file.GetContentString()
+        if raw_data:
             data = json.loads(raw_data)
             if data:
                 result = TourneyData(data)
@@ -755,11 +1173,17 @@ class TourneyDataClient():
         return dt
 
 
+    @staticmethod
+    def __get_daily_key(utc_now: datetime, days_ago: int) -> TourneyDataKey:
+        dt = utc_now - utils.datetime.ONE_DAY * days_ago
+        return (dt.year, dt.month, dt.day)
+
+
     @staticmethod
     def __get_latest_file_name(dt: datetime) -> str:
         dt = TourneyDataClient.__fix_filename_datetime(dt)
         timestamp = dt.strftime('%Y%m%d-%H%M%S')
-        result = f'pss-top-100_{timestamp}.json'
+        result = f'{TOURNEY_DATA_FILE_NAME_PREFIX}{timestamp}.json'
         return result
 
 
@@ -821,4 +1245,93 @@ class TourneyDataClient():
                 year -= 1
         year = int(year)
         _, day = calendar.monthrange(year, temp_month)
-        return day, temp_month, int(year)
\ No newline at end of file
+        return day, temp_month, int(year)
+
+
+
+
+
+# ---------- Helper functions ----------
+
+def _convert_alliance_membership(alliance_membership: int) -> Optional[str]:
+    return lookups.ALLIANCE_MEMBERSHIP_LOOKUP[alliance_membership]
+
+
+def _convert_optional_timestamp_v4(timestamp: int) -> Optional[str]:
+    return _convert_timestamp_v4(timestamp) if timestamp else None
+
+
+def _convert_timestamp_v4(timestamp: int) -> str:
+    minutes, seconds = divmod(timestamp, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    td = timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+    dt = utils.constants.PSS_START_DATETIME + td
+    result = utils.format.pss_datetime(dt)
+    return result
+
+
+def _create_temp_file(file_path: str) -> Tuple[int, str]:
+    """
+    Creates a uniquely named temporary file next to file_path and returns its descriptor and path.
+    Files get written to a temporary file first, so that a crash doesn't leave a broken file behind and concurrent writers don't interfere with each other.
+    """
+    folder_path = os.path.dirname(file_path)
+    os.makedirs(folder_path, exist_ok=True)
+    return tempfile.mkstemp(dir=folder_path, prefix=f'{os.path.basename(file_path)}.', suffix='.tmp')
+
+
+def _get_raw_value(value: object) -> object:
+    return value
+
+
+def _read_tourney_data_file(file_path: str) -> Optional[TourneyData]:
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with gzip.open(file_path, 'rb') as fp:
+            contents = pickle.load(fp)
+    except Exception as ex:
+        print(f'[TourneyDataCache] Could not read the file \'{file_path}\': {ex}')
+        return None
+    if not isinstance(contents, dict) or contents.get('format_version') != TOURNEY_DATA_FILE_FORMAT_VERSION:
+        return None
+    return contents.get('tourney_data')
+
+
+def _remove_file(file_path: Optional[str]) -> None:
+    if file_path and os.path.isfile(file_path):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+def _write_tourney_data_file(file_path: str, tourney_data: TourneyData) -> None:
+    if os.path.isfile(file_path):
+        return
+    contents = {
+        'format_version': TOURNEY_DATA_FILE_FORMAT_VERSION,
+        'tourney_data': tourney_data,
+    }
+    temp_file_path = None
+    try:
+        temp_fd, temp_file_path = _create_temp_file(file_path)
+        with os.fdopen(temp_fd, 'wb') as raw_fp, gzip.GzipFile(fileobj=raw_fp, mode='wb', compresslevel=6) as fp:
+            pickle.dump(contents, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, file_path)
+    except Exception as ex:
+        _remove_file(temp_file_path)
+        print(f'[TourneyDataCache] Could not write the file \'{file_path}\': {ex}')
+
+
+def _write_text_file(file_path: str, contents: str) -> None:
+    temp_file_path = None
+    try:
+        temp_fd, temp_file_path = _create_temp_file(file_path)
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as fp:
+            fp.write(contents)
+        os.replace(temp_file_path, file_path)
+    except Exception as ex:
+        _remove_file(temp_file_path)
+        print(f'[TourneyDataMirror] Could not write the file \'{file_path}\': {ex}')
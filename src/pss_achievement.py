@@ -6,6 +6,7 @@ from . import pss_entity as entity
 ACHIEVEMENT_DESIGN_BASE_PATH: str = 'AchievementService/ListAchievementDesigns2?languageKey=en'
 ACHIEVEMENT_DESIGN_KEY_NAME: str = 'AchievementDesignId'
 ACHIEVEMENT_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'AchievementTitle'
+ACHIEVEMENT_DESIGN_VERSION_PROPERTY_NAME: str = 'AchievementDesignVersion'
 
 
 # ---------- Initialization ----------
@@ -14,5 +15,6 @@ achievements_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ACHIEVEMENT_DESIGN_BASE_PATH,
     ACHIEVEMENT_DESIGN_KEY_NAME,
     ACHIEVEMENT_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'AchievementDesigns'
+    'AchievementDesigns',
+    design_version_property_name=ACHIEVEMENT_DESIGN_VERSION_PROPERTY_NAME
 )
\ No newline at end of file
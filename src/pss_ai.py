@@ -6,10 +6,12 @@ from . import pss_entity as entity
 ACTION_TYPE_DESIGN_BASE_PATH: str = 'RoomService/ListActionTypes2?languageKey=en'
 ACTION_TYPE_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ActionTypeName'
 ACTION_TYPE_DESIGN_KEY_NAME: str = 'ActionTypeId'
+ACTION_TYPE_DESIGN_VERSION_PROPERTY_NAME: str = 'ActionTypeVersion'
 
 CONDITION_TYPE_DESIGN_BASE_PATH: str = 'RoomService/ListConditionTypes2?languageKey=en'
 CONDITION_TYPE_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ConditionTypeName'
 CONDITION_TYPE_DESIGN_KEY_NAME: str = 'ConditionTypeId'
+CONDITION_TYPE_DESIGN_VERSION_PROPERTY_NAME: str = 'ConditionTypeVersion'
 
 
 
@@ -21,12 +23,14 @@ action_types_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ACTION_TYPE_DESIGN_BASE_PATH,
     ACTION_TYPE_DESIGN_KEY_NAME,
     ACTION_TYPE_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'ActionTypeDesigns'
+    'ActionTypeDesigns',
+    design_version_property_name=ACTION_TYPE_DESIGN_VERSION_PROPERTY_NAME
 )
 
 condition_types_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     CONDITION_TYPE_DESIGN_BASE_PATH,
     CONDITION_TYPE_DESIGN_KEY_NAME,
     CONDITION_TYPE_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'ConditionTypeDesigns'
+    'ConditionTypeDesigns',
+    design_version_property_name=CONDITION_TYPE_DESIGN_VERSION_PROPERTY_NAME
 )
\ No newline at end of file
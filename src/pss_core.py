@@ -1,7 +1,10 @@
+import asyncio
 from datetime import datetime
 import json
 import re
-from typing import Any, Callable, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import weakref
 
 import aiohttp
 
@@ -19,12 +22,102 @@ LIVEOPS_BASE_PATH: str = 'LiveOpsService/GetTodayLiveOps?deviceType=DeviceTypeAn
 __RX_PROPERTY_FIX_REPLACE: re.Pattern = re.compile(r'[^a-z0-9]', re.IGNORECASE)
 __RX_ALLOWED_CANDIDATE_FIX_REPLACE: re.Pattern = re.compile(r'(\(.*?\)|[^a-z0-9 ])', re.IGNORECASE)
 
+__RESPONSE_CACHE_MAX_SIZE: int = 500
+__RESPONSE_CHUNK_SIZE: int = 64 * 1024
+
+
+
+
+
+# ---------- Classes ----------
+
+class PropertyValueIndex:
+    """
+    Search index over the values of one property of entities data. Returns the same results as get_ids_from_property_value.
+    The property values get fixed once on creation. Substring searches only check entries that contain all trigrams of the searched value.
+    """
+    __RESULTS_CACHE_MAX_SIZE: int = 256
+
+    def __init__(self, data: EntitiesData, property_name: str, fix_data_delegate: Callable[[str], str]) -> None:
+        self.__fix_data_delegate: Callable[[str], str] = fix_data_delegate
+        self.__entries: List[Tuple[str, str]] = []
+        self.__ids_by_value: Dict[str, List[str]] = {}
+        self.__positions_by_trigram: Dict[str, Set[int]] = {}
+        self.__results_cache: Dict[str, List[str]] = {}
+
+        for entry_id, entry_data in data.items():
+            if entry_data[property_name]:
+                fixed_value = fix_data_delegate(entry_data[property_name])
+                position = len(self.__entries)
+                self.__entries.append((entry_id, fixed_value))
+                self.__ids_by_value.setdefault(fixed_value, []).append(entry_id)
+                for trigram in PropertyValueIndex.__get_trigrams(fixed_value):
+                    self.__positions_by_trigram.setdefault(trigram, set()).add(position)
+
+
+    def get_ids(self, property_value: str, match_exact: bool = False) -> List[str]:
+        fixed_value = self.__fix_data_delegate(property_value)
+        if match_exact:
+            return list(self.__ids_by_value.get(fixed_value, []))
+
+        result = self.__results_cache.get(fixed_value)
+        if result is None:
+            result = self.__search(fixed_value)
+            if len(self.__results_cache) >= PropertyValueIndex.__RESULTS_CACHE_MAX_SIZE:
+                self.__results_cache.pop(next(iter(self.__results_cache)))
+            self.__results_cache[fixed_value] = result
+        return list(result)
+
+
+    def __get_candidate_positions(self, fixed_value: str) -> Iterable[int]:
+        trigrams = PropertyValueIndex.__get_trigrams(fixed_value)
+        if not trigrams:
+            return range(len(self.__entries))
+        positions_sets = []
+        for trigram in trigrams:
+            positions = self.__positions_by_trigram.get(trigram)
+            if not positions:
+                return []
+            positions_sets.append(positions)
+        positions_sets.sort(key=len)
+        result = positions_sets[0].intersection(*positions_sets[1:])
+        return sorted(result)
+
+
+    def __search(self, fixed_value: str) -> List[str]:
+        similarity_map = {}
+        for position in self.__get_candidate_positions(fixed_value):
+            entry_id, entry_property = self.__entries[position]
+            if fixed_value in entry_property:
+                similarity_value = utils.get_similarity(entry_property, fixed_value)
+                similarity_map.setdefault(similarity_value, []).append((entry_id, entry_property))
+        results = []
+        for similarity_value in sorted(similarity_map.keys(), reverse=True):
+            entries = sorted(similarity_map[similarity_value], key=lambda entry: entry[1])
+            results.extend(entry_id for (entry_id, _) in entries)
+        return results
+
+
+    @staticmethod
+    def __get_trigrams(value: str) -> Set[str]:
+        return {value[i:i + 3] for i in range(len(value) - 2)}
+
 
 
 
 
 # ---------- Functions ----------
 
+async def close_client_session() -> None:
+    """
+    Closes the shared client session. Should be called on shutdown.
+    """
+    global __client_session
+    if __client_session is not None and not __client_session.closed:
+        await __client_session.close()
+    __client_session = None
+
+
 def filter_entities_data(data: EntitiesData, by: Dict[str, str], ignore_case: bool = False) -> Optional[EntitiesData]:
     """Parameter 'data':
        - A dict with entity ids as keys and entity info as values.
@@ -50,25 +143,81 @@ async def get_base_url() -> str:
     return result
 
 
-async def get_data_from_path(path: str) -> str:
+async def get_client_session() -> aiohttp.ClientSession:
+    """
+    Returns the process-wide client session, so that connections to the same host get pooled and kept alive.
+    Do not close the returned session.
+    """
+    global __client_session
+    if __client_session is None or __client_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_CONNECTION_LIMIT,
+            limit_per_host=settings.HTTP_CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT_TOTAL, connect=settings.HTTP_TIMEOUT_CONNECT)
+        __client_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return __client_session
+
+
+async def get_data_and_dict_from_path(path: str) -> Tuple[str, Dict]:
+    """
+    Returns the raw data and the result of utils.convert.raw_xml_to_dict for it. The data gets parsed while it's being received.
+    """
+    if path:
+        path = path.strip('/')
+    base_url = await get_base_url()
+    url = f'{base_url}{path}'
+    try:
+        return await __get_data_and_dict_from_url(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        invalidate_latest_settings()
+        raise
+
+
+async def get_data_from_path(path: str, use_cache: bool = False) -> str:
+    """
+    Concurrent calls for the same path share a single request to the API.
+    If use_cache is True, a successful response will be reused for settings.API_RESPONSE_CACHE_TTL seconds. Only pass True for endpoints queried by many users at once, like rankings.
+    """
     if path:
         path = path.strip('/')
     base_url = await get_base_url()
     url = f'{base_url}{path}'
-    return await __get_data_from_url(url)
+    if use_cache:
+        result = __get_cached_response(url)
+        if result is not None:
+            return result
+    try:
+        result, status = await __get_data_from_url_coalesced(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        invalidate_latest_settings()
+        raise
+    # Error responses only get returned to the callers that received them.
+    if use_cache and status == 200 and not __is_error_response(result):
+        __cache_response(url, result)
+    return result
 
 
 async def get_latest_settings(language_key: str = 'en', base_url: str = None) -> EntityInfo:
+    """
+    Returns a copy of the latest settings document. It gets cached for settings.LATEST_SETTINGS_CACHE_TTL seconds.
+    A cached document that has expired will be returned once more, while it gets refreshed in the background.
+    """
     if not language_key:
         language_key = 'en'
     base_url = base_url or await get_base_url()
-    url = f'{base_url}{settings.LATEST_SETTINGS_BASE_PATH}{language_key}'
-    raw_text = await __get_data_from_url(url)
-    result = utils.convert.xmltree_to_dict3(raw_text)
-    maintenance_message = result.get('MaintenanceMessage')
-    if maintenance_message:
-        raise MaintenanceError(maintenance_message)
-    return result
+    cache_key = (language_key, base_url)
+    cached_settings = __latest_settings_cache.get(cache_key)
+    if cached_settings is None:
+        result = await __update_latest_settings(language_key, base_url)
+    else:
+        expires_at, result = cached_settings
+        if expires_at <= time.monotonic():
+            # Only serve an expired document once, the next call will have to wait for the refresh.
+            __latest_settings_cache.pop(cache_key, None)
+            __schedule_latest_settings_update(language_key, base_url)
+    return dict(result)
 
 
 async def get_liveops_info(language_key: str = 'en') -> EntityInfo:
@@ -87,6 +236,9 @@ def get_ids_from_property_value(data: EntitiesData, property_name: str, property
     if not fix_data_delegate:
         fix_data_delegate = __fix_property_value
 
+    if isinstance(data, utils.ReadOnlyDict):
+        return get_property_value_index(data, property_name, fix_data_delegate).get_ids(property_value, match_exact=match_exact)
+
     fixed_value = fix_data_delegate(property_value)
     fixed_data = {entry_id: fix_data_delegate(entry_data[property_name]) for entry_id, entry_data in data.items() if entry_data[property_name]}
 
@@ -113,6 +265,38 @@ def get_ids_from_property_value(data: EntitiesData, property_name: str, property
     return results
 
 
+def get_property_value_index(data: utils.ReadOnlyDict, property_name: str, fix_data_delegate: Callable[[str], str] = None) -> PropertyValueIndex:
+    """
+    Returns the search index for the specified property of read-only entities data, e.g. the data returned by a PssCache.
+    The index gets created on first use and lives as long as the data does.
+    """
+    if not fix_data_delegate:
+        fix_data_delegate = __fix_property_value
+
+    data_id = id(data)
+    data_ref, indices = __property_value_indices.get(data_id, (None, None))
+    if data_ref is None or data_ref() is not data:
+        data_ref = weakref.ref(data, lambda _: __property_value_indices.pop(data_id, None))
+        indices = {}
+        __property_value_indices[data_id] = (data_ref, indices)
+
+    index_key = (property_name, fix_data_delegate)
+    result = indices.get(index_key)
+    if result is None:
+        result = PropertyValueIndex(data, property_name, fix_data_delegate)
+        indices[index_key] = result
+    return result
+
+
+def invalidate_latest_settings() -> None:
+    """
+    Drops the cached production server and latest settings documents, e.g. after a connection failure or during maintenance.
+    """
+    global __production_server
+    __production_server = None
+    __latest_settings_cache.clear()
+
+
 def read_about_file(language_key: str = 'en') -> Dict[str, Any]:
     result = {}
     for pss_about_file in settings.PSS_ABOUT_FILES:
@@ -175,6 +359,18 @@ def transform_sanitize_text(*args, **kwargs) -> Optional[str]:
         return None
 
 
+def __cache_response(url: str, data: str) -> None:
+    if settings.API_RESPONSE_CACHE_TTL <= 0 or data is None:
+        return
+    now = time.monotonic()
+    if len(__response_cache) >= __RESPONSE_CACHE_MAX_SIZE:
+        for expired_url in [cached_url for cached_url, (expires_at, _) in __response_cache.items() if expires_at <= now]:
+            __response_cache.pop(expired_url, None)
+        if len(__response_cache) >= __RESPONSE_CACHE_MAX_SIZE:
+            __response_cache.pop(next(iter(__response_cache)))
+    __response_cache[url] = (now + settings.API_RESPONSE_CACHE_TTL, data)
+
+
 def __filter_data_dict(data: EntitiesData, by_key: Any, by_value: Any, ignore_case: bool) -> Optional[EntitiesData]:
     """Parameter 'data':
        - A dict with entity ids as keys and entity info as values. """
@@ -203,25 +399,94 @@ def __fix_property_value(property_value: str) -> str:
     return result
 
 
-async def __get_data_from_url(url: str) -> str:
+async def __get_data_and_dict_from_url(url: str) -> Tuple[str, Dict]:
+    if settings.PRINT_DEBUG_WEB_REQUESTS:
+        print(f'[WebRequest] Attempting to stream data from url: {url}')
+    session = await get_client_session()
+    parser = utils.convert.create_xml_dict_parser()
+    chunks = []
+    async with session.get(url) as response:
+        async for chunk in response.content.iter_chunked(__RESPONSE_CHUNK_SIZE):
+            chunks.append(chunk)
+            parser.feed(chunk)
+    data = b''.join(chunks).decode('utf-8')
+    data_dict = parser.close()
+    if settings.PRINT_DEBUG_WEB_REQUESTS:
+        print(f'[WebRequest] Returned data: {data[:100]}')
+    return data, data_dict
+
+
+async def __get_data_from_url(url: str) -> Tuple[str, int]:
+    """
+    Returns the response body and its HTTP status.
+    """
     if settings.PRINT_DEBUG_WEB_REQUESTS:
         print(f'[WebRequest] Attempting to get data from url: {url}')
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            data = await response.text(encoding='utf-8')
-            if settings.PRINT_DEBUG_WEB_REQUESTS:
-                log_data = data or ''
-                if log_data and len(log_data) > 100:
-                    log_data = log_data[:100]
-                print(f'[WebRequest] Returned data: {log_data}')
-    return data
+    session = await get_client_session()
+    async with session.get(url) as response:
+        data = await response.text(encoding='utf-8')
+        if settings.PRINT_DEBUG_WEB_REQUESTS:
+            log_data = data or ''
+            if log_data and len(log_data) > 100:
+                log_data = log_data[:100]
+            print(f'[WebRequest] Returned data: {log_data}')
+    return data, response.status
+
+
+async def __get_data_from_url_coalesced(url: str) -> Tuple[str, int]:
+    """
+    If there's already a request in flight for the url, waits for its result instead of sending another one.
+    """
+    task = __in_flight_requests.get(url)
+    if task is None:
+        task = asyncio.create_task(__get_data_from_url(url))
+        __in_flight_requests[url] = task
+        task.add_done_callback(lambda _: __in_flight_requests.pop(url, None))
+    return await asyncio.shield(task)
+
+
+def __get_cached_response(url: str) -> Optional[str]:
+    cached_response = __response_cache.get(url)
+    if cached_response is not None:
+        expires_at, data = cached_response
+        if expires_at > time.monotonic():
+            return data
+        __response_cache.pop(url, None)
+    return None
+
+
+def __get_latest_settings_update_task(language_key: str, base_url: str) -> asyncio.Task:
+    """
+    If there's already an update in progress for the language_key and base_url, returns that one instead of starting another one.
+    """
+    cache_key = (language_key, base_url)
+    task = __latest_settings_update_tasks.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(__retrieve_latest_settings(language_key, base_url))
+        __latest_settings_update_tasks[cache_key] = task
+        task.add_done_callback(lambda _: __latest_settings_update_tasks.pop(cache_key, None))
+    return task
 
 
 async def __get_production_server(language_key: str = 'en') -> str:
     if settings.PRODUCTION_SERVER:
         return settings.PRODUCTION_SERVER
-    latest_settings = await get_latest_settings(language_key=language_key, base_url=settings.BASE_API_URL)
-    return latest_settings['ProductionServer']
+    if __production_server is None:
+        latest_settings = await __update_latest_settings(language_key, settings.BASE_API_URL)
+        return latest_settings['ProductionServer']
+    expires_at, production_server = __production_server
+    if expires_at <= time.monotonic():
+        __schedule_latest_settings_update(language_key, settings.BASE_API_URL)
+    return production_server
+
+
+def __is_error_response(data: Optional[str]) -> bool:
+    return not data or 'errorMessage=' in data or 'errorCode=' in data
+
+
+def __log_latest_settings_update_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f'[get_latest_settings] Could not refresh the latest settings in the background: {task.exception()}')
 
 
 def __parse_entity_datetime(*args, **kwargs) -> Optional[datetime]:
@@ -229,4 +494,49 @@ def __parse_entity_datetime(*args, **kwargs) -> Optional[datetime]:
     entity_property = kwargs.get('entity_property')
     if entity_property:
         result = utils.parse.pss_datetime(entity_property)
-    return result
\ No newline at end of file
+    return result
+
+
+async def __retrieve_latest_settings(language_key: str, base_url: str) -> EntityInfo:
+    global __production_server
+    url = f'{base_url}{settings.LATEST_SETTINGS_BASE_PATH}{language_key}'
+    try:
+        raw_text, _ = await __get_data_from_url(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        invalidate_latest_settings()
+        raise
+    result = utils.readonly.make_read_only(utils.convert.xmltree_to_dict3(raw_text))
+    maintenance_message = result.get('MaintenanceMessage')
+    if maintenance_message:
+        invalidate_latest_settings()
+        raise MaintenanceError(maintenance_message)
+
+    now = time.monotonic()
+    if settings.LATEST_SETTINGS_CACHE_TTL > 0:
+        __latest_settings_cache[(language_key, base_url)] = (now + settings.LATEST_SETTINGS_CACHE_TTL, result)
+    if base_url == settings.BASE_API_URL and result.get('ProductionServer'):
+        __production_server = (now + settings.PRODUCTION_SERVER_CACHE_TTL, result['ProductionServer'])
+    return result
+
+
+def __schedule_latest_settings_update(language_key: str, base_url: str) -> None:
+    task = __get_latest_settings_update_task(language_key, base_url)
+    task.add_done_callback(__log_latest_settings_update_failure)
+
+
+async def __update_latest_settings(language_key: str, base_url: str) -> EntityInfo:
+    return await asyncio.shield(__get_latest_settings_update_task(language_key, base_url))
+
+
+
+
+
+# ---------- Initialization ----------
+
+__client_session: aiohttp.ClientSession = None
+__in_flight_requests: Dict[str, asyncio.Task] = {}
+__latest_settings_cache: Dict[Tuple[str, str], Tuple[float, EntityInfo]] = {}
+__latest_settings_update_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+__production_server: Tuple[float, str] = None
+__property_value_indices: Dict[int, Tuple[weakref.ref, Dict[Tuple[str, Callable[[str], str]], PropertyValueIndex]]] = {}
+__response_cache: Dict[str, Tuple[float, str]] = {}
\ No newline at end of file
@@ -22,10 +22,12 @@ from . import utils
 CHARACTER_DESIGN_BASE_PATH: str = 'CharacterService/ListAllCharacterDesigns2?languageKey=en'
 CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'CharacterDesignName'
 CHARACTER_DESIGN_KEY_NAME: str = 'CharacterDesignId'
+CHARACTER_DESIGN_VERSION_PROPERTY_NAME: str = 'CharacterDesignVersion'
 
 COLLECTION_DESIGN_BASE_PATH: str = 'CollectionService/ListAllCollectionDesigns?languageKey=en'
 COLLECTION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'CollectionName'
 COLLECTION_DESIGN_KEY_NAME: str = 'CollectionDesignId'
+COLLECTION_DESIGN_VERSION_PROPERTY_NAME: str = 'CollectionDesignVersion'
 
 __PRESTIGE_FROM_BASE_PATH: str = 'CharacterService/PrestigeCharacterFrom?languagekey=en&characterDesignId='
 __PRESTIGE_TO_BASE_PATH: str = 'CharacterService/PrestigeCharacterTo?languagekey=en&characterDesignId='
@@ -546,7 +548,7 @@ def __get_stat_value(min_value: float, max_value: float, level: int, progression
 def __prepare_prestige_infos(characters_data: EntitiesData, prestige_ids: Dict[str, List[str]]) -> List[EntityInfo]:
     result = []
     for char_1_id, chars_2_ids in prestige_ids.items():
-        char_1_info = characters_data[char_1_id]
+        char_1_info = dict(characters_data[char_1_id])
         char_1_info['Prestige'] = [characters_data[char_2_id] for char_2_id in chars_2_ids]
         result.append(char_1_info)
     return result
@@ -561,7 +563,8 @@ characters_designs_retriever = entity.EntityRetriever(
     CHARACTER_DESIGN_BASE_PATH,
     CHARACTER_DESIGN_KEY_NAME,
     CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='CharacterDesigns'
+    cache_name='CharacterDesigns',
+    design_version_property_name=CHARACTER_DESIGN_VERSION_PROPERTY_NAME
 )
 
 
@@ -569,7 +572,8 @@ collections_designs_retriever = entity.EntityRetriever(
     COLLECTION_DESIGN_BASE_PATH,
     COLLECTION_DESIGN_KEY_NAME,
     COLLECTION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='CollectionDesigns'
+    cache_name='CollectionDesigns',
+    design_version_property_name=COLLECTION_DESIGN_VERSION_PROPERTY_NAME
 )
 
 
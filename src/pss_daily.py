@@ -1,7 +1,9 @@
+import bisect
 from datetime import date, datetime
+import heapq
 import json
 import random
-from typing import Any, Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from discord import Embed
 from discord.ext.commands import Context
@@ -20,7 +22,7 @@ from . import pss_training as training
 from . import server_settings
 from .server_settings import AutoMessageSettings
 from . import settings
-from .typehints import EntityInfo, SalesCache
+from .typehints import EntitiesData, EntityInfo, SalesCache
 from . import utils
 
 
@@ -81,26 +83,120 @@ SALES_DAILY_INFO_FIELDS: Dict[str, Callable] = {
 
 
 
+# ---------- Classes ----------
+
+class SalesStore():
+    """
+    Holds all sales infos in memory, sorted by expiry date descending.
+
+    The sales infos get indexed by entity (type and id), by entity id, by entity type and by expiry date. So looking up the sales history of an entity costs O(k).
+    Sales infos get added and removed incrementally, when they're written to the database.
+    """
+    def __init__(self, sales_infos: SalesCache = None) -> None:
+        self.__all: SalesCache = []
+        self.__by_entity: Dict[Tuple[str, int], SalesCache] = {}
+        self.__by_entity_id: Dict[int, SalesCache] = {}
+        self.__by_entity_type: Dict[str, SalesCache] = {}
+        self.__by_expiry_date: Dict[datetime, Dict[str, Any]] = {}
+        for sales_info in sales_infos or []:
+            self.add(sales_info)
+
+
+    def __len__(self) -> int:
+        return len(self.__all)
+
+
+    def add(self, sales_info: Dict[str, Any]) -> None:
+        """
+        Adds a sales info. Replaces any sales info expiring on the same date.
+        """
+        expiry_date = sales_info['limitedcatalogexpirydate']
+        self.remove(expiry_date)
+        self.__by_expiry_date[expiry_date] = sales_info
+        for sales_infos in self.__get_index_lists(sales_info, create=True):
+            bisect.insort(sales_infos, sales_info, key=SalesStore.__get_sort_key)
+
+
+    def get(self, category_type: str = None, entity_id: int = None) -> SalesCache:
+        """
+        Returns the sales infos matching the specified entity type and entity id, sorted by expiry date descending.
+        """
+        if category_type and entity_id:
+            result = self.__by_entity.get((category_type, entity_id), [])
+        elif entity_id:
+            result = self.__by_entity_id.get(entity_id, [])
+        elif category_type:
+            result = self.__by_entity_type.get(category_type, [])
+        else:
+            result = self.__all
+        return list(result)
+
+
+    def get_by_expiry_date(self, expiry_date: datetime) -> Optional[Dict[str, Any]]:
+        return self.__by_expiry_date.get(expiry_date)
+
+
+    def get_for_entities(self, category_type: str, entity_ids: Iterable[int]) -> SalesCache:
+        """
+        Returns the sales infos of all specified entities of the specified type, sorted by expiry date descending.
+        """
+        sales_infos_per_entity = [self.__by_entity[(category_type, entity_id)] for entity_id in set(entity_ids) if (category_type, entity_id) in self.__by_entity]
+        return list(heapq.merge(*sales_infos_per_entity, key=SalesStore.__get_sort_key))
+
+
+    def remove(self, expiry_date: datetime) -> bool:
+        """
+        Removes the sales info expiring on the specified date. Returns True, if a sales info has been removed.
+        """
+        sales_info = self.__by_expiry_date.pop(expiry_date, None)
+        if sales_info is None:
+            return False
+        for sales_infos in self.__get_index_lists(sales_info, create=False):
+            sales_infos.remove(sales_info)
+        return True
+
+
+    def __get_index_lists(self, sales_info: Dict[str, Any], create: bool) -> List[SalesCache]:
+        entity_type = sales_info['limitedcatalogtype']
+        entity_id = sales_info['limitedcatalogargument']
+        if create:
+            return [
+                self.__all,
+                self.__by_entity.setdefault((entity_type, entity_id), []),
+                self.__by_entity_id.setdefault(entity_id, []),
+                self.__by_entity_type.setdefault(entity_type, []),
+            ]
+        return [self.__all, self.__by_entity[(entity_type, entity_id)], self.__by_entity_id[entity_id], self.__by_entity_type[entity_type]]
+
+
+    @staticmethod
+    def __get_sort_key(sales_info: Dict[str, Any]) -> float:
+        return -sales_info['limitedcatalogexpirydate'].timestamp()
+
+
+
+
+
 # ---------- Sales info ----------
 
 async def add_sale(entity_id: int, price: int, currency_type: str, entity_type: str, expires_at: datetime, max_amount: int) -> bool:
-    already_exists = len([sale_info for sale_info in __sales_info_cache if sale_info['limitedcatalogexpirydate'] == expires_at])
-    if already_exists:
+    if __sales_store.get_by_expiry_date(expires_at) is not None:
         raise Error(f'There\'s already a sale info in the database expiring on: {utils.format.date(expires_at)}')
     success = await db_add_sale(entity_id, price, currency_type, entity_type, expires_at, max_amount)
-    if success:
-        await update_db_sales_info_cache()
     return success
 
 
 async def clear_sales() -> None:
+    global __sales_store
     query = f'DELETE FROM sales'
     success = await db.try_execute(query)
+    if success:
+        __sales_store = SalesStore()
     return success
 
 
 async def get_oldest_expired_sale_entity_details(utc_now: datetime, for_embed: bool = False) -> List[str]:
-    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now)
+    db_sales_infos = __sales_store.get()
     sales_infos = await __process_db_sales_infos(db_sales_infos, utc_now)
     sales_infos = reversed(sales_infos)
     for sales_info in sales_infos:
@@ -113,9 +209,7 @@ async def get_oldest_expired_sale_entity_details(utc_now: datetime, for_embed: b
 
 
 async def get_sales_infos(category_type: str = None, currency_type: str = None) -> SalesCache:
-    result = list(__sales_info_cache)
-    if category_type:
-        result = [sales_info for sales_info in result if sales_info['limitedcatalogtype'] == category_type]
+    result = __sales_store.get(category_type=category_type)
     if currency_type:
         result = [sales_info for sales_info in result if sales_info['limitedcatalogcurrencytype'] == currency_type]
     return result
@@ -123,7 +217,7 @@ async def get_sales_infos(category_type: str = None, currency_type: str = None)
 
 async def get_sales_details(ctx: Context, reverse: bool = False, as_embed: bool = settings.USE_EMBEDS) -> Union[List[str], List[Embed]]:
     utc_now = utils.get_utc_now()
-    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now)
+    db_sales_infos = __sales_store.get()
     sales_infos = await __process_db_sales_infos(db_sales_infos, utc_now)
     if reverse:
         sales_infos = reversed(sales_infos)
@@ -161,7 +255,7 @@ async def get_sales_history(ctx: Context, entity_info: EntityInfo, reverse: bool
     entity_id = int(entity_id) if entity_id else None
     entity_name = entity_info.get('entity_name')
 
-    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now, category_type=category_type, entity_id=entity_id)
+    db_sales_infos = __sales_store.get(category_type=category_type, entity_id=entity_id)
     sales_infos = await __process_db_sales_infos(db_sales_infos, utc_now, filter_old=(entity_id is None))
     if reverse:
         sales_infos = reversed(sales_infos)
@@ -194,9 +288,10 @@ async def get_sales_history_for_rooms(ctx: Context, room_type: str, room_type_pr
         raise ValueError('The room type must neither be None nor empty.')
     utc_now = utils.get_utc_now()
 
-    db_sales_infos = await __db_get_sales_infos(utc_now=utc_now, category_type='Room')
+    rooms_data = await room.rooms_designs_retriever.get_data_dict3()
+    room_design_ids = [int(room_design_id) for room_design_id, room_info in rooms_data.items() if room_info['RoomType'] == room_type]
+    db_sales_infos = __sales_store.get_for_entities('Room', room_design_ids)
     sales_infos = await __process_db_sales_infos(db_sales_infos, utc_now, filter_old=False)
-    sales_infos = [sales_info for sales_info in sales_infos if sales_info['entity_details'].entity_info['RoomType'] == room_type]
 
     if sales_infos:
         title = f'{room_type_pretty.capitalize()}s have been sold on'
@@ -245,13 +340,23 @@ def get_sales_search_details_with_id(entity_info: EntityInfo) -> str:
 
 
 async def __process_db_sales_infos(db_sales_infos: List[Dict[str, Any]], utc_now: datetime, filter_old: bool = True) -> List[Dict[str, Any]]:
-    chars_data = await crew.characters_designs_retriever.get_data_dict3()
-    collections_data = await crew.collections_designs_retriever.get_data_dict3()
-    items_data = await item.items_designs_retriever.get_data_dict3()
-    researches_data = await research.researches_designs_retriever.get_data_dict3()
-    rooms_data = await room.rooms_designs_retriever.get_data_dict3()
-    rooms_designs_sprites_data = await room.rooms_designs_sprites_retriever.get_data_dict3()
-    trainings_data = await training.trainings_designs_retriever.get_data_dict3()
+    """
+    Joins the sales infos with the design data. The joined entries get memoized per sales info until the design data or the sales info changes.
+    """
+    global __sales_view_cache, __sales_view_designs_data
+    designs_data = (
+        await crew.characters_designs_retriever.get_data_dict3(),
+        await crew.collections_designs_retriever.get_data_dict3(),
+        await item.items_designs_retriever.get_data_dict3(),
+        await research.researches_designs_retriever.get_data_dict3(),
+        await room.rooms_designs_retriever.get_data_dict3(),
+        await room.rooms_designs_sprites_retriever.get_data_dict3(),
+        await training.trainings_designs_retriever.get_data_dict3(),
+    )
+    # The design data gets replaced as a whole on refresh, so comparing the references is sufficient.
+    if __sales_view_designs_data is None or any(data is not cached_data for data, cached_data in zip(designs_data, __sales_view_designs_data)):
+        __sales_view_cache = {}
+        __sales_view_designs_data = designs_data
 
     result = []
 
@@ -262,39 +367,46 @@ async def __process_db_sales_infos(db_sales_infos: List[Dict[str, Any]], utc_now
         expires_in = 30 - (utc_now - expiry_date).days
         if filter_old and expires_in < 1:
             continue
-        entity_id = db_sales_info['limitedcatalogargument']
-        entity_type = db_sales_info['limitedcatalogtype']
-        currency_type = db_sales_info['limitedcatalogcurrencytype']
-        currency = lookups.CURRENCY_EMOJI_LOOKUP[currency_type.lower()]
-        currency_amount = db_sales_info['limitedcatalogcurrencyamount']
-        price = int(currency_amount * 1.25)
-        if entity_type == 'Character':
-            entity_details = crew.get_char_details_by_id(str(entity_id), chars_data, collections_data)
-            entity_name = entity_details.entity_info.get(crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME)
-            entity_type = 'Crew'
-        elif entity_type == 'Item':
-            entity_details = item.get_item_details_by_id(str(entity_id), items_data, trainings_data)
-            entity_name = entity_details.entity_info.get(item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME)
-        elif entity_type == 'Room':
-            entity_details = room.get_room_details_by_id(str(entity_id), rooms_data, items_data, researches_data, rooms_designs_sprites_data)
-            entity_name = entity_details.entity_info.get(room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME)
-        else:
-            entity_details = None
-            entity_name = ''
-        result.append({
-            'name': entity_name,
-            'type': entity_type,
-            'price': price,
-            'original_price': currency_amount,
-            'currency': currency,
-            'original_currency': currency_type,
-            'expiry_date': expiry_date,
-            'expires_in': expires_in,
-            'entity_details': entity_details
-        })
+        cached_sales_info, sales_view_entry = __sales_view_cache.get(expiry_date, (None, None))
+        if cached_sales_info is not db_sales_info:
+            sales_view_entry = __create_sales_view_entry(db_sales_info, *designs_data)
+            __sales_view_cache[expiry_date] = (db_sales_info, sales_view_entry)
+        result.append({**sales_view_entry, 'expires_in': expires_in})
     return result
 
 
+def __create_sales_view_entry(db_sales_info: Dict[str, Any], chars_data: EntitiesData, collections_data: EntitiesData, items_data: EntitiesData, researches_data: EntitiesData, rooms_data: EntitiesData, rooms_designs_sprites_data: EntitiesData, trainings_data: EntitiesData) -> Dict[str, Any]:
+    entity_id = db_sales_info['limitedcatalogargument']
+    entity_type = db_sales_info['limitedcatalogtype']
+    currency_type = db_sales_info['limitedcatalogcurrencytype']
+    currency = lookups.CURRENCY_EMOJI_LOOKUP[currency_type.lower()]
+    currency_amount = db_sales_info['limitedcatalogcurrencyamount']
+    price = int(currency_amount * 1.25)
+    if entity_type == 'Character':
+        entity_details = crew.get_char_details_by_id(str(entity_id), chars_data, collections_data)
+        entity_name = entity_details.entity_info.get(crew.CHARACTER_DESIGN_DESCRIPTION_PROPERTY_NAME)
+        entity_type = 'Crew'
+    elif entity_type == 'Item':
+        entity_details = item.get_item_details_by_id(str(entity_id), items_data, trainings_data)
+        entity_name = entity_details.entity_info.get(item.ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME)
+    elif entity_type == 'Room':
+        entity_details = room.get_room_details_by_id(str(entity_id), rooms_data, items_data, researches_data, rooms_designs_sprites_data)
+        entity_name = entity_details.entity_info.get(room.ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME)
+    else:
+        entity_details = None
+        entity_name = ''
+    return {
+        'name': entity_name,
+        'type': entity_type,
+        'price': price,
+        'original_price': currency_amount,
+        'currency': currency,
+        'original_currency': currency_type,
+        'expiry_date': db_sales_info['limitedcatalogexpirydate'],
+        'entity_details': entity_details
+    }
+
+
 
 
 
@@ -334,7 +446,9 @@ async def db_add_sale(entity_id: int, price: int, currency_type: str, entity_typ
                 f'Values: {args}'
             ])
             raise Error(error_msg) from ex
-    if not success and overwrite:
+    if success:
+        await __update_sales_store(expires_at)
+    elif overwrite:
         success_delete = await _db_try_remove_sale(expires_at)
         if success_delete:
             success = await db_add_sale(entity_id, price, currency_type, entity_type, expires_at, max_amount)
@@ -346,44 +460,50 @@ async def _db_try_remove_sale(expiry_date: datetime) -> bool:
         raise ValueError('The parameter \'expiry_date\' is required.')
     query = f'DELETE FROM sales WHERE limitedcatalogexpirydate = $1'
     args = (expiry_date,)
-    success = db.try_execute(query, args)
+    success = await db.try_execute(query, args)
+    if success:
+        __sales_store.remove(expiry_date)
     return success
 
 
-async def db_get_daily_info(skip_cache: bool = False) -> Tuple[EntityInfo, datetime]:
-    if __daily_info_cache is None or skip_cache:
-        result = {}
-        modify_dates = []
-        daily_settings = await db.get_settings(DB_DAILY_INFO_COLUMN_NAMES.keys())
-        result = {DB_DAILY_INFO_COLUMN_NAMES.get(db_setting_name, db_setting_name): details[0] for db_setting_name, details in daily_settings.items()}
-        modify_dates = [details[1] for details in daily_settings.values() if details[1] is not None]
-        if result and modify_dates:
-            return (result, max(modify_dates))
-        else:
-            return ({}, None)
+async def db_get_daily_info() -> Tuple[EntityInfo, datetime]:
+    """
+    Returns the daily info stored in the database. The settings get served from the settings cache.
+    Returns (None, None), if the daily info couldn't be retrieved.
+    """
+    daily_settings = await db.get_settings(DB_DAILY_INFO_COLUMN_NAMES.keys())
+    if any(db_setting_name not in daily_settings for db_setting_name in DB_DAILY_INFO_COLUMN_NAMES.keys()):
+        return (None, None)
+    result = {DB_DAILY_INFO_COLUMN_NAMES.get(db_setting_name, db_setting_name): details[0] for db_setting_name, details in daily_settings.items()}
+    modify_dates = [details[1] for details in daily_settings.values() if details[1] is not None]
+    if result and modify_dates:
+        return (result, max(modify_dates))
     else:
-        return (__daily_info_cache, __daily_info_modified_at)
+        return ({}, None)
 
 
 async def db_set_daily_info(daily_info: EntityInfo, utc_now: datetime) -> bool:
     settings = {__get_daily_info_setting_name(key): (value or None, utc_now) for key, value in daily_info.items()}
     settings_success = await db.set_settings(settings)
-    if settings_success:
-        await __update_db_daily_info_cache()
 
     sales_info = {key: value(daily_info[key]) for key, value in SALES_DAILY_INFO_FIELDS.items()}
     sales_success = await db.update_sales_info(sales_info)
     if sales_success:
-        await update_db_sales_info_cache()
+        await __update_sales_store(sales_info['LimitedCatalogExpiryDate'])
 
     return settings_success
 
 
 async def get_daily_channels(ctx: Context, guild_id: int = None, can_post: bool = None) -> List[str]:
-    settings = await server_settings.db_get_automessage_settings(server_settings.AutoMessageType.DAILY, guild_id, can_post)
+    if guild_id:
+        autodaily_settings = (await server_settings.GUILD_SETTINGS.get(ctx.bot, guild_id)).autodaily
+        all_autodaily_settings = [autodaily_settings] if autodaily_settings.channel_id and (can_post is None or bool(autodaily_settings.can_post) == can_post) else []
+    else:
+        all_autodaily_settings = server_settings.GUILD_SETTINGS.get_auto_message_settings(server_settings.AutoMessageType.DAILY, can_post=can_post)
     result = []
     at_least_one = False
-    for (guild_id, channel_id, can_post, _, _, _, _) in settings:
+    for autodaily_settings in all_autodaily_settings:
+        guild_id, channel_id, can_post = autodaily_settings.guild_id, autodaily_settings.channel_id, autodaily_settings.can_post
         if channel_id:
             at_least_one = True
             text_channel = ctx.bot.get_channel(int(channel_id))
@@ -445,20 +565,6 @@ def __convert_to_daily_info(dropship_info: EntityInfo) -> EntityInfo:
     return result
 
 
-async def __db_get_sales_infos(utc_now: datetime = None, category_type: str = None, entity_id: int = None, skip_cache: bool = False) -> SalesCache:
-    if not skip_cache and utc_now is not None and (__sales_info_cache_retrieved_at is None or __sales_info_cache_retrieved_at.day != utc_now.day):
-        await update_db_sales_info_cache()
-    if skip_cache:
-        result = await db.get_sales_infos()
-    else:
-        result = __sales_info_cache
-    if entity_id:
-        result = [db_sales_info for db_sales_info in result if db_sales_info['limitedcatalogargument'] == entity_id]
-    if category_type:
-        result = [db_sales_info for db_sales_info in result if db_sales_info['limitedcatalogtype'] == category_type]
-    return result
-
-
 def __get_daily_info_setting_name(field_name: str) -> str:
     return f'daily{field_name}'
 
@@ -530,25 +636,29 @@ def __mock_get_daily_info_2() -> EntityInfo:
 
 # ---------- Initialization ----------
 
-__daily_info_cache: dict = None
-__daily_info_modified_at: datetime = None
-__sales_info_cache: SalesCache = None
-__sales_info_cache_retrieved_at: datetime = None
-
-
-async def __update_db_daily_info_cache() -> None:
-    global __daily_info_cache
-    global __daily_info_modified_at
-    __daily_info_cache, __daily_info_modified_at = await db_get_daily_info(skip_cache=True)
+__sales_store: SalesStore = SalesStore()
+__sales_view_cache: Dict[datetime, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+__sales_view_designs_data: Tuple[EntitiesData, ...] = None
 
 
 async def update_db_sales_info_cache() -> None:
-    global __sales_info_cache
-    global __sales_info_cache_retrieved_at
-    __sales_info_cache = await __db_get_sales_infos(skip_cache=True)
-    __sales_info_cache_retrieved_at = utils.get_utc_now()
+    """
+    Reloads all sales infos from the database.
+    """
+    global __sales_store
+    __sales_store = SalesStore(await db.get_sales_infos())
+
+
+async def __update_sales_store(expiry_date: datetime) -> None:
+    """
+    Reloads the sales info expiring on the specified date from the database.
+    """
+    db_sales_infos = await db.get_sales_infos(expiry_date=expiry_date)
+    if db_sales_infos:
+        __sales_store.add(db_sales_infos[0])
+    else:
+        __sales_store.remove(expiry_date)
 
 
 async def init() -> None:
-    await __update_db_daily_info_cache()
     await update_db_sales_info_cache()
\ No newline at end of file
@@ -1,4 +1,6 @@
 from enum import IntEnum
+import asyncio
+import datetime
 import inspect
 import json
 from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
@@ -798,7 +800,7 @@ class EntityDetailsCollection():
 
 
 class EntityRetriever:
-    def __init__(self, entity_base_path: str, entity_key_name: str, entity_description_property_name: str, cache_name: str = None, sorted_key_function: Callable[[dict, dict], str] = None, fix_data_delegate: Callable[[str], str] = None, cache_update_interval: int = 10) -> None:
+    def __init__(self, entity_base_path: str, entity_key_name: str, entity_description_property_name: str, cache_name: str = None, sorted_key_function: Callable[[dict, dict], str] = None, fix_data_delegate: Callable[[str], str] = None, cache_update_interval: int = 10, design_version_property_name: str = None) -> None:
         self.__cache_name: str = cache_name or ''
         self.__base_path: str = entity_base_path
         self.__key_name: str = entity_key_name or None
@@ -810,14 +812,24 @@ class EntityRetriever:
             self.__base_path,
             self.__cache_name,
             key_name=self.__key_name,
-            update_interval=cache_update_interval
+            update_interval=cache_update_interval,
+            design_version_property_name=design_version_property_name
         )
+        _ENTITY_RETRIEVERS.append(self)
 
 
     @property
     def base_path(self) -> str:
         return self.__base_path
 
+    @property
+    def cache_name(self) -> str:
+        return self.__cache_name
+
+    @property
+    def cache_update_interval(self) -> int:
+        return self.__cache.update_interval
+
     @property
     def description_property_name(self) -> str:
         return self.__description_property_name
@@ -867,6 +879,10 @@ class EntityRetriever:
         return results
 
 
+    def get_is_cache_outdated(self, look_ahead: datetime.timedelta = None) -> bool:
+        return self.__cache.get_is_data_outdated(look_ahead=look_ahead)
+
+
     async def get_raw_data(self) -> str:
         return await self.__cache.get_raw_data()
 
@@ -892,6 +908,10 @@ class EntityRetriever:
         return result
 
 
+    async def load_cache_snapshot(self) -> bool:
+        return await self.__cache.load_snapshot()
+
+
     async def update_cache(self) -> None:
         await self.__cache.update_data()
 
@@ -913,6 +933,13 @@ def group_entities_details(entities_details: List[entity.EntityDetails], propert
     return result
 
 
+def get_entity_retrievers() -> List[EntityRetriever]:
+    """
+    Returns all EntityRetrievers that have been created.
+    """
+    return list(_ENTITY_RETRIEVERS)
+
+
 def get_property_from_entity_info(entity_info: EntityInfo, entity_property_name: str) -> Any:
     while '.' in entity_property_name:
         split_parameter = entity_property_name.split('.')
@@ -934,6 +961,17 @@ def get_property_from_entity_info(entity_info: EntityInfo, entity_property_name:
             return result or None
 
 
+async def load_entity_retrievers_snapshots(entity_retrievers: Iterable[EntityRetriever] = None) -> int:
+    """
+    Loads the cache snapshots of the specified EntityRetrievers concurrently. Loads all snapshots, if none are specified.
+    Returns the number of snapshots loaded.
+    """
+    if entity_retrievers is None:
+        entity_retrievers = get_entity_retrievers()
+    results = await asyncio.gather(*[entity_retriever.load_cache_snapshot() for entity_retriever in entity_retrievers])
+    return sum(1 for result in results if result)
+
+
 def sort_entities_by(entity_infos: List[EntityInfo], order_info: List[Tuple[str, Callable[[Any], Any], bool]]) -> List[EntityInfo]:
     """order_info is a list of tuples (property_name,transform_function,reverse)"""
     result = entity_infos
@@ -951,6 +989,15 @@ def sort_entities_by(entity_infos: List[EntityInfo], order_info: List[Tuple[str,
         return sorted(result)
 
 
+async def update_entity_retrievers_caches(entity_retrievers: Iterable[EntityRetriever] = None) -> None:
+    """
+    Updates the caches of the specified EntityRetrievers concurrently. Updates all caches, if none are specified.
+    """
+    if entity_retrievers is None:
+        entity_retrievers = get_entity_retrievers()
+    await asyncio.gather(*[entity_retriever.update_cache() for entity_retriever in entity_retrievers])
+
+
 
 
 
@@ -1052,4 +1099,5 @@ class LegacyEntityDetails(object):
 
 # ---------- Initialization ----------
 
-NO_PROPERTY = EntityDetailProperty(None, False)
\ No newline at end of file
+NO_PROPERTY = EntityDetailProperty(None, False)
+_ENTITY_RETRIEVERS: List[EntityRetriever] = []
\ No newline at end of file
@@ -93,15 +93,16 @@ async def get_current_tournament_fleet_infos_by_name(fleet_name: str) -> List[En
     return fleet_infos
 
 
-async def get_fleet_infos_from_tourney_data_by_name(fleet_name: str, fleet_data: EntitiesData) -> List[EntityInfo]:
-    fleet_name_lower = fleet_name.lower()
-    result = {fleet_id: fleet_info for (fleet_id, fleet_info) in fleet_data.items() if fleet_name_lower in fleet_info.get(fleet.FLEET_DESCRIPTION_PROPERTY_NAME, '').lower()}
+async def get_fleet_infos_from_tourney_data_by_name(fleet_name: str, tourney_data: TourneyData) -> List[EntityInfo]:
+    result = {fleet_id: dict(fleet_info) for (fleet_id, fleet_info) in tourney_data.get_fleet_data_by_name(fleet_name).items()}
     fleet_infos_current = await __get_fleets_data_by_name(fleet_name)
     for fleet_info in fleet_infos_current.values():
         fleet_id = fleet_info[fleet.FLEET_KEY_NAME]
-        if fleet_id in fleet_data:
-            if fleet_id not in result:
-                result[fleet_id] = fleet_data[fleet_id]
+        if fleet_id not in result:
+            tourney_fleet_info = tourney_data.get_fleet_data_by_id(fleet_id)
+            if tourney_fleet_info:
+                result[fleet_id] = tourney_fleet_info
+        if fleet_id in result:
             if result[fleet_id][fleet.FLEET_DESCRIPTION_PROPERTY_NAME] != fleet_info[fleet.FLEET_DESCRIPTION_PROPERTY_NAME]:
                 result[fleet_id]['CurrentAllianceName'] = fleet_info[fleet.FLEET_DESCRIPTION_PROPERTY_NAME]
     return list(result.values())
@@ -174,7 +175,7 @@ async def get_full_fleet_info_as_text(ctx: Context, fleet_info: EntityInfo, max_
 
 async def __get_current_tournament_fleets_data_by_name(fleet_name: str) -> EntitiesData:
     fleet_name = fleet_name.lower()
-    fleet_data_raw = await core.get_data_from_path('AllianceService/ListAlliancesWithDivision')
+    fleet_data_raw = await core.get_data_from_path('AllianceService/ListAlliancesWithDivision', use_cache=True)
     result = utils.convert.xmltree_to_dict3(fleet_data_raw)
     result = {key: value for key, value in result.items() if fleet_name in value[FLEET_DESCRIPTION_PROPERTY_NAME].lower()}
     return result
@@ -388,7 +389,7 @@ async def find_fleet(ctx: ApplicationContext, fleet_name: str) -> Tuple[EntityIn
 
 async def find_tournament_fleet(ctx: ApplicationContext, fleet_name: str, tourney_data) -> Tuple[EntityInfo, Interaction]:
     response = await utils.discord.edit_original_response(ctx, ctx.interaction, ['Searching fleet...'])
-    fleet_infos = await get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data.fleets)
+    fleet_infos = await get_fleet_infos_from_tourney_data_by_name(fleet_name, tourney_data)
     if fleet_infos:
         fleet_info = None
         if len(fleet_infos) == 1:
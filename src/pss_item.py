@@ -34,6 +34,7 @@ ANY_SLOT_MARKERS = ['all', 'any']
 ITEM_DESIGN_BASE_PATH: str = 'ItemService/ListItemDesigns2?languageKey=en'
 ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ItemDesignName'
 ITEM_DESIGN_KEY_NAME: str = 'ItemDesignId'
+ITEM_DESIGN_VERSION_PROPERTY_NAME: str = 'ItemDesignVersion'
 
 NOT_ALLOWED_ITEM_NAMES: List[str] = [
     'AI',
@@ -853,7 +854,8 @@ items_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ITEM_DESIGN_KEY_NAME,
     ITEM_DESIGN_DESCRIPTION_PROPERTY_NAME,
     'ItemsDesigns',
-    fix_data_delegate=__fix_item_name
+    fix_data_delegate=__fix_item_name,
+    design_version_property_name=ITEM_DESIGN_VERSION_PROPERTY_NAME
 )
 
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
@@ -4,7 +4,6 @@ import json
 import random
 from typing import List, Optional
 
-import aiohttp
 from asyncio import Lock
 
 from . import database as db
@@ -130,14 +129,14 @@ class Device():
         if settings.PRINT_DEBUG_WEB_REQUESTS:
             print(f'[WebRequest] Attempting to get data from url: {url}')
             print(f'[WebRequest]   with parameters: {json.dumps(query_params, separators=(",", ":"))}')
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, params=query_params) as response:
-                data = await response.text(encoding='utf-8')
-                if settings.PRINT_DEBUG_WEB_REQUESTS:
-                    log_data = data or ''
-                    if log_data and len(log_data) > 100:
-                        log_data = log_data[:100]
-                    print(f'[WebRequest] Returned data: {log_data}')
+        session = await core.get_client_session()
+        async with session.post(url, params=query_params) as response:
+            data = await response.text(encoding='utf-8')
+            if settings.PRINT_DEBUG_WEB_REQUESTS:
+                log_data = data or ''
+                if log_data and len(log_data) > 100:
+                    log_data = log_data[:100]
+                print(f'[WebRequest] Returned data: {log_data}')
 
         result = utils.convert.raw_xml_to_dict(data)
         self.__last_login = utc_now
@@ -342,8 +341,7 @@ def _create_device_checksum(device_key: str, device_type: str, client_datetime:
 # ---------- DB ----------
 
 async def _db_get_device(device_key: str) -> Optional[Device]:
-    query = f'SELECT key FROM devices WHERE key = $1'
-    rows = await db.fetchall(query, [device_key])
+    rows = await db.fetch_named('devices.get', [device_key])
     if rows:
         row = rows[0]
         result = Device(*row)
@@ -353,8 +351,7 @@ async def _db_get_device(device_key: str) -> Optional[Device]:
 
 
 async def _db_get_devices() -> List[Device]:
-    query = f'SELECT key FROM devices;'
-    rows = await db.fetchall(query)
+    rows = await db.fetch_named('devices.get_all')
     if rows:
         result = [Device(*row) for row in rows]
     else:
@@ -363,14 +360,12 @@ async def _db_get_devices() -> List[Device]:
 
 
 async def _db_try_create_device(device: Device) -> bool:
-    query = f'INSERT INTO devices VALUES ($1, $2, $3)'
-    success = await db.try_execute(query, [device.key, device.checksum, device.can_login_until])
+    success = await db.try_execute_named('devices.insert', [device.key, device.checksum, device.can_login_until])
     return success
 
 
 async def _db_try_delete_device(device: Device) -> bool:
-    query = f'DELETE FROM devices WHERE key = $1'
-    success = await db.try_execute(query, [device.key])
+    success = await db.try_execute_named('devices.delete', [device.key])
     return success
 
 
@@ -384,8 +379,7 @@ async def _db_try_store_device(device: Device) -> bool:
 
 
 async def _db_try_update_device(device: Device) -> bool:
-    query = f'UPDATE devices SET (key, loginuntil) = ($1, $2) WHERE key = $1'
-    success = await db.try_execute(query, [device.key, device.can_login_until])
+    success = await db.try_execute_named('devices.update', [device.key, device.can_login_until])
     return success
 
 
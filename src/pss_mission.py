@@ -6,6 +6,7 @@ from . import pss_entity as entity
 MISSION_DESIGN_BASE_PATH: str = 'MissionService/ListAllMissionDesigns2?languageKey=en'
 MISSION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'MissionTitle'
 MISSION_DESIGN_KEY_NAME: str = 'MissionDesignId'
+MISSION_DESIGN_VERSION_PROPERTY_NAME: str = 'MissionDesignVersion'
 
 
 
@@ -17,5 +18,6 @@ missions_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     MISSION_DESIGN_BASE_PATH,
     MISSION_DESIGN_KEY_NAME,
     MISSION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'MissionDesigns'
+    'MissionDesigns',
+    design_version_property_name=MISSION_DESIGN_VERSION_PROPERTY_NAME
 )
\ No newline at end of file
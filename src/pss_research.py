@@ -22,6 +22,7 @@ BIG_SET_THRESHOLD: int = 4
 RESEARCH_DESIGN_BASE_PATH: str = 'ResearchService/ListAllResearchDesigns2?languageKey=en'
 RESEARCH_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ResearchName'
 RESEARCH_DESIGN_KEY_NAME: str = 'ResearchDesignId'
+RESEARCH_DESIGN_VERSION_PROPERTY_NAME: str = 'ResearchDesignVersion'
 
 
 
@@ -177,7 +178,8 @@ researches_designs_retriever = entity.EntityRetriever(
     RESEARCH_DESIGN_BASE_PATH,
     RESEARCH_DESIGN_KEY_NAME,
     RESEARCH_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='ResearchDesigns'
+    cache_name='ResearchDesigns',
+    design_version_property_name=RESEARCH_DESIGN_VERSION_PROPERTY_NAME
 )
 
 __properties: entity.EntityDetailsCreationPropertiesCollection = {
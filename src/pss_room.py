@@ -35,19 +35,23 @@ CAPACITY_PER_TICK_UNITS: Dict[str, str] = {
 MISSILE_DESIGN_BASE_PATH: str = 'RoomService/ListMissileDesigns'
 MISSILE_DESIGN_KEY_NAME: str = 'MissileDesignId'
 MISSILE_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'MissileDesignName'
+MISSILE_DESIGN_VERSION_PROPERTY_NAME: str = 'MissileDesignVersion'
 
 ROOM_DESIGN_BASE_PATH: str = 'RoomService/ListRoomDesigns2?languageKey=en'
 ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'RoomName'
 ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME_2: str = 'RoomShortName'
 ROOM_DESIGN_KEY_NAME: str = 'RoomDesignId'
 ROOM_DESIGN_TYPE_PROPERTY_NAME: str = 'RoomType'
+ROOM_DESIGN_VERSION_PROPERTY_NAME: str = 'RoomDesignVersion'
 
 ROOM_DESIGN_PURCHASE_BASE_PATH: str = 'RoomService/ListRoomDesignPurchase?languageKey=en'
 ROOM_DESIGN_PURCHASE_DESCRIPTION_PROPERTY_NAME: str = 'RoomName'
 ROOM_DESIGN_PURCHASE_KEY_NAME: str = 'RoomDesignPurchaseId'
+ROOM_DESIGN_PURCHASE_VERSION_PROPERTY_NAME: str = 'RoomDesignPurchaseVersion'
 
 ROOM_DESIGN_SPRITES_BASE_PATH: str = 'RoomDesignSpriteService/ListRoomDesignSprites'
 ROOM_DESIGN_SPRITES_KEY_NAME: str = 'RoomDesignSpriteId'
+ROOM_DESIGN_SPRITES_VERSION_PROPERTY_NAME: str = 'RoomDesignSpriteVersion'
 
 RX_FIX_ROOM_NAME: re.Pattern = re.compile(r' [lL][vV][lL]?')
 RX_NUMBER: re.Pattern = re.compile(r'\d+')
@@ -1056,26 +1060,30 @@ missiles_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     MISSILE_DESIGN_BASE_PATH,
     MISSILE_DESIGN_KEY_NAME,
     MISSILE_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='MissileDesignSprites'
+    cache_name='MissileDesignSprites',
+    design_version_property_name=MISSILE_DESIGN_VERSION_PROPERTY_NAME
 )
 rooms_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ROOM_DESIGN_BASE_PATH,
     ROOM_DESIGN_KEY_NAME,
     ROOM_DESIGN_DESCRIPTION_PROPERTY_NAME,
     cache_name='RoomDesigns',
-    sorted_key_function=_get_key_for_room_sort
+    sorted_key_function=_get_key_for_room_sort,
+    design_version_property_name=ROOM_DESIGN_VERSION_PROPERTY_NAME
 )
 rooms_designs_purchases_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ROOM_DESIGN_PURCHASE_BASE_PATH,
     ROOM_DESIGN_PURCHASE_KEY_NAME,
     ROOM_DESIGN_PURCHASE_DESCRIPTION_PROPERTY_NAME,
-    cache_name='RoomDesignPurchases'
+    cache_name='RoomDesignPurchases',
+    design_version_property_name=ROOM_DESIGN_PURCHASE_VERSION_PROPERTY_NAME
 )
 rooms_designs_sprites_retriever: entity.EntityRetriever = entity.EntityRetriever(
     ROOM_DESIGN_SPRITES_BASE_PATH,
     ROOM_DESIGN_SPRITES_KEY_NAME,
     None,
-    cache_name='RoomDesignSprites'
+    cache_name='RoomDesignSprites',
+    design_version_property_name=ROOM_DESIGN_SPRITES_VERSION_PROPERTY_NAME
 )
 ALLOWED_ROOM_NAMES: List[str]
 __display_name_properties: Dict[str, entity.EntityDetailProperty]  = __create_display_name_properties(__DISPLAY_NAMES)
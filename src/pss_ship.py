@@ -26,6 +26,7 @@ SHIP_BUILDER_PIXYSHIP_BASE_PATH: str = 'https://pixyship.com/builder?'
 SHIP_DESIGN_BASE_PATH: str = 'ShipService/ListAllShipDesigns2?languageKey=en'
 SHIP_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'ShipDesignName'
 SHIP_DESIGN_KEY_NAME: str = 'ShipDesignId'
+SHIP_DESIGN_VERSION_PROPERTY_NAME: str = 'ShipDesignVersion'
 
 
 
@@ -202,5 +203,6 @@ ships_designs_retriever = entity.EntityRetriever(
     SHIP_DESIGN_KEY_NAME,
     SHIP_DESIGN_DESCRIPTION_PROPERTY_NAME,
     cache_name='ShipDesigns',
-    cache_update_interval=60
+    cache_update_interval=60,
+    design_version_property_name=SHIP_DESIGN_VERSION_PROPERTY_NAME
 )
\ No newline at end of file
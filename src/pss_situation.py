@@ -24,6 +24,7 @@ from . import utils
 SITUATION_DESIGN_BASE_PATH: str = f'SituationService/ListSituationDesigns'
 SITUATION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'SituationName'
 SITUATION_DESIGN_KEY_NAME: str = 'SituationDesignId'
+SITUATION_DESIGN_VERSION_PROPERTY_NAME: str = 'SituationDesignVersion'
 
 SITUATION_CHANGE_TYPE_LOOKUP: Dict[str, str] = {
     'AddCrew': 'Additional crew on board',
@@ -232,6 +233,7 @@ def __get_current_situations_infos(situations_infos: List[EntityInfo], utc_now:
             start_at = utils.parse.pss_datetime(from_date)
             end_at = utils.parse.pss_datetime(end_date)
             if start_at <= utc_now and end_at > utc_now:
+                situation_info = dict(situation_info)
                 situation_info['from_date'] = from_date
                 situation_info['end_date'] = end_date
                 result.append(situation_info)
@@ -248,7 +250,8 @@ situations_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     SITUATION_DESIGN_BASE_PATH,
     SITUATION_DESIGN_KEY_NAME,
     SITUATION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    'SituationDesigns'
+    'SituationDesigns',
+    design_version_property_name=SITUATION_DESIGN_VERSION_PROPERTY_NAME
 )
 
 
@@ -1,4 +1,3 @@
-import aiohttp
 import colorsys
 import os
 from typing import Iterable, Optional
@@ -69,10 +68,10 @@ async def download_sprite(sprite_id: str) -> str:
     target_path = os.path.join(SPRITES_CACHE_PATH, f'{sprite_id}.png')
     if not os.path.isfile(target_path):
         download_url = await get_download_sprite_link(sprite_id)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(download_url) as response:
-                with open(target_path, 'wb') as f:
-                    f.write(await response.read())
+        session = await core.get_client_session()
+        async with session.get(download_url) as response:
+            with open(target_path, 'wb') as f:
+                f.write(await response.read())
     return target_path
 
 
@@ -31,6 +31,7 @@ ALLOWED_DIVISION_LETTERS: List[str] = sorted([letter for letter in lookups.DIVIS
 DIVISION_DESIGN_BASE_PATH: str = 'DivisionService/ListAllDivisionDesigns2'
 DIVISION_DESIGN_DESCRIPTION_PROPERTY_NAME: str = 'DivisionName'
 DIVISION_DESIGN_KEY_NAME: str = 'DivisionDesignId'
+DIVISION_DESIGN_VERSION_PROPERTY_NAME: str = 'DivisionDesignVersion'
 
 DIVISION_CHOICES = [
     OptionChoice(name='a', value='a'),
@@ -53,7 +54,7 @@ async def get_top_fleets(ctx: Context, take: int = 100, as_embed: bool = setting
     tourney_running = tourney.is_tourney_running()
     divisions_designs_data = await divisions_designs_retriever.get_data_dict3()
     fleets_divisions_max_ranks = [int(fleet_division_design_info['MaxRank']) for fleet_division_design_info in __get_fleet_division_designs(divisions_designs_data).values()]
-    raw_data = await core.get_data_from_path(TOP_FLEETS_BASE_PATH + str(take))
+    raw_data = await core.get_data_from_path(TOP_FLEETS_BASE_PATH + str(take), use_cache=True)
     data = utils.convert.xmltree_to_dict3(raw_data)
     if data:
         title = f'Top {take} fleets'
@@ -167,7 +168,7 @@ def __create_body_lines_top_captains(prepared_data: List[Tuple[int, str, str, st
 
 async def __get_top_captains_data(skip: int, take: int) -> EntitiesData:
     path = await __get_top_captains_path(skip, take)
-    raw_data = await core.get_data_from_path(path)
+    raw_data = await core.get_data_from_path(path, use_cache=True)
     data = utils.convert.xmltree_to_dict3(raw_data)
     return data
 
@@ -332,7 +333,7 @@ def filter_targets(user_infos: List[EntityInfo], division_design_id: str, last_m
 
 
 async def get_alliances_with_division() -> EntitiesData:
-    data = await core.get_data_from_path(STARS_BASE_PATH)
+    data = await core.get_data_from_path(STARS_BASE_PATH, use_cache=True)
     fleet_infos = utils.convert.xmltree_to_dict3(data)
     return fleet_infos
 
@@ -451,5 +452,6 @@ divisions_designs_retriever: entity.EntityRetriever = entity.EntityRetriever(
     DIVISION_DESIGN_BASE_PATH,
     DIVISION_DESIGN_KEY_NAME,
     DIVISION_DESIGN_DESCRIPTION_PROPERTY_NAME,
-    cache_name='DivisionDesigns'
+    cache_name='DivisionDesigns',
+    design_version_property_name=DIVISION_DESIGN_VERSION_PROPERTY_NAME
 )
\ No newline at end of file
@@ -12,6 +12,7 @@ from discord.utils import escape_markdown
 
 
 from . import emojis
+from .gdrive import TourneyData
 from.pagination import SelectView
 from . import pss_assert
 from . import pss_core as core
@@ -83,9 +84,9 @@ async def get_users_infos_by_name(user_name: str) -> List[EntityInfo]:
     return user_infos
 
 
-async def get_user_infos_from_tournament_data_by_name(user_name: str, users_data: EntitiesData) -> List[EntityInfo]:
-    user_name_lower = user_name.lower()
-    result = {user_id: user_info for (user_id, user_info) in users_data.items() if user_name_lower in user_info.get(user.USER_DESCRIPTION_PROPERTY_NAME, '').lower()}
+async def get_user_infos_from_tournament_data_by_name(user_name: str, tourney_data: TourneyData) -> List[EntityInfo]:
+    users_data = tourney_data.users
+    result = dict(tourney_data.get_user_data_by_name(user_name))
     user_infos_current = await __get_users_data(user_name)
     if user_infos_current:
         for user_info in user_infos_current.values():
@@ -344,7 +345,7 @@ def __get_user_name(user_info: EntityInfo, **kwargs) -> Optional[str]:
 
 async def find_tournament_user(ctx: ApplicationContext, player_name: str, tourney_data) -> Tuple[EntityInfo, Interaction]:
     response = await utils.discord.edit_original_response(ctx, ctx.interaction, ['Searching player...'])
-    user_infos = await get_user_infos_from_tournament_data_by_name(player_name, tourney_data.users)
+    user_infos = await get_user_infos_from_tournament_data_by_name(player_name, tourney_data)
 
     if user_infos:
         if len(user_infos) == 1:
@@ -76,6 +76,12 @@ _COLUMN_NAMES_AUTO_MESSAGE: Dict[AutoMessageColumn, Dict[AutoMessageType, str]]
 }
 
 
+_AUTO_MESSAGE_INDEX_CAN_POST: str = 'can_post'
+_AUTO_MESSAGE_INDEX_CHANNEL: str = 'channel'
+_AUTO_MESSAGE_INDEX_NO_POST_YET: str = 'no_post_yet'
+_AUTO_MESSAGE_INDEX_NAMES: Tuple[str, str, str] = (_AUTO_MESSAGE_INDEX_CAN_POST, _AUTO_MESSAGE_INDEX_CHANNEL, _AUTO_MESSAGE_INDEX_NO_POST_YET)
+
+
 _AUTO_MESSAGE_DEFAULT_CHANGE_MODE: Dict[AutoMessageType, AutoMessageChangeMode] = {
     AutoMessageType.DAILY: AutoMessageChangeMode.EDIT,
     AutoMessageType.TRADER: AutoMessageChangeMode.POST_NEW,
@@ -109,7 +115,7 @@ _VALID_BOOL_SWITCH_VALUES: Dict[str, bool] = {
 # ---------- Classes ----------
 
 class AutoMessageSettings():
-    def __init__(self, bot: Bot, guild_id: int, daily_channel_id: int, can_post: bool, latest_message_id: int, change_mode: AutoMessageChangeMode, latest_message_created_at: datetime, latest_message_modified_at: datetime, auto_message_type: AutoMessageType) -> None:
+    def __init__(self, bot: Bot, guild_id: int, daily_channel_id: int, can_post: bool, latest_message_id: int, change_mode: AutoMessageChangeMode, latest_message_created_at: datetime, latest_message_modified_at: datetime, auto_message_type: AutoMessageType, on_changed: Callable[['AutoMessageSettings'], None] = None) -> None:
         self.__bot: Bot = bot
         self.__can_post: bool = can_post
         self.__channel_id: int = daily_channel_id
@@ -121,8 +127,13 @@ class AutoMessageSettings():
         self.__latest_message_created_at: datetime = latest_message_created_at or None
         self.__latest_message_modified_at: datetime = latest_message_modified_at or None
         self.__auto_message_type: AutoMessageType = auto_message_type
+        self.__on_changed: Callable[[AutoMessageSettings], None] = on_changed
 
 
+    @property
+    def auto_message_type(self) -> AutoMessageType:
+        return self.__auto_message_type
+
     @property
     def bot(self) -> Bot:
         return self.__bot
@@ -245,6 +256,7 @@ class AutoMessageSettings():
             self.__latest_message_id = None
             self.__latest_message_created_at = None
             self.__latest_message_modified_at = None
+            self.__notify_changed()
         return success
 
 
@@ -262,6 +274,7 @@ class AutoMessageSettings():
             self.__latest_message_id = None
             self.__latest_message_created_at = None
             self.__latest_message_modified_at = None
+            self.__notify_changed()
         return success
 
 
@@ -287,6 +300,7 @@ class AutoMessageSettings():
             self.__latest_message_id = None
             self.__latest_message_created_at = None
             self.__latest_message_modified_at = None
+            self.__notify_changed()
         return success
 
 
@@ -300,6 +314,7 @@ class AutoMessageSettings():
             if success:
                 self.__channel = channel
                 self.__channel_id = channel.id
+                self.__notify_changed()
             return success
         return True
 
@@ -330,6 +345,7 @@ class AutoMessageSettings():
                 self.__latest_message_modified_at = settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][self.__auto_message_type]]
                 if _COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type] in settings:
                     self.__latest_message_created_at = settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type]]
+                self.__notify_changed()
             return success
         else:
             return True
@@ -347,46 +363,68 @@ class AutoMessageSettings():
         return success
 
 
-    async def update(self, channel: TextChannel = None, can_post: bool = None, latest_message: Message = None, change_mode: AutoMessageChangeMode = None, store_now_as_created_at: bool = False) -> bool:
-        settings: Dict[str, object] = {}
+    def apply_changes(self, changes: Dict[str, object], channel: TextChannel = None) -> None:
+        """
+        Applies the changes returned by get_changes(), after they've been written to the database.
+        """
+        if _COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANNEL_ID][self.__auto_message_type] in changes:
+            self.__channel = channel
+            self.__channel_id = changes[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANNEL_ID][self.__auto_message_type]]
+        if _COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CAN_POST][self.__auto_message_type] in changes:
+            self.__can_post = changes.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CAN_POST][self.__auto_message_type])
+        if _COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type] in changes:
+            self.__latest_message_id = changes.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_ID][self.__auto_message_type])
+            self.__latest_message_created_at = changes.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type])
+            self.__latest_message_modified_at = changes.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][self.__auto_message_type])
+        if _COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANGE_MODE][self.__auto_message_type] in changes:
+            self.__delete_on_change = changes[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANGE_MODE][self.__auto_message_type]]
+        if changes:
+            self.__notify_changed()
+
+
+    def get_changes(self, channel: TextChannel = None, can_post: bool = None, latest_message: Message = None, change_mode: AutoMessageChangeMode = None, store_now_as_created_at: bool = False) -> Dict[str, object]:
+        """
+        Returns the columns and values to be written to the database for an update with the specified parameters.
+        """
+        result: Dict[str, object] = {}
         update_channel = channel is not None and channel != self.channel
         update_can_post = can_post is not None and can_post != self.can_post
         update_latest_message = (latest_message is None and store_now_as_created_at) or (latest_message is not None and latest_message.id != self.latest_message_id and (latest_message.edited_at or latest_message.created_at) != self.latest_message_modified_at)
         update_change_mode = change_mode is not None and change_mode != self.change_mode
         if update_channel:
-            settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANNEL_ID][self.__auto_message_type]] = channel.id
+            result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANNEL_ID][self.__auto_message_type]] = channel.id
         if update_can_post:
-            settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CAN_POST][self.__auto_message_type]] = can_post
+            result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CAN_POST][self.__auto_message_type]] = can_post
         if update_latest_message:
             if store_now_as_created_at:
-                settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type]] = utils.get_utc_now()
+                result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type]] = utils.get_utc_now()
             else:
-                settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_ID][self.__auto_message_type]] = latest_message.id
-                settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type]] = latest_message.created_at
-                settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][self.__auto_message_type]] = latest_message.edited_at or latest_message.created_at
+                result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_ID][self.__auto_message_type]] = latest_message.id
+                result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type]] = latest_message.created_at
+                result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][self.__auto_message_type]] = latest_message.edited_at or latest_message.created_at
         if update_change_mode:
-            settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANGE_MODE][self.__auto_message_type]] = change_mode
-        success = await db_update_server_settings(self.guild_id, settings)
+            result[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANGE_MODE][self.__auto_message_type]] = change_mode
+        return result
+
+
+    async def update(self, channel: TextChannel = None, can_post: bool = None, latest_message: Message = None, change_mode: AutoMessageChangeMode = None, store_now_as_created_at: bool = False) -> bool:
+        changes = self.get_changes(channel=channel, can_post=can_post, latest_message=latest_message, change_mode=change_mode, store_now_as_created_at=store_now_as_created_at)
+        success = await db_update_server_settings(self.guild_id, changes)
         if success:
-            if update_channel:
-                self.__channel = channel
-                self.__channel_id = channel.id
-            if update_can_post:
-                self.__can_post = settings.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CAN_POST][self.__auto_message_type])
-            if update_latest_message:
-                self.__latest_message_id = settings.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_ID][self.__auto_message_type])
-                self.__latest_message_created_at = settings.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][self.__auto_message_type])
-                self.__latest_message_modified_at = settings.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][self.__auto_message_type])
-            if update_change_mode:
-                self.__delete_on_change = settings[_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.CHANGE_MODE][self.__auto_message_type]]
+            self.apply_changes(changes, channel=channel)
         return success
 
 
+    def __notify_changed(self) -> None:
+        if self.__on_changed is not None:
+            self.__on_changed(self)
+
+
 
 
 
 class GuildSettings(object):
-    def __init__(self, bot: Bot, row: asyncpg.Record) -> None:
+    def __init__(self, bot: Bot, row: asyncpg.Record, on_auto_message_settings_changed: Callable[[AutoMessageSettings], None] = None) -> None:
         self.__bot = bot
         self.__guild_id: int = row.get(_COLUMN_NAME_GUILD_ID)
         self.__prefix: str = row.get(_COLUMN_NAME_PREFIX)
@@ -407,6 +445,7 @@ class GuildSettings(object):
             row.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][AutoMessageType.DAILY]),
             row.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][AutoMessageType.DAILY]),
             AutoMessageType.DAILY,
+            on_changed=on_auto_message_settings_changed,
         )
 
         self.__autotrader_settings: AutoMessageSettings = AutoMessageSettings(
@@ -419,6 +458,7 @@ class GuildSettings(object):
             row.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_CREATED_AT][AutoMessageType.TRADER]),
             row.get(_COLUMN_NAMES_AUTO_MESSAGE[AutoMessageColumn.LATEST_MESSAGE_MODIFIED_AT][AutoMessageType.TRADER]),
             AutoMessageType.TRADER,
+            on_changed=on_auto_message_settings_changed,
         )
 
 
@@ -662,19 +702,27 @@ class GuildSettings(object):
 
 
 class GuildSettingsCollection():
+    """
+    Holds the settings of all guilds in memory.
+
+    Maintains secondary indexes of the auto-message settings (configured channel, can post, no post yet), which get updated whenever an auto-message setting changes.
+    So selecting the auto-message settings to be posted costs O(result) and doesn't need to query the database.
+    """
     def __init__(self) -> None:
         self.__data: Dict[int, GuildSettings] = {}
+        self.__auto_message_indices: Dict[AutoMessageType, Dict[str, Dict[int, AutoMessageSettings]]] = {
+            auto_message_type: {index_name: {} for index_name in _AUTO_MESSAGE_INDEX_NAMES}
+            for auto_message_type in AutoMessageType
+        }
 
 
     @property
     def autodaily_settings(self) -> List[AutoMessageSettings]:
-        result = [guild_settings.autodaily for guild_settings in self.__data.values() if guild_settings.autodaily.channel_id is not None]
-        return result
+        return self.get_auto_message_settings(AutoMessageType.DAILY)
 
     @property
     def autotrader_settings(self) -> List[AutoMessageSettings]:
-        result = [guild_settings.autotrader for guild_settings in self.__data.values() if guild_settings.autotrader.channel_id is not None]
-        return result
+        return self.get_auto_message_settings(AutoMessageType.TRADER)
 
     @property
     def bot_news_channels(self) -> List[TextChannel]:
@@ -687,7 +735,7 @@ class GuildSettingsCollection():
         if success:
             new_server_settings = await db_get_server_settings(guild_id)
             if new_server_settings:
-                self.__data[guild_id] = GuildSettings(bot, new_server_settings[0])
+                self.__add(GuildSettings(bot, new_server_settings[0], on_auto_message_settings_changed=self.__update_auto_message_indices))
             else:
                 print(f'WARNING: guild settings have been created, but could not be retrieved for guild_id: {guild_id}')
                 return False
@@ -698,6 +746,9 @@ class GuildSettingsCollection():
         success = await _db_delete_server_settings(guild_id)
         if success and guild_id in self.__data:
             self.__data.pop(guild_id)
+            for indices in self.__auto_message_indices.values():
+                for index in indices.values():
+                    index.pop(guild_id, None)
         return success
 
 
@@ -707,12 +758,35 @@ class GuildSettingsCollection():
         return self.__data[guild_id]
 
 
+    def get_auto_message_settings(self, auto_message_type: AutoMessageType, can_post: bool = None, no_post_yet: bool = False) -> List[AutoMessageSettings]:
+        """
+        Returns the auto-message settings of the specified type of all guilds with a configured channel, served from the secondary indexes.
+        """
+        indices = self.__auto_message_indices[auto_message_type]
+        if no_post_yet:
+            candidates = indices[_AUTO_MESSAGE_INDEX_NO_POST_YET].values()
+        elif can_post:
+            candidates = indices[_AUTO_MESSAGE_INDEX_CAN_POST].values()
+        else:
+            candidates = indices[_AUTO_MESSAGE_INDEX_CHANNEL].values()
+
+        if can_post is None:
+            result = list(candidates)
+        else:
+            result = [auto_message_settings for auto_message_settings in candidates if bool(auto_message_settings.can_post) == can_post]
+        return result
+
+
     async def init(self, bot: Bot) -> None:
         rows = await db_get_server_settings()
+        self.__data = {}
+        for indices in self.__auto_message_indices.values():
+            for index in indices.values():
+                index.clear()
         for row in rows:
             guild_id = row.get(_COLUMN_NAME_GUILD_ID)
             if guild_id:
-                self.__data[guild_id] = GuildSettings(bot, row)
+                self.__add(GuildSettings(bot, row, on_auto_message_settings_changed=self.__update_auto_message_indices))
             else:
                 print(f'[GuildSettingsCollection.init(Bot)] Found guild settings without guildid: {row}')
 
@@ -729,6 +803,28 @@ class GuildSettingsCollection():
         return self.__data.values()
 
 
+    def __add(self, guild_settings: GuildSettings) -> None:
+        self.__data[guild_settings.id] = guild_settings
+        self.__update_auto_message_indices(guild_settings.autodaily)
+        self.__update_auto_message_indices(guild_settings.autotrader)
+
+
+    def __update_auto_message_indices(self, auto_message_settings: AutoMessageSettings) -> None:
+        indices = self.__auto_message_indices[auto_message_settings.auto_message_type]
+        guild_id = auto_message_settings.guild_id
+        has_channel = auto_message_settings.channel_id is not None
+        index_memberships = {
+            _AUTO_MESSAGE_INDEX_CHANNEL: has_channel,
+            _AUTO_MESSAGE_INDEX_CAN_POST: has_channel and auto_message_settings.can_post is True,
+            _AUTO_MESSAGE_INDEX_NO_POST_YET: bool(auto_message_settings.no_post_yet),
+        }
+        for index_name, is_member in index_memberships.items():
+            if is_member:
+                indices[index_name][guild_id] = auto_message_settings
+            else:
+                indices[index_name].pop(guild_id, None)
+
+
 
 
 
@@ -766,10 +862,11 @@ async def get_autodaily_settings(utc_now: datetime = None, bot: Bot = None, guil
         autodaily_settings = await get_autodaily_settings_for_guild(bot, guild_id)
         return [autodaily_settings]
 
-    result = [autodaily_settings for autodaily_settings in GUILD_SETTINGS.autodaily_settings if autodaily_settings.channel_id]
-    utils.dbg_prnt(f'[get_autodaily_settings] retrieved auto-daily settings for {len(result)} guilds')
     if no_post_yet:
-        return await get_autodaily_settings_without_post(result)
+        return await get_autodaily_settings_without_post(None, can_post=can_post)
+
+    result = GUILD_SETTINGS.get_auto_message_settings(AutoMessageType.DAILY, can_post=can_post)
+    utils.dbg_prnt(f'[get_autodaily_settings] retrieved auto-daily settings for {len(result)} guilds')
 
     if utc_now:
         result = [autodaily_settings for autodaily_settings in result if not autodaily_settings.latest_message_created_at or autodaily_settings.latest_message_created_at.date != utc_now.date]
@@ -781,11 +878,11 @@ async def get_autodaily_settings_for_guild(bot: Bot, guild_id: int) -> AutoMessa
     return autodaily_settings
 
 
-async def get_autodaily_settings_without_post(autodaily_settings: List[AutoMessageSettings]) -> List[AutoMessageSettings]:
+async def get_autodaily_settings_without_post(autodaily_settings: List[AutoMessageSettings], can_post: bool = None) -> List[AutoMessageSettings]:
     if autodaily_settings is None:
-        autodaily_settings = GUILD_SETTINGS.autodaily_settings
-
-    result = [autodaily_settings for autodaily_settings in autodaily_settings if autodaily_settings.no_post_yet]
+        result = GUILD_SETTINGS.get_auto_message_settings(AutoMessageType.DAILY, can_post=can_post, no_post_yet=True)
+    else:
+        result = [autodaily_settings for autodaily_settings in autodaily_settings if autodaily_settings.no_post_yet and (can_post is None or bool(autodaily_settings.can_post) == can_post)]
     utils.dbg_prnt(f'[get_autodaily_settings_without_post] retrieved auto-daily settings for {len(result)} guilds, without a post yet.')
     return result
 
@@ -797,10 +894,11 @@ async def get_autotrader_settings(utc_now: datetime = None, bot: Bot = None, gui
         autotrader_settings = await get_autotrader_settings_for_guild(bot, guild_id)
         return [autotrader_settings]
 
-    result = [autotrader_settings for autotrader_settings in GUILD_SETTINGS.autotrader_settings if autotrader_settings.channel_id]
-    utils.dbg_prnt(f'[get_autotrader_settings] retrieved auto-trader settings for {len(result)} guilds')
     if no_post_yet:
-        return await get_autotrader_settings_without_post(result)
+        return await get_autotrader_settings_without_post(None, can_post=can_post)
+
+    result = GUILD_SETTINGS.get_auto_message_settings(AutoMessageType.TRADER, can_post=can_post)
+    utils.dbg_prnt(f'[get_autotrader_settings] retrieved auto-trader settings for {len(result)} guilds')
 
     if utc_now:
         result = [autotrader_settings for autotrader_settings in result if not autotrader_settings.latest_message_created_at or autotrader_settings.latest_message_created_at.date != utc_now.date]
@@ -812,11 +910,11 @@ async def get_autotrader_settings_for_guild(bot: Bot, guild_id: int) -> AutoMess
     return autotrader_settings
 
 
-async def get_autotrader_settings_without_post(autotrader_settings: List[AutoMessageSettings]) -> List[AutoMessageSettings]:
+async def get_autotrader_settings_without_post(autotrader_settings: List[AutoMessageSettings], can_post: bool = None) -> List[AutoMessageSettings]:
     if autotrader_settings is None:
-        autotrader_settings = GUILD_SETTINGS.autotrader_settings
-
-    result = [autotrader_settings for autotrader_settings in autotrader_settings if autotrader_settings.no_post_yet]
+        result = GUILD_SETTINGS.get_auto_message_settings(AutoMessageType.TRADER, can_post=can_post, no_post_yet=True)
+    else:
+        result = [autotrader_settings for autotrader_settings in autotrader_settings if autotrader_settings.no_post_yet and (can_post is None or bool(autotrader_settings.can_post) == can_post)]
     utils.dbg_prnt(f'[get_autotrader_settings_without_post] retrieved auto-trader settings for {len(result)} guilds, without a post yet.')
     return result
 
@@ -1025,6 +1123,13 @@ async def db_get_automessage_channel_id(auto_message_type: AutoMessageType, guil
 
 
 async def db_get_server_settings(guild_id: int = None, setting_names: list = None, additional_wheres: list = None) -> List[asyncpg.Record]:
+    if not setting_names and not additional_wheres:
+        if guild_id is not None:
+            records = await db.fetch_named('serversettings.get_by_guild', [guild_id])
+        else:
+            records = await db.fetch_named('serversettings.get_all')
+        return records or []
+
     additional_wheres = additional_wheres or []
     wheres = []
     if guild_id is not None:
@@ -1065,6 +1170,31 @@ async def db_get_use_pagination(guild: Guild) -> bool:
     return app_settings.DEFAULT_USE_EMOJI_PAGINATOR
 
 
+async def db_update_auto_messages_settings(changes: List[Tuple[AutoMessageSettings, Dict[str, Any]]]) -> bool:
+    """
+    Writes the changes returned by AutoMessageSettings.get_changes() for many guilds in a single transaction, with one statement per distinct set of columns.
+    If that fails, the changes get written one guild at a time. Successfully written changes get applied.
+    """
+    args_lists: Dict[Tuple[str, ...], List[list]] = {}
+    for auto_message_settings, settings in changes:
+        if settings:
+            args_lists.setdefault(tuple(settings.keys()), []).append([auto_message_settings.guild_id, *settings.values()])
+    queries = []
+    for column_names, args_list in args_lists.items():
+        set_string = ', '.join(f'{column_name} = ${i:d}' for i, column_name in enumerate(column_names, start=2))
+        queries.append((f'UPDATE serversettings SET {set_string} WHERE {_COLUMN_NAME_GUILD_ID} = $1', args_list))
+
+    success = await db.try_execute_many(queries)
+    if success:
+        for auto_message_settings, settings in changes:
+            auto_message_settings.apply_changes(settings)
+    else:
+        for auto_message_settings, settings in changes:
+            if await db_update_server_settings(auto_message_settings.guild_id, settings):
+                auto_message_settings.apply_changes(settings)
+    return success
+
+
 async def db_update_server_settings(guild_id: int, settings: Dict[str, Any]) -> bool:
     if settings:
         set_names = []
@@ -1090,8 +1220,7 @@ async def _db_create_server_settings(guild_id: int) -> bool:
 
 
 async def _db_delete_server_settings(guild_id: int) -> bool:
-    query = f'DELETE FROM serversettings WHERE {_COLUMN_NAME_GUILD_ID} = $1'
-    success = await db.try_execute(query, [guild_id])
+    success = await db.try_execute_named('serversettings.delete_by_guild', [guild_id])
     return success
 
 
@@ -10,10 +10,26 @@ from typing import Tuple
 ACCESS_TOKEN: str = os.environ.get('PSS_ACCESS_TOKEN')
 
 
+API_RESPONSE_CACHE_TTL: float = float(os.environ.get('API_RESPONSE_CACHE_TTL', 10.0))
+
+AUTOMESSAGE_MAX_CONCURRENT_POSTS: int = int(os.environ.get('AUTOMESSAGE_MAX_CONCURRENT_POSTS', 20))
+AUTOMESSAGE_MAX_POST_ATTEMPTS: int = int(os.environ.get('AUTOMESSAGE_MAX_POST_ATTEMPTS', 3))
+AUTOMESSAGE_RETRY_BASE_DELAY: float = float(os.environ.get('AUTOMESSAGE_RETRY_BASE_DELAY', 2.0))
+
+
 BASE_API_URL: str = 'https://api.pixelstarships.com/'
 BASE_INVITE_URL: str = 'https://discordapp.com/oauth2/authorize?scope=applications.commands%20bot&permissions=388160&client_id='
 
 
+CACHE_WARMER_INTERVAL: float = float(os.environ.get('CACHE_WARMER_INTERVAL', 60.0))
+CACHE_WARMER_MAX_JITTER: float = float(os.environ.get('CACHE_WARMER_MAX_JITTER', 15.0))
+
+
+DATABASE_POOL_ACQUIRE_TIMEOUT: float = float(os.environ.get('DATABASE_POOL_ACQUIRE_TIMEOUT', 10.0))
+DATABASE_POOL_MAX_INACTIVE_CONNECTION_LIFETIME: float = float(os.environ.get('DATABASE_POOL_MAX_INACTIVE_CONNECTION_LIFETIME', 300.0))
+DATABASE_POOL_MAX_QUERIES: int = int(os.environ.get('DATABASE_POOL_MAX_QUERIES', 50000))
+DATABASE_POOL_MAX_SIZE: int = int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10))
+DATABASE_POOL_MIN_SIZE: int = int(os.environ.get('DATABASE_POOL_MIN_SIZE', 1))
 DATABASE_SSL_MODE: str = os.environ.get('DATABASE_SSL_MODE', 'require')
 DATABASE_URL: str = f'{os.environ.get("DATABASE_URL")}?sslmode={DATABASE_SSL_MODE}'
 
@@ -23,6 +39,7 @@ DEFAULT_PREFIX: str = '/'
 DEFAULT_PREFIXES: Tuple[str] = ('//', '\\', '/')
 DEFAULT_USE_EMOJI_PAGINATOR: bool = True
 
+DESIGN_CACHE_SNAPSHOTS_SUB_PATH: str = os.environ.get('DESIGN_CACHE_SNAPSHOTS_SUB_PATH', 'design_cache')
 DEVICE_LOGIN_CHECKSUM_KEY: str = os.environ.get('PSS_DEVICE_LOGIN_CHECKSUM_KEY')
 
 
@@ -50,6 +67,13 @@ GDRIVE_SETTINGS_FILE: str = 'settings.yaml'
 GDRIVE_SCOPES: List[str] = ['https://www.googleapis.com/auth/drive']
 
 
+HTTP_CONNECTION_LIMIT: int = int(os.environ.get('HTTP_CONNECTION_LIMIT', 100))
+HTTP_CONNECTION_LIMIT_PER_HOST: int = int(os.environ.get('HTTP_CONNECTION_LIMIT_PER_HOST', 20))
+HTTP_KEEPALIVE_TIMEOUT: float = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', 60.0))
+HTTP_TIMEOUT_CONNECT: float = float(os.environ.get('HTTP_TIMEOUT_CONNECT', 10.0))
+HTTP_TIMEOUT_TOTAL: float = float(os.environ.get('HTTP_TIMEOUT_TOTAL', 60.0))
+
+
 IGNORE_SERVER_IDS_FOR_COUNTING: List[int] = [
     110373943822540800,
     264445053596991498,
@@ -61,6 +85,7 @@ INTENT_MESSAGE_CONTENT: bool = int(os.environ.get('INTENT_MESSAGE_CONTENT', '0')
 
 
 LATEST_SETTINGS_BASE_PATH: str = 'SettingService/GetLatestVersion3?deviceType=DeviceTypeAndroid&languageKey='
+LATEST_SETTINGS_CACHE_TTL: float = float(os.environ.get('LATEST_SETTINGS_CACHE_TTL', 60.0))
 
 
 MIN_ENTITY_NAME_LENGTH: int = 3
@@ -77,6 +102,7 @@ PRINT_DEBUG_DB: int = int(os.environ.get('PRINT_DEBUG_DB', '0'))
 PRINT_DEBUG_COMMAND: int = int(os.environ.get('PRINT_DEBUG_COMMAND', '0'))
 PRINT_DEBUG_WEB_REQUESTS: int = int(os.environ.get('PRINT_DEBUG_WEB_REQUESTS', '0'))
 PRODUCTION_SERVER: str = os.environ.get('PSS_PRODUCTION_SERVER')
+PRODUCTION_SERVER_CACHE_TTL: float = float(os.environ.get('PRODUCTION_SERVER_CACHE_TTL', 600.0))
 
 PSS_ABOUT_FILES: List[str] = ['src/pss_data/about.json', 'pss_data/about.json']
 PSS_LINKS_FILES: List[str] = ['src/pss_data/links.json', 'pss_data/links.json']
@@ -87,6 +113,7 @@ RAW_COMMAND_USERS_RAW: str = os.environ.get('RAW_COMMAND_USERS', '[]')
 RAW_COMMAND_USERS: List[str] = json.loads(str(RAW_COMMAND_USERS_RAW))
 
 
+SETTINGS_CACHE_TTL: float = float(os.environ.get('SETTINGS_CACHE_TTL', 600.0))
 SETTINGS_TABLE_NAME: str = 'settings'
 SETTINGS_TYPES: List[str] = ['boolean', 'float', 'int', 'text', 'timestamputc']
 
@@ -95,6 +122,11 @@ SPRITE_CACHE_SUB_PATH: str = 'sprite_cache'
 
 THROW_COMMAND_ERRORS: int = int(os.environ.get('THROW_COMMAND_ERRORS', '0'))
 
+TOURNAMENT_DATA_CACHE_MAX_SIZE_MB: int = int(os.environ.get('TOURNAMENT_DATA_CACHE_MAX_SIZE_MB', 256))
+TOURNAMENT_DATA_CACHE_SUB_PATH: str = os.environ.get('TOURNAMENT_DATA_CACHE_SUB_PATH', 'tourney_data_cache')
+TOURNAMENT_DATA_LOCAL_SOURCE_PATH: str = os.environ.get('TOURNAMENT_DATA_LOCAL_SOURCE_PATH', '')
+TOURNAMENT_DATA_MIRROR_SUB_PATH: str = os.environ.get('TOURNAMENT_DATA_MIRROR_SUB_PATH', 'tourney_data_mirror')
+TOURNAMENT_DATA_PREFETCH_INTERVAL: float = float(os.environ.get('TOURNAMENT_DATA_PREFETCH_INTERVAL', 15.0))
 TOURNAMENT_DATA_START_DATE: datetime = datetime(year=2019, month=10, day=9, hour=12)
 
 
@@ -13,4 +13,6 @@ from . import format
 from . import io
 from . import json
 from . import parse
+from . import readonly
+from .readonly import ReadOnlyDict
 from .singleton import Singleton
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Any as _Any, Dict, List, Union
+from collections import Counter as _Counter
+from typing import Any as _Any, Dict, List, Tuple as _Tuple, Union
 from urllib.parse import quote as _quote
 from xml.etree import ElementTree as _ElementTree
 
@@ -13,6 +14,42 @@ from ..typehints import EntitiesData
 # ---------- Typehint definitions ----------
 
 _EntityDict = Union[List['_EntityDict'], Dict[str, '_EntityDict']]
+_XmlChild = _Tuple[str, Dict[str, str], _EntityDict]
+
+
+
+
+
+# ---------- Classes ----------
+
+class _XmlDictBuilder:
+    """
+    Parser target that builds the dict structure of raw_xml_to_dict while the xml is being parsed.
+    No element tree gets built: the dict of an element gets created as soon as the element ends and only the dicts of the currently open elements are being kept.
+    """
+    def __init__(self, include_root: bool, fix_attributes: bool, preserve_lists: bool) -> None:
+        self.__include_root: bool = include_root
+        self.__fix_attributes: bool = fix_attributes
+        self.__preserve_lists: bool = preserve_lists
+        self.__open_nodes: List[_Tuple[str, Dict[str, str], List[_XmlChild]]] = []
+        self.__result: _EntityDict = None
+
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self.__open_nodes.append((tag, attrib, []))
+
+
+    def end(self, tag: str) -> None:
+        tag, attrib, children = self.__open_nodes.pop()
+        if self.__open_nodes:
+            node_dict = _build_node_dict(tag, attrib, children, False, self.__fix_attributes, self.__preserve_lists)
+            self.__open_nodes[-1][2].append((tag, attrib, node_dict))
+        else:
+            self.__result = _build_node_dict(tag, attrib, children, self.__include_root, self.__fix_attributes, self.__preserve_lists)
+
+
+    def close(self) -> _EntityDict:
+        return self.__result
 
 
 
@@ -20,6 +57,12 @@ _EntityDict = Union[List['_EntityDict'], Dict[str, '_EntityDict']]
 
 # ---------- Functions ----------
 
+def create_xml_dict_parser(include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _ElementTree.XMLParser:
+    """
+    Returns a parser that can be fed chunks of xml (str or bytes) as they arrive. Calling close() on it returns the same result as raw_xml_to_dict.
+    """
+    return _ElementTree.XMLParser(target=_XmlDictBuilder(include_root, fix_attributes, preserve_lists))
+
 
 def hundredth_to_seconds(hundredth: int) -> float:
     if hundredth:
@@ -53,9 +96,28 @@ def pss_timestamp_to_excel(pss_timestamp: str) -> str:
         return ''
 
 
+def raw_dict_to_entities_data(raw_dict: _EntityDict, depth: int) -> EntitiesData:
+    """
+    Returns the first dict found at the specified depth of a dict returned by raw_xml_to_dict.
+    """
+    result = raw_dict
+    while depth > 0:
+        found_new_root = False
+        for value in result.values():
+            if isinstance(value, dict):
+                result = value
+                depth -= 1
+                found_new_root = True
+                break
+        if not found_new_root:
+            return {}
+    return result
+
+
 def raw_xml_to_dict(raw_xml: str, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _EntityDict:
-    root = _ElementTree.fromstring(raw_xml)
-    result = __convert_xml_to_dict(root, include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+    parser = create_xml_dict_parser(include_root=include_root, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
+    parser.feed(raw_xml)
+    result = parser.close()
     return result
 
 
@@ -112,42 +174,43 @@ def xmltree_to_dict3(raw_text: str) -> EntitiesData:
 
 # ---------- Helper functions ----------
 
-def __convert_xml_to_dict(root: _ElementTree.Element, include_root: bool = True, fix_attributes: bool = True, preserve_lists: bool = False) -> _EntityDict:
-    if root is None:
-        return None
-
+def _build_node_dict(tag: str, attrib: Dict[str, str], children: List[_XmlChild], include_root: bool, fix_attributes: bool, preserve_lists: bool) -> _EntityDict:
+    """
+    Builds the dict of an xml element from its tag, its attributes and the already built dicts of its children.
+    """
     result = {}
-    if root.attrib:
+    if attrib:
         if include_root:
             if fix_attributes:
-                result[root.tag] = __fix_attribute(root.attrib)
+                result[tag] = __fix_attribute(attrib)
             else:
-                result[root.tag] = root.attrib
+                result[tag] = attrib
         else:
             if fix_attributes:
-                result = __fix_attribute(root.attrib)
+                result = __fix_attribute(attrib)
             else:
-                result = root.attrib
+                result = attrib
     elif include_root:
-        result[root.tag] = {}
+        result[tag] = {}
+
+    if not children:
+        return result
 
-    # Retrieve all distinct names of sub tags
-    tag_count_map = __get_child_tag_count(root)
+    # Count the children per tag in a single pass
+    tag_count_map = _Counter(child_tag for child_tag, _, _ in children)
     children_dict = {}
 
-    for child in root:
-        tag = child.tag
+    for child_tag, child_attrib, child_dict in children:
         key = None
-        if tag_count_map[tag] > 1:
-            id_attr_names = _pss_data.ID_NAMES_INFO.get(tag)
+        if tag_count_map[child_tag] > 1:
+            id_attr_names = _pss_data.ID_NAMES_INFO.get(child_tag)
             if id_attr_names:
-                id_attr_values = [child.attrib[id_attr_name] for id_attr_name in id_attr_names]
+                id_attr_values = [child_attrib[id_attr_name] for id_attr_name in id_attr_names]
                 key = '.'.join(sorted(id_attr_values))
         if not key:
-            key = tag
+            key = child_tag
 
-        child_dict = __convert_xml_to_dict(child, include_root=False, fix_attributes=fix_attributes, preserve_lists=preserve_lists)
-        if key not in children_dict.keys():
+        if key not in children_dict:
             children_dict[key] = child_dict
 
     if children_dict:
@@ -155,18 +218,18 @@ def __convert_xml_to_dict(root: _ElementTree.Element, include_root: bool = True,
             if len(children_dict) > 1:
                 children_list = list(children_dict.values())
                 if include_root:
-                    result[root.tag] = children_list
+                    result[tag] = children_list
                 else:
                     if result:
                         result['Collection'] = children_list
                     else:
                         result = children_list
             else:
-                result.setdefault(root.tag, {}).update(children_dict)
+                result.setdefault(tag, {}).update(children_dict)
         else:
             if include_root:
                 # keys get overwritten here
-                result[root.tag] = children_dict
+                result[tag] = children_dict
             else:
                 result.update(children_dict)
 
@@ -190,28 +253,6 @@ def __fix_attribute(attribute: Dict[str, str]) -> Dict[str, str]:
     return result
 
 
-def __get_child_tag_count(root: _ElementTree.Element) -> Dict[str, int]:
-    if root is None:
-        return None
-
-    child_tags = list(set([child_node.tag for child_node in root]))
-    result = {}
-    for child_tag in child_tags:
-        result[child_tag] = sum(1 for child_node in root if child_node.tag == child_tag)
-
-    return result
-
-
 def __xmltree_to_dict(raw_text: str, depth: int) -> EntitiesData:
     result = raw_xml_to_dict(raw_text)
-    while depth > 0:
-        found_new_root = False
-        for value in result.values():
-            if isinstance(value, dict):
-                result = value
-                depth -= 1
-                found_new_root = True
-                break
-        if not found_new_root:
-            return {}
-    return result
\ No newline at end of file
+    return raw_dict_to_entities_data(result, depth)
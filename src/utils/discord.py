@@ -1,14 +1,19 @@
+from asyncio import sleep as _sleep
 from datetime import datetime as _datetime
+from random import uniform as _uniform
 from re import compile as _compile
 from re import escape as _escape
 from re import Pattern as _Pattern
 from re import search as _search
 from typing import Any as _Any
 from typing import AnyStr as _AnyStr
+from typing import Awaitable as _Awaitable
+from typing import Callable as _Callable
 from typing import List as _List
 from typing import Optional as _Optional
 from typing import Union as _Union
 from typing import Tuple as _Tuple
+from typing import TypeVar as _TypeVar
 
 from discord import ApplicationContext as _ApplicationContext
 from discord import Colour as _Colour
@@ -16,6 +21,7 @@ from discord import Embed as _Embed
 from discord import File as _File
 from discord import Forbidden as _Forbidden
 from discord import Guild as _Guild
+from discord import HTTPException as _HTTPException
 from discord import Interaction as _Interaction
 from discord import Member as _Member
 from discord import Message as _Message
@@ -33,6 +39,14 @@ from discord.ui import View as _View
 from . import miscellaneous as _utils
 
 
+# ---------- Typehint definitions ----------
+
+_T = _TypeVar('_T')
+
+
+
+
+
 # ---------- Constants ----------
 
 DEFAULT_EMBED_INLINE: bool = True
@@ -47,6 +61,24 @@ ZERO_WIDTH_SPACE: str = '\u200b'
 
 # ---------- Functions ----------
 
+async def call_with_retry(func: _Callable[[], _Awaitable[_T]], max_attempts: int = 3, base_delay: float = 1.0, retry_on_server_error: bool = True) -> _T:
+    """
+    Awaits the result of func. Retries with exponential backoff, if Discord answered with a rate limit (429) or, if retry_on_server_error is True, a server error (5xx).
+    Requests that aren't idempotent (e.g. sending a message) should not be retried on server errors, since the request may have succeeded anyway.
+    Other errors and the error of the final attempt get raised.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await func()
+        except _HTTPException as ex:
+            is_retryable = ex.status == 429 or (retry_on_server_error and ex.status >= 500)
+            if attempt >= max_attempts or not is_retryable:
+                raise
+            await _sleep(base_delay * 2 ** (attempt - 1) + _uniform(0, base_delay))
+            attempt += 1
+
+
 def convert_color_string_to_embed_color(color_string: str) -> _Colour:
     if color_string:
         split_color_string = color_string.split(',')
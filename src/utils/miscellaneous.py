@@ -18,11 +18,11 @@ from . import datetime as _datetime
 
 async def check_hyperlink(hyperlink: str) -> bool:
     if hyperlink:
-        session: _aiohttp.ClientSession
-        async with _aiohttp.ClientSession() as session:
-            response: _aiohttp.ClientResponse
-            async with session.get(hyperlink) as response:
-                return response.status == 200
+        from .. import pss_core as _core # pss_core imports this module
+        session: _aiohttp.ClientSession = await _core.get_client_session()
+        response: _aiohttp.ClientResponse
+        async with session.get(hyperlink) as response:
+            return response.status == 200
     else:
         return False
 
@@ -0,0 +1,60 @@
+from typing import Any as _Any, Dict as _Dict, NoReturn as _NoReturn
+
+
+# ---------- Classes ----------
+
+class ReadOnlyDict(dict):
+    """
+    A dict that can't be modified after creation. Use dict(...) or .copy() to retrieve a modifiable copy.
+    """
+    def __setitem__(self, key: _Any, value: _Any) -> _NoReturn:
+        _raise_read_only()
+
+    def __delitem__(self, key: _Any) -> _NoReturn:
+        _raise_read_only()
+
+    def __ior__(self, other: _Any) -> _NoReturn:
+        _raise_read_only()
+
+    def __reduce__(self) -> tuple:
+        return (ReadOnlyDict, (dict(self),))
+
+    def clear(self) -> _NoReturn:
+        _raise_read_only()
+
+    def copy(self) -> _Dict[_Any, _Any]:
+        return dict(self)
+
+    def pop(self, *args, **kwargs) -> _NoReturn:
+        _raise_read_only()
+
+    def popitem(self) -> _NoReturn:
+        _raise_read_only()
+
+    def setdefault(self, *args, **kwargs) -> _NoReturn:
+        _raise_read_only()
+
+    def update(self, *args, **kwargs) -> _NoReturn:
+        _raise_read_only()
+
+
+
+
+
+# ---------- Functions ----------
+
+def make_read_only(value: _Any) -> _Any:
+    """
+    Recursively converts all dicts in value into ReadOnlyDicts.
+    """
+    if isinstance(value, ReadOnlyDict):
+        return value
+    if isinstance(value, dict):
+        return ReadOnlyDict({key: make_read_only(child_value) for key, child_value in value.items()})
+    if isinstance(value, list):
+        return [make_read_only(child_value) for child_value in value]
+    return value
+
+
+def _raise_read_only() -> _NoReturn:
+    raise TypeError('This dict is read-only. Create a copy via dict(...) to modify it.')
@@ -3,7 +3,8 @@ from typing import List, Optional, Type
 from discord import ApplicationCommand, SlashCommand, SlashCommandGroup
 from discord.ext.commands import Bot
 
-from .gdrive import TourneyDataClient
+from .gdrive import LocalFolderTourneyDataSource, TourneyDataClient
+from . import pss_core as core
 from . import settings
 
 
@@ -24,7 +25,8 @@ class YadcBot(Bot):
                 settings.GDRIVE_FOLDER_ID,
                 settings.GDRIVE_SERVICE_ACCOUNT_FILE,
                 settings.GDRIVE_SETTINGS_FILE,
-                settings.TOURNAMENT_DATA_START_DATE
+                settings.TOURNAMENT_DATA_START_DATE,
+                source=LocalFolderTourneyDataSource(settings.TOURNAMENT_DATA_LOCAL_SOURCE_PATH) if settings.TOURNAMENT_DATA_LOCAL_SOURCE_PATH else None
             )
 
     @property
@@ -32,6 +34,11 @@ class YadcBot(Bot):
         return self.__tournament_data_client
 
 
+    async def close(self) -> None:
+        await super().close()
+        await core.close_client_session()
+
+
     def get_application_command(
         self,
         name: str,